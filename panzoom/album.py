@@ -5,13 +5,24 @@ Audio album preparation and normalization
 import os
 import re
 import shutil
-import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Tuple, Optional
-from dataclasses import dataclass
+from typing import Dict, List, Sequence, Tuple, Optional
+from dataclasses import dataclass, field, replace
 from datetime import datetime
 
-from .config import AudioConfig
+from .config import (
+    AudioConfig, VideoConfig, WatermarkConfig, AUDIO_FORMATS, parse_audio_formats
+)
+from .cache import cache_key, partial_path
+from .catalog import CatalogState, CatalogEntry
+from .probe import AudioProbe, ProbeCache
+from .analysis import TrackAnalysis, AnalysisCache, has_numpy, parse_db
+from .slideshow import SlideshowGenerator, format_time
+from .staging import StagingArea
+from . import metrics, supervisor
+from .supervisor import SupervisedProcess, DEFAULT_STALL_TIMEOUT
 
 
 @dataclass
@@ -20,9 +31,36 @@ class TrackInfo:
     original_path: str
     track_number: int
     clean_name: str
-    output_path: str
+    output_path: str                # First format (used for probing and CUE sheets)
+    outputs: Dict[str, str] = field(default_factory=dict)  # Format -> path
     success: bool = False
     error: Optional[str] = None
+    skipped: bool = False           # Unchanged since last catalog run
+    source_probe: Optional[AudioProbe] = None
+    output_probe: Optional[AudioProbe] = None
+    
+    # Exact position inside a single-file master (sample frames)
+    start_sample: Optional[int] = None
+    num_samples: int = 0
+    sample_rate: int = 0
+    
+    # Silence boundaries used to trim the track
+    analysis: Optional[TrackAnalysis] = field(default=None, repr=False)
+    
+    # Slideshow rendered for the track (see AlbumProcessor.render_videos)
+    video_path: Optional[str] = None
+    video_error: Optional[str] = None
+    
+    @property
+    def duration(self) -> float:
+        """Duration of the processed track (source duration as fallback)"""
+        if self.num_samples and self.sample_rate:
+            return self.num_samples / self.sample_rate
+        if self.output_probe:
+            return self.output_probe.duration
+        if self.source_probe:
+            return self.source_probe.duration
+        return 0.0
 
 
 class AlbumProcessor:
@@ -30,22 +68,71 @@ class AlbumProcessor:
     
     SUPPORTED_FORMATS = {'.wav', '.mp3', '.flac', '.aac', '.ogg', '.m4a'}
     
-    def __init__(self, config: AudioConfig):
+    # FFmpeg supervision (seconds without output / total, None = no limit)
+    STALL_TIMEOUT = DEFAULT_STALL_TIMEOUT
+    WALL_TIMEOUT: Optional[float] = None
+    
+    # Track videos: FFmpeg threads given to each concurrent render
+    THREADS_PER_VIDEO = 4
+    
+    def __init__(self, config: AudioConfig, probe_cache: Optional[ProbeCache] = None):
         self.config = config
         self.tracks: List[TrackInfo] = []
+        self.probe_cache = probe_cache
+        self.formats = parse_audio_formats(config.formats)
+        self.tags: Dict[str, str] = {}
+        self.track_total = 0            # Written as "n/total" when known
+        self.staging: Optional[StagingArea] = None  # Where outputs are written before publishing
+    
+    def set_album_info(self, album_name: str, artist: str, genre: str):
+        """Tags embedded in every output (same values as generate_metadata)"""
+        self.tags = {
+            "album": album_name,
+            "artist": artist,
+            "album_artist": artist,
+            "genre": genre,
+        }
+    
+    def output_paths(self, output_dir: str, stem: str) -> Dict[str, str]:
+        """Output file of each configured format"""
+        return {
+            name: os.path.join(output_dir, stem + AUDIO_FORMATS[name]["extension"])
+            for name in self.formats
+        }
     
-    def find_audio_files(self, path: str) -> List[str]:
-        """Find all audio files in directory"""
+    def find_audio_files(
+        self,
+        path: str,
+        recursive: bool = False,
+        exclude: Sequence[str] = ()
+    ) -> List[str]:
+        """
+        Find all audio files in directory
+        
+        Args:
+            recursive: Include sub-directories
+            exclude: Directories to skip (e.g. an output directory inside
+                the input). Hidden files and directories are always skipped
+                in recursive scans (partial outputs, catalog state).
+        """
         audio_files = []
         path = Path(path)
+        pattern = '**/*' if recursive else '*'
+        excluded = [Path(os.path.abspath(d)) for d in exclude]
+        
+        def included(p: Path) -> bool:
+            if recursive and any(part.startswith('.') for part in p.relative_to(path).parts):
+                return False
+            absolute = Path(os.path.abspath(p))
+            return not any(d == absolute or d in absolute.parents for d in excluded)
         
         if path.is_file():
             if path.suffix.lower() in self.SUPPORTED_FORMATS:
                 audio_files.append(str(path))
         elif path.is_dir():
             for ext in self.SUPPORTED_FORMATS:
-                audio_files.extend([str(p) for p in path.glob(f'*{ext}')])
-                audio_files.extend([str(p) for p in path.glob(f'*{ext.upper()}')])
+                audio_files.extend([str(p) for p in path.glob(f'{pattern}{ext}') if included(p)])
+                audio_files.extend([str(p) for p in path.glob(f'{pattern}{ext.upper()}') if included(p)])
         
         return sorted(set(audio_files))
     
@@ -70,23 +157,36 @@ class AlbumProcessor:
         for i, file_path in enumerate(audio_files, 1):
             clean_name = self.clean_filename(file_path)
             track_num = f"{i:02d}"
-            output_name = f"{track_num} - {clean_name}.wav"
-            output_path = os.path.join(output_dir, output_name)
+            outputs = self.output_paths(output_dir, f"{track_num} - {clean_name}")
             
             tracks.append(TrackInfo(
                 original_path=file_path,
                 track_number=i,
                 clean_name=clean_name,
-                output_path=output_path
+                output_path=outputs[self.formats[0]],
+                outputs=outputs
             ))
         
         self.tracks = tracks
+        self.track_total = len(tracks)
         return tracks
     
-    def _build_audio_filter(self) -> str:
+    def _build_audio_filter(self, track: Optional[TrackInfo] = None) -> str:
         """Build FFmpeg audio filter string"""
         cfg = self.config
         filters = []
+        analysis = track.analysis if track else None
+        
+        # Exact trim from the analysis pass (sample offsets are on the
+        # resampled grid the analysis was decoded at). The analysis reads
+        # the source, so its threshold applies before normalization; the
+        # silenceremove fallback below sees normalized levels.
+        if cfg.remove_silence and analysis:
+            filters.append(
+                f"aresample={analysis.sample_rate},"
+                f"atrim=start_sample={analysis.start_sample}:end_sample={analysis.end_sample},"
+                f"asetpts=PTS-STARTPTS"
+            )
         
         # Loudness normalization
         filters.append(
@@ -94,7 +194,7 @@ class AlbumProcessor:
         )
         
         # Silence removal
-        if cfg.remove_silence:
+        if cfg.remove_silence and not analysis:
             filters.append(
                 f"silenceremove=start_periods=1:start_duration=0.2:"
                 f"start_threshold={cfg.silence_threshold}:"
@@ -104,40 +204,227 @@ class AlbumProcessor:
         
         return ",".join(filters)
     
-    def process_track(self, track: TrackInfo) -> TrackInfo:
-        """Process a single audio track"""
+    def _metadata_args(self, track: TrackInfo) -> List[str]:
+        """-metadata arguments for the tags of a track"""
+        tags = dict(self.tags)
+        tags["title"] = track.clean_name
+        tags["track"] = (
+            f"{track.track_number}/{self.track_total}" if self.track_total
+            else str(track.track_number)
+        )
+        args = []
+        for key, value in tags.items():
+            if value:
+                args.extend(["-metadata", f"{key}={value}"])
+        return args
+    
+    def _build_track_command(
+        self,
+        track: TrackInfo,
+        outputs: Optional[Dict[str, str]] = None
+    ) -> List[str]:
+        """
+        One FFmpeg command decoding and normalizing a track once
+        
+        With several formats the normalized audio is split with asplit and
+        fed to one encoder per output.
+        
+        Args:
+            outputs: Paths to write (format -> path), default the track's own
+        """
         cfg = self.config
+        outputs = outputs or track.outputs or {self.formats[0]: track.output_path}
+        audio_filter = self._build_audio_filter(track)
         
         cmd = [
             "ffmpeg", "-y",
-            "-hide_banner", "-loglevel", "warning",
+            "-hide_banner", "-progress", "pipe:1", "-loglevel", "warning",
             "-i", track.original_path,
-            "-af", self._build_audio_filter(),
-            "-ar", str(cfg.sample_rate),
-            "-ac", str(cfg.channels),
-            track.output_path
         ]
+        if len(outputs) == 1:
+            cmd.extend(["-af", audio_filter])
+            streams = ["0:a:0"]
+        else:
+            streams = [f"[a{i}]" for i in range(len(outputs))]
+            cmd.extend([
+                "-filter_complex",
+                f"[0:a]{audio_filter},asplit={len(outputs)}{''.join(streams)}"
+            ])
+        
+        metadata = self._metadata_args(track)
+        for stream, (name, path) in zip(streams, outputs.items()):
+            cmd.extend(["-map", stream, "-map_metadata", "-1"])
+            cmd.extend(["-ar", str(cfg.sample_rate), "-ac", str(cfg.channels)])
+            cmd.extend(AUDIO_FORMATS[name]["codec"])
+            cmd.extend(metadata)
+            cmd.append(path)
+        return cmd
+    
+    def _scratch_path(self, destination: str, seconds: float) -> str:
+        """Where to write a file before publishing it to ``destination``"""
+        if not self.staging:
+            return partial_path(destination)
+        # Uncompressed 16-bit size, an upper bound for every format
+        cfg = self.config
+        return self.staging.path(destination, int(seconds * cfg.sample_rate * cfg.channels * 2))
+    
+    def _publish(self, path: str, destination: str):
+        if self.staging:
+            self.staging.publish(path, destination)
+        else:
+            os.replace(path, destination)
+    
+    def _discard(self, path: str):
+        if self.staging:
+            self.staging.discard(path)
+        elif os.path.exists(path):
+            os.remove(path)
+    
+    def process_track(self, track: TrackInfo) -> TrackInfo:
+        """Process a single audio track into every configured format"""
+        outputs = track.outputs or {self.formats[0]: track.output_path}
+        # Outputs are published together once all of them are complete
+        staged = {
+            name: self._scratch_path(path, track.duration)
+            for name, path in outputs.items()
+        }
+        cmd = self._build_track_command(track, staged)
         
         try:
-            result = subprocess.run(cmd, capture_output=True, text=True)
+            result = supervisor.run(
+                cmd, stall_timeout=self.STALL_TIMEOUT, wall_timeout=self.WALL_TIMEOUT
+            )
             
-            if result.returncode == 0 and os.path.exists(track.output_path):
+            if result.ok and all(os.path.exists(p) for p in staged.values()):
+                for name, path in staged.items():
+                    self._publish(path, outputs[name])
                 track.success = True
             else:
                 track.success = False
-                track.error = result.stderr or "Unknown error"
+                track.error = result.error
                 
         except Exception as e:
             track.success = False
             track.error = str(e)
+        finally:
+            for path in staged.values():
+                self._discard(path)
         
         return track
     
+    def process_single_file(
+        self,
+        master_path: str,
+        progress_callback=None
+    ) -> Tuple[int, int]:
+        """
+        Render all prepared tracks into one gapless master file
+        
+        Each track is decoded and normalized straight into a pipe feeding a
+        single encoder, so no per-track files are written. Sample frames are
+        counted as they pass through, giving exact track boundaries. A track
+        failing before any audio is decoded leaves nothing in the master;
+        one failing part way keeps the audio it already emitted, which later
+        boundaries account for.
+        
+        Args:
+            master_path: Output file (format from extension, e.g. .wav, .flac)
+            progress_callback: Optional callback for progress
+        
+        Returns:
+            Tuple of (success_count, error_count)
+        """
+        cfg = self.config
+        frame_size = 2 * cfg.channels  # s16le
+        chunk_size = frame_size * 65536
+        tmp_path = self._scratch_path(master_path, sum(t.duration for t in self.tracks))
+        
+        encoder = SupervisedProcess(
+            [
+                "ffmpeg", "-y", "-hide_banner", "-loglevel", "error",
+                "-f", "s16le", "-ar", str(cfg.sample_rate), "-ac", str(cfg.channels),
+                "-i", "pipe:0",
+                tmp_path
+            ],
+            stdin=True,
+            stall_timeout=self.STALL_TIMEOUT,
+            wall_timeout=self.WALL_TIMEOUT
+        )
+        
+        success_count = 0
+        error_count = 0
+        position = 0
+        
+        try:
+            for track in self.tracks:
+                if progress_callback:
+                    progress_callback(f"Processing: {track.clean_name}")
+                
+                decoder = SupervisedProcess(
+                    [
+                        "ffmpeg", "-hide_banner", "-loglevel", "error",
+                        "-i", track.original_path,
+                        "-af", self._build_audio_filter(track),
+                        "-ar", str(cfg.sample_rate),
+                        "-ac", str(cfg.channels),
+                        "-f", "s16le", "pipe:1"
+                    ],
+                    raw_stdout=True,
+                    stall_timeout=self.STALL_TIMEOUT,
+                    wall_timeout=self.WALL_TIMEOUT
+                )
+                
+                written = 0
+                while True:
+                    chunk = decoder.read(chunk_size)
+                    if not chunk:
+                        break
+                    if not encoder.write(chunk):
+                        decoder.cancel()
+                        break
+                    written += len(chunk)
+                result = decoder.wait()
+                
+                track.output_path = master_path
+                track.sample_rate = cfg.sample_rate
+                frames = written // frame_size
+                if result.ok and frames > 0:
+                    track.success = True
+                    track.start_sample = position
+                    track.num_samples = frames
+                    success_count += 1
+                else:
+                    track.success = False
+                    track.error = f"Decoding failed: {result.error}"
+                    if frames:
+                        track.error += f" ({frames / cfg.sample_rate:.1f}s of partial audio left in the master)"
+                    error_count += 1
+                # A failed decode may have emitted partial audio
+                position += frames
+            
+            encoded = encoder.wait()
+        except Exception:
+            encoder.cancel()
+            encoder.wait()
+            self._discard(tmp_path)
+            raise
+        
+        if not encoded.ok or not os.path.exists(tmp_path):
+            self._discard(tmp_path)
+            for track in self.tracks:
+                track.success = False
+                track.error = f"Master encoding failed: {encoded.error}"
+            return 0, len(self.tracks)
+        
+        self._publish(tmp_path, master_path)
+        return success_count, error_count
+    
     def process_album(
         self,
         input_path: str,
         output_dir: str,
-        progress_callback=None
+        progress_callback=None,
+        single_file: Optional[str] = None
     ) -> Tuple[int, int, List[TrackInfo]]:
         """
         Process entire album
@@ -146,10 +433,25 @@ class AlbumProcessor:
             input_path: Directory with audio files
             output_dir: Output directory
             progress_callback: Optional callback for progress
+            single_file: Render one gapless master with this file name
+                instead of one file per track
         
         Returns:
             Tuple of (success_count, error_count, tracks)
         """
+        started = time.perf_counter()
+        result = self._process_album(input_path, output_dir, progress_callback, single_file)
+        metrics.album_finished(result[0], result[1], time.perf_counter() - started)
+        return result
+    
+    def _process_album(
+        self,
+        input_path: str,
+        output_dir: str,
+        progress_callback=None,
+        single_file: Optional[str] = None
+    ) -> Tuple[int, int, List[TrackInfo]]:
+        """Processing for process_album (which records metrics around it)"""
         # Find audio files
         audio_files = self.find_audio_files(input_path)
         if not audio_files:
@@ -161,6 +463,17 @@ class AlbumProcessor:
         if progress_callback:
             progress_callback(f"Found {len(self.tracks)} audio files")
         
+        # Probe sources in parallel (cached for unchanged files)
+        self.probe_sources()
+        self.analyze_tracks(progress_callback=progress_callback)
+        
+        if single_file:
+            master_path = os.path.join(output_dir, single_file)
+            success_count, error_count = self.process_single_file(
+                master_path, progress_callback
+            )
+            return success_count, error_count, self.tracks
+        
         # Process each track
         success_count = 0
         error_count = 0
@@ -176,8 +489,293 @@ class AlbumProcessor:
             else:
                 error_count += 1
         
+        # Probe outputs for real durations
+        self.probe_outputs()
+        
+        return success_count, error_count, self.tracks
+    
+    def process_catalog(
+        self,
+        input_path: str,
+        output_dir: str,
+        progress_callback=None
+    ) -> Tuple[int, int, List[TrackInfo]]:
+        """
+        Incrementally process a catalog directory (recursive)
+        
+        A state database in the output directory records, per source, its
+        content hash, the audio settings used and its output. Only new or
+        changed sources (or all of them if settings changed) are processed,
+        outputs of removed sources are deleted, and track numbers are kept
+        across runs, including those of sources that failed. The output
+        directory is not scanned, even when it is inside the catalog.
+        
+        Returns:
+            Tuple of (success_count, error_count, tracks)
+        """
+        started = time.perf_counter()
+        root = Path(input_path)
+        audio_files = self.find_audio_files(input_path, recursive=True, exclude=[output_dir])
+        os.makedirs(output_dir, exist_ok=True)
+        state = CatalogState.for_output_dir(output_dir)
+        # Tags are embedded in the outputs, so changing them re-encodes
+        config_key = cache_key(self.config, self.tags)
+        
+        try:
+            known = state.entries()
+            failed = state.failed()
+            sources = {
+                (os.path.relpath(f, root) if root.is_dir() else os.path.basename(f)): f
+                for f in audio_files
+            }
+            
+            # Clean up sources that disappeared
+            for source, entry in known.items():
+                if source not in sources:
+                    if progress_callback:
+                        progress_callback(f"Removed: {entry.clean_name}")
+                    stem = os.path.splitext(entry.output_path)[0]
+                    for fmt in AUDIO_FORMATS.values():
+                        if os.path.exists(stem + fmt["extension"]):
+                            os.remove(stem + fmt["extension"])
+                    state.remove(source)
+            for source in failed:
+                if source not in sources:
+                    state.remove(source)
+            
+            tracks = []
+            pending = []
+            next_number = state.next_track_number()
+            for source, file_path in sorted(sources.items()):
+                entry = known.get(source)
+                content_hash = state.content_hash(file_path, entry)
+                
+                if entry:
+                    track_number, clean_name = entry.track_number, entry.clean_name
+                elif source in failed:
+                    track_number, clean_name = failed[source]
+                else:
+                    track_number, clean_name = next_number, self.clean_filename(file_path)
+                    next_number += 1
+                
+                outputs = self.output_paths(output_dir, f"{track_number:02d} - {clean_name}")
+                output_path = outputs[self.formats[0]]
+                track = TrackInfo(
+                    original_path=file_path,
+                    track_number=track_number,
+                    clean_name=clean_name,
+                    output_path=output_path,
+                    outputs=outputs
+                )
+                tracks.append(track)
+                
+                unchanged = (
+                    entry is not None and
+                    entry.content_hash == content_hash and
+                    entry.config_key == config_key and
+                    all(os.path.exists(p) for p in outputs.values())
+                )
+                if unchanged:
+                    track.success = True
+                    track.skipped = True
+                else:
+                    st = os.stat(file_path)
+                    pending.append((track, CatalogEntry(
+                        source=source, size=st.st_size, mtime=st.st_mtime_ns,
+                        content_hash=content_hash, config_key=config_key,
+                        output_path=output_path, track_number=track_number,
+                        clean_name=clean_name
+                    )))
+            
+            self.tracks = sorted(tracks, key=lambda t: t.track_number)
+            if progress_callback:
+                progress_callback(
+                    f"Found {len(tracks)} audio files, {len(pending)} to process"
+                )
+            
+            # Durations size the staging reservations of the outputs
+            self.probe_sources()
+            self.analyze_tracks([track for track, _ in pending], progress_callback)
+            
+            success_count = len(tracks) - len(pending)
+            error_count = 0
+            for track, entry in pending:
+                if progress_callback:
+                    progress_callback(f"Processing: {track.clean_name}")
+                
+                self.process_track(track)
+                
+                if track.success:
+                    state.record(entry)
+                    success_count += 1
+                else:
+                    state.record_failure(entry)
+                    error_count += 1
+        finally:
+            state.close()
+        
+        self.probe_outputs()
+        
+        # Only count the tracks actually processed in this run
+        metrics.album_finished(
+            success_count - (len(tracks) - len(pending)), error_count,
+            time.perf_counter() - started
+        )
         return success_count, error_count, self.tracks
     
+    def analyze_tracks(self, tracks: Optional[List[TrackInfo]] = None, progress_callback=None):
+        """
+        Analyze tracks for exact silence trimming (cached per content hash)
+        
+        Skipped when silence removal or precise trim is disabled, or when
+        NumPy is missing (silenceremove is used instead).
+        """
+        cfg = self.config
+        if not (cfg.remove_silence and cfg.precise_trim and has_numpy()):
+            return
+        
+        tracks = self.tracks if tracks is None else tracks
+        if not tracks:
+            return
+        if progress_callback:
+            progress_callback(f"Analyzing {len(tracks)} track(s)...")
+        
+        cache = AnalysisCache()
+        threshold = parse_db(cfg.silence_threshold)
+        
+        def analyze(track: TrackInfo):
+            track.analysis = cache.get(
+                track.original_path, cfg.sample_rate, cfg.channels, threshold
+            )
+        
+        with ThreadPoolExecutor(max_workers=os.cpu_count() or 1) as pool:
+            list(pool.map(analyze, tracks))
+    
+    def _get_probe_cache(self) -> ProbeCache:
+        if self.probe_cache is None:
+            self.probe_cache = ProbeCache()
+        return self.probe_cache
+    
+    def probe_sources(self):
+        """Probe all source tracks in parallel"""
+        probes = self._get_probe_cache().probe_many([t.original_path for t in self.tracks])
+        for track in self.tracks:
+            track.source_probe = probes.get(track.original_path)
+    
+    def probe_outputs(self):
+        """Probe all successfully processed tracks in parallel"""
+        done = [t for t in self.tracks if t.success]
+        probes = self._get_probe_cache().probe_many([t.output_path for t in done])
+        for track in done:
+            track.output_probe = probes.get(track.output_path)
+    
+    def render_videos(
+        self,
+        image_path: str,
+        output_dir: str,
+        video_config: VideoConfig,
+        watermark: Optional[WatermarkConfig] = None,
+        cores: Optional[int] = None,
+        progress_callback=None
+    ) -> Tuple[int, int]:
+        """
+        Render one slideshow per processed track, fitted to its duration
+        
+        Images are collected, deduplicated and decoded/scaled once for all
+        tracks (see ``SlideshowGenerator.prescale_images``). Tracks are
+        rendered concurrently, each FFmpeg limited to THREADS_PER_VIDEO
+        threads so that all renders together stay within ``cores``. In
+        catalog mode, unchanged tracks keep their existing video.
+        
+        Returns:
+            Tuple of (success_count, error_count)
+        """
+        from concurrent.futures import ThreadPoolExecutor
+        
+        tracks = [t for t in self.tracks if t.success and t.duration > 0]
+        if not tracks:
+            return 0, 0
+        
+        os.makedirs(output_dir, exist_ok=True)
+        for track in tracks:
+            track.video_path = os.path.join(
+                output_dir, f"{track.track_number:02d} - {track.clean_name}.mp4"
+            )
+        pending = [
+            t for t in tracks
+            if not (t.skipped and os.path.exists(t.video_path))
+        ]
+        if not pending:
+            return len(tracks), 0
+        
+        shared = SlideshowGenerator(video_config, watermark=watermark)
+        shared.staging = self.staging
+        try:
+            images = shared.collect_images(image_path)
+        except RuntimeError as e:   # Dedupe without NumPy
+            for track in pending:
+                track.video_error = str(e)
+            return len(tracks) - len(pending), len(pending)
+        if not images:
+            for track in pending:
+                track.video_error = f"No images found in: {image_path}"
+            return len(tracks) - len(pending), len(pending)
+        if progress_callback:
+            progress_callback(f"Scaling {len(images)} image(s) for {len(pending)} video(s)...")
+        images = shared.prescale_images(images)
+        
+        # The asset is the same for every track: prepared once here rather
+        # than by each concurrent render
+        watermark_asset = None
+        if watermark and watermark.enabled:
+            success, watermark_asset = shared.prepare_watermark()
+            if not success:
+                for track in pending:
+                    track.video_error = watermark_asset
+                return len(tracks) - len(pending), len(pending)
+        
+        cores = cores or os.cpu_count() or 1
+        jobs = max(1, min(len(pending), cores // self.THREADS_PER_VIDEO))
+        threads = max(1, cores // jobs)
+        
+        def render(track: TrackInfo):
+            count, duration = fit_images(
+                len(images), track.duration, video_config.crossfade, video_config.duration
+            )
+            # Rotate the image set so consecutive tracks open on different images
+            start = (track.track_number - 1) * count % len(images)
+            track_images = (images[start:] + images[:start])[:count]
+            
+            cfg = replace(video_config, duration=duration)
+            generator = SlideshowGenerator(cfg, watermark=watermark)
+            generator.threads = threads
+            generator.staging = self.staging
+            generator.watermark_asset = watermark_asset
+            success, message = generator.generate(
+                image_path, track.output_path, track.video_path,
+                image_files=track_images
+            )
+            if not success:
+                track.video_error = message
+            if progress_callback:
+                state = "done" if success else "failed"
+                progress_callback(f"Video {state}: {track.clean_name}")
+            return success
+        
+        if progress_callback:
+            progress_callback(
+                f"Rendering {len(pending)} video(s), {jobs} at a time ({threads} threads each)"
+            )
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            results = list(pool.map(render, pending))
+        
+        success_count = len(tracks) - len(pending) + sum(results)
+        return success_count, len(results) - sum(results)
+    
+    def total_duration(self) -> float:
+        """Total length of the successfully processed tracks"""
+        return sum(t.duration for t in self.tracks if t.success)
+    
     def generate_metadata(
         self,
         output_dir: str,
@@ -193,13 +791,26 @@ class AlbumProcessor:
             f"ARTIST={artist}",
             f"YEAR={datetime.now().year}",
             f"GENRE={genre}",
+            f"FORMATS={','.join(self.formats)}",
             "",
             "TRACKLIST:",
         ]
         
         for track in self.tracks:
             if track.success:
-                lines.append(f"  {track.track_number:02d}. {track.clean_name}")
+                line = f"  {track.track_number:02d}. {track.clean_name} ({format_time(track.duration)})"
+                if track.analysis:
+                    a = track.analysis
+                    line += (
+                        f" [trimmed {a.leading_silence:.3f}s / {a.trailing_silence:.3f}s,"
+                        f" peak {a.peak_db:.1f} dBFS]"
+                    )
+                lines.append(line)
+        
+        lines.extend([
+            "",
+            f"TOTAL={format_time(self.total_duration())}",
+        ])
         
         with open(metadata_path, 'w', encoding='utf-8') as f:
             f.write('\n'.join(lines))
@@ -210,9 +821,20 @@ class AlbumProcessor:
         self,
         output_dir: str,
         album_name: str,
-        artist: str
+        artist: str,
+        single_file: Optional[str] = None
     ) -> str:
-        """Generate CUE sheet for album"""
+        """
+        Generate CUE sheet for album
+        
+        Args:
+            output_dir: Output directory
+            album_name: Album title
+            artist: Performer
+            single_file: Name of a file holding all tracks back to back; track
+                indexes are then cumulative probed durations. Otherwise each
+                track refers to its own file and starts at 00:00:00.
+        """
         cue_path = os.path.join(output_dir, f"{album_name}.cue")
         
         lines = [
@@ -221,21 +843,69 @@ class AlbumProcessor:
             ""
         ]
         
+        if single_file:
+            lines.extend([f'FILE "{single_file}" WAVE', ""])
+        
+        position = 0.0
         for track in self.tracks:
             if track.success:
+                if not single_file:
+                    lines.append(f'FILE "{os.path.basename(track.output_path)}" WAVE')
                 lines.extend([
-                    f'FILE "{os.path.basename(track.output_path)}" WAVE',
                     f"  TRACK {track.track_number:02d} AUDIO",
                     f'    TITLE "{track.clean_name}"',
                     f'    PERFORMER "{artist}"',
-                    "    INDEX 01 00:00:00",
+                    f"    INDEX 01 {format_cue_time(self._track_start(track, position))}",
                     ""
                 ])
+                if single_file:
+                    position += track.duration
         
         with open(cue_path, 'w', encoding='utf-8') as f:
             f.write('\n'.join(lines))
         
         return cue_path
+    
+    @staticmethod
+    def _track_start(track: TrackInfo, position: float) -> float:
+        """Start of a track in a single file: exact if rendered by us"""
+        if track.start_sample is not None and track.sample_rate:
+            return track.start_sample / track.sample_rate
+        return position
+
+
+def fit_images(
+    available: int,
+    target: float,
+    crossfade: float,
+    preferred: float
+) -> Tuple[int, float]:
+    """
+    Number of images and duration per image filling a target duration
+    
+    All available images are used, each shown for as long as needed, unless
+    that would make them shorter than the preferred duration: fewer images
+    are then used. Images never get shorter than twice the crossfade.
+    
+    Returns:
+        Tuple of (image count, duration per image)
+    """
+    minimum = max(preferred, 2 * crossfade, 0.1)
+    # n images last n*d - (n-1)*crossfade
+    count = available
+    if count > 1:
+        count = min(count, max(1, int((target - crossfade) // (minimum - crossfade))))
+    if count == 1:
+        return 1, target
+    return count, (target + (count - 1) * crossfade) / count
+
+
+def format_cue_time(seconds: float) -> str:
+    """Format seconds as a CUE position (mm:ss:ff, 75 frames per second)"""
+    frames = int(round(seconds * 75))
+    m, rest = divmod(frames, 75 * 60)
+    s, f = divmod(rest, 75)
+    return f"{m:02d}:{s:02d}:{f:02d}"
 
 
 def check_ffmpeg() -> bool:
@@ -0,0 +1,219 @@
+"""
+Streaming silence and peak analysis of audio tracks (NumPy)
+
+Tracks are decoded once to PCM through an FFmpeg pipe and processed in
+fixed-size chunks, so memory stays bounded whatever the track length.
+"""
+
+import os
+import subprocess
+from dataclasses import dataclass, field
+from typing import Optional
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from .cache import get_cache_dir, cache_key, file_hash, partial_path
+
+
+def has_numpy() -> bool:
+    """Check if NumPy (needed for analysis) is available"""
+    return np is not None
+
+
+def parse_db(value) -> float:
+    """Parse a level like "-50dB" or -50 to a float in dB"""
+    if isinstance(value, (int, float)):
+        return float(value)
+    text = str(value).strip()
+    if text.lower().endswith('db'):
+        text = text[:-2]
+    return float(text)
+
+
+@dataclass
+class TrackAnalysis:
+    """Levels and silence boundaries of a track"""
+    sample_rate: int
+    channels: int
+    num_samples: int                # Sample frames in the decoded track
+    block_size: int                 # Sample frames per envelope block
+    start_sample: int               # First non-silent sample frame
+    end_sample: int                 # Last non-silent sample frame + 1
+    peak: float                     # Overall peak (linear, 0..1)
+    rms: float                      # Overall RMS (linear, 0..1)
+    peak_envelope: Optional["np.ndarray"] = field(default=None, repr=False)
+    rms_envelope: Optional["np.ndarray"] = field(default=None, repr=False)
+
+    @property
+    def leading_silence(self) -> float:
+        return self.start_sample / self.sample_rate
+
+    @property
+    def trailing_silence(self) -> float:
+        return (self.num_samples - self.end_sample) / self.sample_rate
+
+    @property
+    def trimmed_duration(self) -> float:
+        return (self.end_sample - self.start_sample) / self.sample_rate
+
+    @property
+    def peak_db(self) -> float:
+        return 20 * float(np.log10(max(self.peak, 1e-10)))
+
+
+def analyze_file(
+    path: str,
+    sample_rate: int,
+    channels: int,
+    threshold_db: float = -50.0,
+    block_size: int = 4096,
+    chunk_blocks: int = 64
+) -> Optional[TrackAnalysis]:
+    """
+    Decode a track to PCM and compute envelopes and silence boundaries
+
+    Audio is decoded at the given sample rate/channels so sample offsets
+    line up with a processing chain that resamples first.
+
+    Returns:
+        TrackAnalysis, or None if the file could not be decoded
+    """
+    if np is None:
+        raise RuntimeError("NumPy is required for track analysis")
+
+    cmd = [
+        "ffmpeg", "-hide_banner", "-loglevel", "error",
+        "-i", path,
+        "-map", "0:a:0",
+        "-ar", str(sample_rate), "-ac", str(channels),
+        "-f", "s16le", "pipe:1"
+    ]
+    process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+
+    threshold = (10 ** (threshold_db / 20)) * 32768
+    frame_bytes = 2 * channels
+    read_size = frame_bytes * block_size * chunk_blocks
+
+    position = 0
+    first = None
+    last = None
+    peak_blocks = []
+    rms_blocks = []
+    sum_squares = 0.0
+    carry = b""
+
+    def consume(buf: bytes):
+        nonlocal position, first, last, sum_squares
+        frames = np.frombuffer(buf, dtype='<i2').reshape(-1, channels)
+        n = frames.shape[0]
+
+        amplitude = np.abs(frames.astype(np.int32)).max(axis=1)
+        loud = np.flatnonzero(amplitude > threshold)
+        if loud.size:
+            if first is None:
+                first = position + int(loud[0])
+            last = position + int(loud[-1])
+
+        squares = np.square(frames.astype(np.float32)).mean(axis=1)
+        sum_squares += float(squares.sum(dtype=np.float64))
+
+        full = n - n % block_size
+        if full:
+            peak_blocks.append(amplitude[:full].reshape(-1, block_size).max(axis=1))
+            rms_blocks.append(np.sqrt(squares[:full].reshape(-1, block_size).mean(axis=1)))
+        if full < n:
+            peak_blocks.append(amplitude[full:].max(keepdims=True))
+            rms_blocks.append(np.sqrt(squares[full:].mean(keepdims=True)))
+
+        position += n
+
+    try:
+        while True:
+            data = process.stdout.read(read_size)
+            if not data:
+                break
+            buf = carry + data
+            usable = len(buf) - len(buf) % (frame_bytes * block_size)
+            carry = buf[usable:]
+            if usable:
+                consume(buf[:usable])
+        # Last partial block
+        usable = len(carry) - len(carry) % frame_bytes
+        if usable:
+            consume(carry[:usable])
+    finally:
+        process.stdout.close()
+        process.wait()
+
+    if process.returncode != 0 or position == 0:
+        return None
+
+    peak_env = (np.concatenate(peak_blocks) / 32768).astype(np.float32)
+    rms_env = (np.concatenate(rms_blocks) / 32768).astype(np.float32)
+
+    # A fully silent track is kept whole
+    if first is None:
+        first, last = 0, position - 1
+
+    return TrackAnalysis(
+        sample_rate=sample_rate,
+        channels=channels,
+        num_samples=position,
+        block_size=block_size,
+        start_sample=first,
+        end_sample=last + 1,
+        peak=float(peak_env.max()),
+        rms=float(np.sqrt(sum_squares / position)) / 32768,
+        peak_envelope=peak_env,
+        rms_envelope=rms_env,
+    )
+
+
+class AnalysisCache:
+    """Analyses stored as .npz files, keyed by content hash and settings"""
+
+    SCALARS = ("sample_rate", "channels", "num_samples", "block_size",
+               "start_sample", "end_sample", "peak", "rms")
+
+    def __init__(self, cache_dir: Optional[str] = None):
+        self.cache_dir = cache_dir or get_cache_dir("analysis")
+
+    def get(
+        self,
+        path: str,
+        sample_rate: int,
+        channels: int,
+        threshold_db: float = -50.0,
+        block_size: int = 4096
+    ) -> Optional[TrackAnalysis]:
+        """Analyze a track, reusing a previous analysis of identical content"""
+        key = cache_key(file_hash(path), sample_rate, channels, threshold_db, block_size)
+        npz_path = os.path.join(self.cache_dir, f"{key}.npz")
+
+        if os.path.exists(npz_path):
+            try:
+                with np.load(npz_path) as data:
+                    values = {name: data[name].item() for name in self.SCALARS}
+                    return TrackAnalysis(
+                        peak_envelope=data["peak_envelope"],
+                        rms_envelope=data["rms_envelope"],
+                        **values
+                    )
+            except (OSError, KeyError, ValueError):
+                pass
+
+        analysis = analyze_file(path, sample_rate, channels, threshold_db, block_size)
+        if analysis is not None:
+            tmp_path = partial_path(npz_path, unique=True)
+            with open(tmp_path, 'wb') as f:
+                np.savez_compressed(
+                    f,
+                    peak_envelope=analysis.peak_envelope,
+                    rms_envelope=analysis.rms_envelope,
+                    **{name: getattr(analysis, name) for name in self.SCALARS}
+                )
+            os.replace(tmp_path, npz_path)
+        return analysis
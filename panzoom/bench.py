@@ -0,0 +1,469 @@
+"""
+Benchmarks and budget checks
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import shutil
+import subprocess
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Sequence
+
+
+# Import-time budget for the CLI entry point (milliseconds)
+STARTUP_BUDGET_MS = 100.0
+
+# Modules the CLI must not import before a command needs them
+HEAVY_MODULES = (
+    "yaml", "numpy", "sqlite3", "subprocess", "threading",
+    "concurrent.futures",
+    "panzoom.slideshow", "panzoom.album",
+)
+
+
+@dataclass
+class StartupReport:
+    """Import cost of a module measured with ``python -X importtime``"""
+    module: str
+    total_ms: float
+    budget_ms: float
+    heavy_imports: List[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return self.total_ms <= self.budget_ms and not self.heavy_imports
+
+
+def measure_startup(
+    module: str = "panzoom.cli",
+    budget_ms: float = STARTUP_BUDGET_MS,
+    runs: int = 5
+) -> StartupReport:
+    """
+    Measure the import time of a module in fresh interpreters
+
+    The best of several runs is kept to reduce noise from the machine.
+    """
+    best = None
+    heavy = set()
+
+    for _ in range(max(1, runs)):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            capture_output=True, text=True
+        )
+        if result.returncode != 0:
+            raise RuntimeError(f"Cannot import {module}: {result.stderr.strip()}")
+
+        total_us = None
+        for line in result.stderr.splitlines():
+            if not line.startswith("import time:"):
+                continue
+            parts = line.split("|")
+            if len(parts) != 3:
+                continue
+            name = parts[2].strip()
+            if name in HEAVY_MODULES:
+                heavy.add(name)
+            if name == module:
+                try:
+                    total_us = int(parts[1])
+                except ValueError:
+                    pass
+
+        if total_us is not None and (best is None or total_us < best):
+            best = total_us
+
+    return StartupReport(
+        module=module,
+        total_ms=(best or 0) / 1000,
+        budget_ms=budget_ms,
+        heavy_imports=sorted(heavy),
+    )
+
+
+@dataclass
+class EncodeReport:
+    """Size, speed and quality of one encode of the benchmark clip"""
+    name: str
+    seconds: float
+    size_bytes: int
+    duration: float
+    ssim: float                     # Against the lossless reference (1.0 = identical)
+
+    @property
+    def bitrate_kbps(self) -> float:
+        return self.size_bytes * 8 / 1000 / self.duration if self.duration else 0.0
+
+
+def _ffmpeg(args: List[str], cwd: Optional[str] = None) -> str:
+    """Run FFmpeg, returning its stderr"""
+    result = subprocess.run(
+        ["ffmpeg", "-y", "-hide_banner", *args], capture_output=True, text=True, cwd=cwd
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Benchmark command failed: {result.stderr.strip()[-500:]}")
+    return result.stderr
+
+
+def measure_encoding(
+    width: int = 1280,
+    height: int = 720,
+    fps: int = 30,
+    images: int = 4,
+    seconds: float = 6.0,
+    crf: int = 20,
+    preset: str = "medium",
+    maxrate: str = "",
+    progress_callback: Optional[Callable[[str], None]] = None
+) -> List[EncodeReport]:
+    """
+    Compare the plain CRF encode with the slideshow encoding policy
+
+    A synthetic slideshow (generated photo-like images, real motion and
+    crossfades) is rendered once to a lossless reference, then encoded
+    with both settings. SSIM against the reference shows whether the
+    smaller file kept the same quality.
+
+    Returns:
+        Reports for the baseline and the policy encode, in that order
+    """
+    from .cache import get_cache_dir
+    from .config import VideoConfig
+    from .encoding import keyframe_times, video_args
+    from .slideshow import SlideshowGenerator
+
+    work_dir = get_cache_dir("bench")
+    sources = {
+        "mandelbrot.png": "mandelbrot=s=2400x1800",
+        "testsrc2.png": "testsrc2=s=2400x1800",
+    }
+    paths = []
+    for name, source in sources.items():
+        path = os.path.join(work_dir, name)
+        if not os.path.exists(path):
+            _ffmpeg(["-loglevel", "error", "-f", "lavfi", "-i", source,
+                     "-frames:v", "1", path])
+        paths.append(path)
+
+    cfg = VideoConfig(
+        width=width, height=height, fps=fps, duration=seconds,
+        crossfade=seconds / 4, crf=crf, preset=preset, maxrate=maxrate
+    )
+    generator = SlideshowGenerator(cfg)
+    generator.prepare_images([paths[i % len(paths)] for i in range(images)])
+    duration = generator.estimate_duration()
+
+    if progress_callback:
+        progress_callback("Rendering lossless reference...")
+    reference = os.path.join(work_dir, f"reference_{width}x{height}_{fps}.mkv")
+    _ffmpeg([
+        "-loglevel", "error",
+        *generator._image_inputs(),
+        "-filter_complex", generator._build_filter_complex(),
+        "-map", "[v]", *generator.MEZZANINE_CODECS["ffv1"],
+        reference
+    ])
+
+    keyframes = keyframe_times(cfg, len(generator.images))
+    reports = []
+    for name, policy in (("baseline", False), ("policy", True)):
+        if progress_callback:
+            progress_callback(f"Encoding {name}...")
+        output = os.path.join(work_dir, f"{name}.mp4")
+        started = time.perf_counter()
+        _ffmpeg([
+            "-loglevel", "error", "-i", reference,
+            *video_args(cfg, keyframes, policy=policy),
+            output
+        ])
+        elapsed = time.perf_counter() - started
+
+        log = _ffmpeg(["-i", output, "-i", reference, "-lavfi", "ssim", "-f", "null", "-"])
+        match = re.search(r"All:([\d.]+)", log)
+        reports.append(EncodeReport(
+            name=name,
+            seconds=elapsed,
+            size_bytes=os.path.getsize(output),
+            duration=duration,
+            ssim=float(match.group(1)) if match else 0.0,
+        ))
+    return reports
+
+
+# Golden-output regression: quality floors against the stored frames, and
+# the slowdown allowed against the stored render time. The goldens come from
+# the current renderer and encoder settings, so the floors only absorb
+# FFmpeg build differences. The slack is in the speed check instead: tiny
+# renders and the ffprobe calls around them are noisy.
+GOLDEN_MIN_SSIM = 0.98
+GOLDEN_MIN_PSNR = 35.0              # dB
+GOLDEN_SPEED_TOLERANCE = 0.5
+GOLDEN_SPEED_SLACK = 1.0            # Seconds
+GOLDEN_MANIFEST = "golden.json"
+GOLDEN_SIZE = (320, 180)
+
+# Synthetic inputs: three aspect ratios so every crop path is exercised
+GOLDEN_SOURCES = {
+    "testsrc2.png": "testsrc2=s=960x720",
+    "smptehdbars.png": "smptehdbars=s=1280x720",
+    "mandelbrot.png": "mandelbrot=s=600x800",
+}
+
+
+@dataclass
+class GoldenCase:
+    """A small synthetic project of the golden run"""
+    name: str
+    preset: str = ""                # Style preset (sets timing, motion, fps)
+    transition: str = "fade"
+    motion: str = "expression"
+    still: bool = False             # No zoom or pan: held frames
+    watermark: bool = False
+
+
+GOLDEN_CASES = [
+    *[GoldenCase(f"preset-{name}", preset=name)
+      for name in ("fast", "cinematic", "slow", "dynamic", "minimal")],
+    # Not slideup or vlslice: FFmpeg 7.0 renders them differently from run to run
+    *[GoldenCase(f"transition-{name}", transition=name)
+      for name in ("wipeleft", "slidedown", "circleopen", "dissolve", "pixelize")],
+    GoldenCase("motion-table", motion="table"),
+    GoldenCase("still", still=True),
+    GoldenCase("watermark", watermark=True),
+]
+
+
+@dataclass
+class GoldenResult:
+    """Comparison of one case with its golden output"""
+    name: str
+    seconds: float                  # Render wall time
+    duration: float                 # Output duration (ffprobe)
+    estimated: float                # estimate_duration of the project
+    golden_seconds: Optional[float] = None
+    golden_duration: Optional[float] = None
+    ssim: float = 1.0               # Worst frame
+    psnr: float = float("inf")      # Worst frame (dB)
+    failures: List[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.failures
+
+
+def _probe_duration(path: str) -> float:
+    result = subprocess.run(
+        ["ffprobe", "-v", "error", "-show_entries", "format=duration", "-of", "csv=p=0", path],
+        capture_output=True, text=True
+    )
+    try:
+        return float(result.stdout.strip())
+    except ValueError:
+        raise RuntimeError(f"Cannot read duration of {path}: {result.stderr.strip()}")
+
+
+def _golden_config(case: GoldenCase):
+    """Output settings of a case, at the small golden size"""
+    from .config import VideoConfig, apply_preset
+
+    cfg = VideoConfig(duration=3.0, crossfade=1.0, fps=25, preset="medium", crf=20)
+    if case.preset:
+        apply_preset(cfg, case.preset)
+    cfg.width, cfg.height = GOLDEN_SIZE
+    cfg.transition = case.transition
+    cfg.motion = case.motion
+    if case.still:
+        cfg.zoom_intensity = 0.0
+        cfg.pan_intensity = 0.0
+    return cfg
+
+
+def _golden_frames(generator) -> List[int]:
+    """Frames to compare: each image mid-transition and fully shown"""
+    cfg = generator.config
+    frames = []
+    for i in range(len(generator.images)):
+        start = generator.image_start(i)
+        if i:
+            frames.append(start + cfg.crossfade / 2)
+        frames.append(start + cfg.crossfade + (cfg.duration - 2 * cfg.crossfade) / 2)
+    return [int(t * cfg.fps) for t in frames]
+
+
+def _extract_frames(video: str, frames: Sequence[int], out_dir: str):
+    if os.path.isdir(out_dir):
+        shutil.rmtree(out_dir)
+    os.makedirs(out_dir)
+    select = "+".join(f"eq(n,{n})" for n in frames)
+    _ffmpeg([
+        "-loglevel", "error", "-i", video,
+        "-vf", f"select='{select}'", "-vsync", "0",
+        os.path.join(out_dir, "frame_%02d.png")
+    ])
+    if len(os.listdir(out_dir)) != len(frames):
+        raise RuntimeError(f"Expected {len(frames)} frames from {video}")
+
+
+def _compare_frames(frames_dir: str, golden_dir: str):
+    """Worst-frame SSIM and PSNR of two frame directories"""
+    _ffmpeg([
+        "-loglevel", "error",
+        "-i", os.path.join(frames_dir, "frame_%02d.png"),
+        "-i", os.path.join(golden_dir, "frame_%02d.png"),
+        "-filter_complex", (
+            "[0:v]split[a][b];[1:v]split[c][d];"
+            "[a][c]ssim=stats_file=ssim.log[s];[b][d]psnr=stats_file=psnr.log[p]"
+        ),
+        "-map", "[s]", "-map", "[p]", "-f", "null", "-"
+    ], cwd=frames_dir)
+
+    def worst(name: str, pattern: str) -> float:
+        with open(os.path.join(frames_dir, name), 'r', encoding='utf-8') as f:
+            values = [float(m.group(1)) for m in re.finditer(pattern, f.read())]
+        if not values:
+            raise RuntimeError(f"No comparison results in {name}")
+        return min(values)
+
+    return worst("ssim.log", r"All:([\d.]+|inf)"), worst("psnr.log", r"psnr_avg:([\d.]+|inf)")
+
+
+def run_golden(
+    golden_dir: str,
+    update: bool = False,
+    names: Optional[Sequence[str]] = None,
+    min_ssim: float = GOLDEN_MIN_SSIM,
+    min_psnr: float = GOLDEN_MIN_PSNR,
+    speed_tolerance: Optional[float] = GOLDEN_SPEED_TOLERANCE,
+    progress_callback: Optional[Callable[[str], None]] = None
+) -> List[GoldenResult]:
+    """
+    Render the golden cases and check them against the stored outputs
+
+    Every case is rendered from scratch (private cache) through
+    ``SlideshowGenerator.generate``. A case fails when the output length
+    differs from ``estimate_duration`` or from the golden length by more
+    than two frames, when a sampled frame falls under the SSIM or PSNR
+    floor, or when the render is slower than the golden time by more
+    than ``speed_tolerance``. With ``update`` the outputs become the new
+    goldens (frames in ``<golden_dir>/<case>/``, lengths and times in
+    the manifest); timings are only comparable on the same machine.
+
+    Args:
+        names: Only run these cases
+        speed_tolerance: Allowed slowdown (0.25 = 25%), None to skip
+
+    Returns:
+        One result per case
+    """
+    from .cache import get_cache_dir, partial_path
+    from .config import WatermarkConfig
+    from .slideshow import SlideshowGenerator
+
+    cases = [c for c in GOLDEN_CASES if not names or c.name in names]
+    unknown = set(names or ()) - {c.name for c in GOLDEN_CASES}
+    if unknown:
+        raise RuntimeError(f"Unknown golden case(s): {', '.join(sorted(unknown))}")
+
+    golden_dir = os.path.abspath(golden_dir)   # Frames are compared from the work directory
+    manifest_path = os.path.join(golden_dir, GOLDEN_MANIFEST)
+    manifest: Dict[str, dict] = {}
+    if os.path.exists(manifest_path):
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    elif not update:
+        raise RuntimeError(f"No goldens in {golden_dir} (record them with --update)")
+
+    work_dir = get_cache_dir("bench/golden")
+    images = []
+    for name, source in GOLDEN_SOURCES.items():
+        path = os.path.join(work_dir, name)
+        if not os.path.exists(path):
+            _ffmpeg(["-loglevel", "error", "-f", "lavfi", "-i", source, "-frames:v", "1", path])
+        images.append(path)
+    logo = os.path.join(work_dir, "logo.png")
+    if not os.path.exists(logo):
+        _ffmpeg(["-loglevel", "error", "-f", "lavfi", "-i", "color=c=white:s=200x80",
+                 "-frames:v", "1", logo])
+
+    results = []
+    for case in cases:
+        if progress_callback:
+            progress_callback(f"Rendering {case.name}...")
+        cfg = _golden_config(case)
+        watermark = WatermarkConfig(enabled=True, image_path=logo) if case.watermark else None
+        cache_dir = os.path.join(work_dir, "cache")
+        shutil.rmtree(cache_dir, ignore_errors=True)
+        generator = SlideshowGenerator(cfg, watermark=watermark, cache_dir=cache_dir)
+        generator.prepare_images(list(images))
+        estimated = generator.estimate_duration()
+
+        audio = os.path.join(work_dir, f"{case.name}.wav")
+        _ffmpeg(["-loglevel", "error", "-f", "lavfi",
+                 "-i", f"sine=frequency=440:duration={estimated + 1:.3f}", audio])
+        output = os.path.join(work_dir, f"{case.name}.mp4")
+        started = time.perf_counter()
+        success, message = generator.generate(work_dir, audio, output, image_files=list(images))
+        seconds = time.perf_counter() - started
+        if not success:
+            raise RuntimeError(f"{case.name}: {message}")
+
+        result = GoldenResult(
+            name=case.name, seconds=seconds,
+            duration=_probe_duration(output), estimated=estimated
+        )
+        frames = _golden_frames(generator)
+        frames_dir = os.path.join(work_dir, case.name)
+        _extract_frames(output, frames, frames_dir)
+
+        tolerance = 2.0 / cfg.fps
+        if abs(result.duration - estimated) > tolerance:
+            result.failures.append(
+                f"length {result.duration:.3f}s, estimate_duration {estimated:.3f}s"
+            )
+
+        case_golden = os.path.join(golden_dir, case.name)
+        if update:
+            if os.path.isdir(case_golden):
+                shutil.rmtree(case_golden)
+            os.makedirs(golden_dir, exist_ok=True)
+            shutil.copytree(frames_dir, case_golden)
+            manifest[case.name] = {
+                "duration": result.duration,
+                "seconds": seconds,
+                "frames": frames,
+            }
+        elif case.name not in manifest:
+            result.failures.append("no golden (record it with --update)")
+        else:
+            golden = manifest[case.name]
+            result.golden_duration = golden["duration"]
+            result.golden_seconds = golden["seconds"]
+            if golden["frames"] != frames:
+                result.failures.append("sampled frames differ from the golden (timing changed)")
+            else:
+                result.ssim, result.psnr = _compare_frames(frames_dir, case_golden)
+                if result.ssim < min_ssim:
+                    result.failures.append(f"SSIM {result.ssim:.4f} < {min_ssim}")
+                if result.psnr < min_psnr:
+                    result.failures.append(f"PSNR {result.psnr:.1f} dB < {min_psnr}")
+            if abs(result.duration - result.golden_duration) > tolerance:
+                result.failures.append(
+                    f"length {result.duration:.3f}s, golden {result.golden_duration:.3f}s"
+                )
+            limit = result.golden_seconds * (1 + (speed_tolerance or 0)) + GOLDEN_SPEED_SLACK
+            if speed_tolerance is not None and seconds > limit:
+                result.failures.append(
+                    f"render {seconds:.2f}s, golden {result.golden_seconds:.2f}s"
+                )
+        results.append(result)
+
+    if update:
+        tmp_path = partial_path(manifest_path, unique=True)
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, manifest_path)
+    return results
@@ -0,0 +1,107 @@
+"""
+On-disk cache for reusable render intermediates
+"""
+
+import os
+import json
+import hashlib
+from pathlib import Path
+from dataclasses import asdict, is_dataclass
+
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "panzoom")
+
+
+def get_cache_dir(subdir: str = "", root: str = "") -> str:
+    """Get (and create) a cache directory
+
+    The root can be overridden with the PANZOOM_CACHE_DIR environment variable.
+    """
+    base = root or os.environ.get("PANZOOM_CACHE_DIR") or DEFAULT_CACHE_DIR
+    path = os.path.join(base, subdir) if subdir else base
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def cache_key(*parts) -> str:
+    """Build a stable short hash from dataclasses, dicts and scalars"""
+    normalized = [asdict(p) if is_dataclass(p) else p for p in parts]
+    blob = json.dumps(normalized, sort_keys=True, default=str)
+    return hashlib.sha256(blob.encode('utf-8')).hexdigest()[:16]
+
+
+def file_signature(path: str) -> dict:
+    """Cheap identity of a file (path, size, mtime) for cache keys"""
+    st = os.stat(path)
+    return {
+        "path": os.path.abspath(path),
+        "size": st.st_size,
+        "mtime": st.st_mtime_ns,
+    }
+
+
+def file_hash(path: str, chunk_size: int = 1 << 20) -> str:
+    """SHA-256 of a file's content"""
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def partial_path(path: str, unique: bool = False) -> str:
+    """Temporary sibling path used to write a file atomically
+
+    The extension is kept so FFmpeg can still infer the output format.
+    With unique, the name is also specific to the process and thread, for
+    cache entries that concurrent renders may write at the same time.
+    """
+    p = Path(path)
+    tag = ""
+    if unique:
+        import threading
+        tag = f".{os.getpid()}-{threading.get_ident()}"
+    return str(p.with_name(f".{p.stem}{tag}.part{p.suffix}"))
+
+
+def touch(path: str):
+    """Mark a cached file as just used for prune_lru"""
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+
+def prune_lru(directory: str, max_bytes: int, keep: tuple = ()) -> int:
+    """Delete the least recently used files until the directory fits max_bytes
+
+    Recency is the modification time, which callers bump with touch() on a
+    cache hit. Paths in keep are never deleted. Returns the bytes freed.
+    """
+    entries = []
+    for entry in os.scandir(directory):
+        if not entry.is_file(follow_symlinks=False) or entry.name.startswith('.'):
+            continue
+        try:
+            st = entry.stat(follow_symlinks=False)
+        except OSError:
+            continue
+        entries.append((st.st_mtime_ns, st.st_size, entry.path))
+
+    total = sum(size for _, size, _ in entries)
+    kept = {os.path.abspath(p) for p in keep}
+    freed = 0
+    for _, size, path in sorted(entries):
+        if total - freed <= max_bytes:
+            break
+        if os.path.abspath(path) in kept:
+            continue
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        freed += size
+    return freed
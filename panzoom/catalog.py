@@ -0,0 +1,116 @@
+"""
+Persistent state for incremental album catalog processing
+"""
+
+import os
+import time
+import sqlite3
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+from .cache import file_hash
+
+
+@dataclass
+class CatalogEntry:
+    """State recorded for one source file"""
+    source: str
+    size: int
+    mtime: int
+    content_hash: str
+    config_key: str
+    output_path: str
+    track_number: int
+    clean_name: str
+
+
+class CatalogState:
+    """SQLite database recording what was produced from each source file"""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS tracks (
+            source TEXT PRIMARY KEY,
+            size INTEGER NOT NULL,
+            mtime INTEGER NOT NULL,
+            content_hash TEXT NOT NULL,
+            config_key TEXT NOT NULL,
+            output_path TEXT NOT NULL,
+            track_number INTEGER NOT NULL UNIQUE,
+            clean_name TEXT NOT NULL,
+            updated REAL NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS failed (
+            source TEXT PRIMARY KEY,
+            track_number INTEGER NOT NULL UNIQUE,
+            clean_name TEXT NOT NULL
+        )
+    """
+
+    DB_NAME = ".panzoom-catalog.db"
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path)
+        self.conn.executescript(self.SCHEMA)
+        self.conn.commit()
+
+    @classmethod
+    def for_output_dir(cls, output_dir: str) -> 'CatalogState':
+        """Open the state database stored alongside the outputs"""
+        os.makedirs(output_dir, exist_ok=True)
+        return cls(os.path.join(output_dir, cls.DB_NAME))
+
+    def entries(self) -> Dict[str, CatalogEntry]:
+        """All recorded sources"""
+        rows = self.conn.execute(
+            "SELECT source, size, mtime, content_hash, config_key, output_path, "
+            "track_number, clean_name FROM tracks"
+        )
+        return {row[0]: CatalogEntry(*row) for row in rows}
+
+    def failed(self) -> Dict[str, Tuple[int, str]]:
+        """Track number and name given to sources whose processing failed"""
+        rows = self.conn.execute("SELECT source, track_number, clean_name FROM failed")
+        return {row[0]: (row[1], row[2]) for row in rows}
+
+    def next_track_number(self) -> int:
+        row = self.conn.execute(
+            "SELECT MAX(n) FROM (SELECT MAX(track_number) AS n FROM tracks "
+            "UNION ALL SELECT MAX(track_number) FROM failed)"
+        ).fetchone()
+        return (row[0] or 0) + 1
+
+    def content_hash(self, path: str, entry: Optional[CatalogEntry]) -> str:
+        """Hash of a source, reusing the recorded one if size and mtime match"""
+        st = os.stat(path)
+        if entry and entry.size == st.st_size and entry.mtime == st.st_mtime_ns:
+            return entry.content_hash
+        return file_hash(path)
+
+    def record(self, entry: CatalogEntry):
+        """Insert or update the state of a processed source"""
+        self.conn.execute(
+            "INSERT OR REPLACE INTO tracks (source, size, mtime, content_hash, config_key, "
+            "output_path, track_number, clean_name, updated) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (entry.source, entry.size, entry.mtime, entry.content_hash, entry.config_key,
+             entry.output_path, entry.track_number, entry.clean_name, time.time())
+        )
+        self.conn.execute("DELETE FROM failed WHERE source = ?", (entry.source,))
+        self.conn.commit()
+
+    def record_failure(self, entry: CatalogEntry):
+        """Keep the track number of a source that failed, for the next attempt"""
+        self.conn.execute(
+            "INSERT OR REPLACE INTO failed (source, track_number, clean_name) VALUES (?, ?, ?)",
+            (entry.source, entry.track_number, entry.clean_name)
+        )
+        self.conn.commit()
+
+    def remove(self, source: str):
+        """Forget a source"""
+        self.conn.execute("DELETE FROM tracks WHERE source = ?", (source,))
+        self.conn.execute("DELETE FROM failed WHERE source = ?", (source,))
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
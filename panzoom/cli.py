@@ -10,14 +10,17 @@ from pathlib import Path
 from . import __version__
 from .config import (
     ProjectConfig, VideoConfig, AudioConfig, WatermarkConfig, TitleConfig,
-    load_config, save_config, apply_preset, apply_export_profile,
+    load_config, save_config, apply_preset, apply_export_profile, parse_audio_formats,
     PRESETS, TRANSITIONS, EXPORT_PROFILES
 )
-from .slideshow import (
-    SlideshowGenerator, check_ffmpeg, get_ffmpeg_version,
-    format_time, format_progress_bar, ProgressInfo
-)
-from .album import AlbumProcessor
+from .motion import EASINGS
+
+# Rendering modules (and their subprocess/threading/NumPy dependencies) are
+# imported inside the commands that need them, so listing commands and
+# --help stay fast.
+
+# Commands running long enough for the metrics endpoint to be scraped
+METRICS_SERVER_COMMANDS = ("watch", "album")
 
 
 # Terminal colors
@@ -66,8 +69,20 @@ def print_warning(msg: str):
     print(f"{Colors.YELLOW}⚠{Colors.NC} {msg}")
 
 
+def print_staging_report(staging):
+    """What a command wrote through its staging area (nothing if unused)"""
+    from .staging import format_report
+    if staging.report.files:
+        print_info(f"Staging: {format_report(staging.report)}")
+
+
 def cmd_video(args):
     """Handle video generation command"""
+    from .slideshow import (
+        SlideshowGenerator, check_ffmpeg,
+        format_time, format_progress_bar, parse_time, ProgressInfo
+    )
+    
     print_banner()
     
     # Check FFmpeg
@@ -116,14 +131,31 @@ def cmd_video(args):
         config.video.zoom_direction = args.zoom_dir
     if args.pan_dir:
         config.video.pan_direction = args.pan_dir
+    if args.motion:
+        config.video.motion = args.motion
+    if args.easing:
+        config.video.easing = args.easing
     if args.transition:
         config.video.transition = args.transition
     if args.shuffle:
         config.video.shuffle = True
     if args.reverse:
         config.video.reverse = True
+    if args.dedupe is not None:
+        config.video.dedupe = True
+        if args.dedupe is not True:
+            config.video.dedupe_threshold = args.dedupe
+    if config.video.dedupe:
+        from .phash import has_numpy
+        if not has_numpy():
+            print_error("NumPy is required for --dedupe (pip install numpy)")
+            return 1
     if args.quality:
         config.video.crf = args.quality
+    if args.mezzanine or args.deliver:
+        config.video.mezzanine = args.mezzanine or config.video.mezzanine or "ffv1"
+    if args.staging_budget is not None:
+        config.staging.budget_mb = args.staging_budget
     
     # Watermark configuration
     watermark = WatermarkConfig()
@@ -151,8 +183,22 @@ def cmd_video(args):
     # Validate inputs
     images_path = args.images or "."
     audio_path = args.audio
-    output_path = args.output or "slideshow.mp4"
+    output_mode = args.progressive or "mp4"
+    default_output = "slideshow.m3u8" if output_mode == "hls" else "slideshow.mp4"
+    output_path = args.output or default_output
     is_preview = args.preview
+    frame_store = None
+    if args.frame_store:
+        from .framestore import store_dir_for
+        frame_store = store_dir_for(output_path)
+    
+    if args.deliver and output_mode != "mp4":
+        print_error("--deliver cannot be combined with --progressive")
+        return 1
+    if args.deliver and is_preview:
+        # Deliveries would be upscaled from the low-resolution preview mezzanine
+        print_error("--deliver cannot be combined with --preview")
+        return 1
     
     if not os.path.exists(images_path):
         print_error(f"Images path not found: {images_path}")
@@ -170,22 +216,69 @@ def cmd_video(args):
     )
     
     # Find images first to show summary
-    image_files = generator.find_images(images_path)
+    image_files = generator.collect_images(images_path)
     if not image_files:
         print_error(f"No images found in: {images_path}")
         return 1
     
     generator.prepare_images(image_files)
     
+    # Partial render range
+    render_range = None
+    try:
+        if args.only_images:
+            first, _, last = args.only_images.partition('-')
+            render_range = generator.range_from_images(int(first), int(last or first))
+        elif args.time_from or args.time_to:
+            render_range = generator.range_from_times(
+                parse_time(args.time_from) if args.time_from else None,
+                parse_time(args.time_to) if args.time_to else None
+            )
+    except ValueError as e:
+        print_error(f"Invalid range: {e}")
+        return 1
+    
+    # Predict render cost (and pick a preset for the deadline)
+    from .costmodel import CostModel, RenderPlan, estimate, choose_preset, parse_duration
+    cost_model = CostModel.load()
+    plan = RenderPlan.from_generator(generator, render_range)
+    if is_preview:
+        for key, value in SlideshowGenerator.PREVIEW_SETTINGS.items():
+            setattr(plan, key, value)
+    if args.deadline and not is_preview:
+        try:
+            deadline = parse_duration(args.deadline)
+        except ValueError as e:
+            print_error(str(e))
+            return 1
+        cost = choose_preset(plan, deadline, cost_model)
+        config.video.preset = cost.preset
+        if cost.seconds > deadline:
+            print_warning(f"No preset fits the deadline, using fastest ({cost.preset})")
+    else:
+        cost = estimate(plan, cost_model)
+    
     # Show configuration
     print(f"{Colors.WHITE}Configuration:{Colors.NC}")
     print(f"  Images:      {len(generator.images)} files")
+    if generator.dropped_images:
+        print(f"  Dedupe:      {len(generator.dropped_images)} near-duplicate(s) dropped")
     print(f"  Audio:       {audio_path}")
     print(f"  Output:      {output_path}")
+    if output_mode != "mp4":
+        print(f"  Progressive: {output_mode} (playable while rendering)")
+    if config.video.mezzanine and output_mode == "mp4":
+        print(f"  Mezzanine:   {config.video.mezzanine} (lossless, cached)")
+    for profile in args.deliver or []:
+        print(f"  Deliver:     {profile} -> {delivery_path(output_path, profile)}")
+    if frame_store:
+        print(f"  Frames:      {frame_store}")
     print(f"  Duration:    {config.video.duration}s per image")
     print(f"  Resolution:  {config.video.width}x{config.video.height} @ {config.video.fps}fps")
     print(f"  Zoom:        {config.video.zoom_intensity:.0%} ({config.video.zoom_direction})")
     print(f"  Pan:         {config.video.pan_intensity:.0%} ({config.video.pan_direction})")
+    if config.video.motion == "table":
+        print(f"  Motion:      precomputed table ({config.video.easing})")
     print(f"  Transition:  {config.video.transition}")
     print(f"  Shuffle:     {'Yes' if config.video.shuffle else 'No'}")
     if watermark.enabled:
@@ -193,6 +286,12 @@ def cmd_video(args):
     if title.enabled:
         print(f"  Title:       {title.text}")
     print(f"  Est. length: {format_time(generator.estimate_duration())}")
+    if render_range:
+        print(f"  Range:       images {render_range.first_image + 1}-{render_range.last_image + 1} "
+              f"({format_time(render_range.duration)})")
+    calibration = "" if cost_model.calibrated else ", uncalibrated"
+    print(f"  Encoding:    x264 {cost.preset}, CRF {plan.crf}")
+    print(f"  Est. render: {format_time(cost.seconds)} (~{cost.peak_memory_mb:.0f} MB peak{calibration})")
     if is_preview:
         print(f"  {Colors.YELLOW}Mode:        PREVIEW (basse qualité){Colors.NC}")
     print()
@@ -201,6 +300,10 @@ def cmd_video(args):
     last_percent = [0]
     
     def progress(msg):
+        # A new stage starts: clear the progress bar of the previous one
+        if last_percent[0]:
+            sys.stdout.write("\r" + " " * 90 + "\r")
+            last_percent[0] = 0
         print_info(msg)
     
     def progress_bar(info: ProgressInfo):
@@ -209,40 +312,83 @@ def cmd_video(args):
             bar = format_progress_bar(info.percent)
             eta = format_time(info.eta_seconds) if info.eta_seconds > 0 else "--:--"
             speed = f"{info.speed:.1f}x" if info.speed > 0 else "-.-x"
-            sys.stdout.write(f"\r  {bar} | ETA: {eta} | Speed: {speed}   ")
+            playable = f" | Playable: {format_time(info.playable_seconds)}" if output_mode != "mp4" else ""
+            sys.stdout.write(f"\r  {bar} | ETA: {eta} | Speed: {speed}{playable}   ")
             sys.stdout.flush()
     
-    # Generate
-    if is_preview:
-        success, message = generator.generate_preview(
-            images_path,
-            audio_path,
-            output_path,
-            progress_callback=progress,
-            progress_bar_callback=progress_bar
-        )
-    else:
-        success, message = generator.generate(
-            images_path,
-            audio_path,
-            output_path,
-            progress_callback=progress,
-            progress_bar_callback=progress_bar
-        )
-    
-    # Clear progress line
-    sys.stdout.write("\r" + " " * 70 + "\r")
-    
-    if success:
+    # Outputs are written in the staging area, then published
+    from .staging import StagingArea
+    staging = StagingArea(config.staging)
+    generator.staging = staging
+    try:
+        # Generate
+        if is_preview:
+            success, message = generator.generate_preview(
+                images_path,
+                audio_path,
+                output_path,
+                progress_callback=progress,
+                progress_bar_callback=progress_bar,
+                render_range=render_range,
+                output_mode=output_mode,
+                frame_store=frame_store
+            )
+        else:
+            success, message = generator.generate(
+                images_path,
+                audio_path,
+                output_path,
+                progress_callback=progress,
+                progress_bar_callback=progress_bar,
+                render_range=render_range,
+                output_mode=output_mode,
+                frame_store=frame_store
+            )
+        
+        # Clear progress line
+        sys.stdout.write("\r" + " " * 90 + "\r")
+        
+        if args.timings and generator.stage_timings:
+            from .taskgraph import format_timings
+            print(f"{Colors.WHITE}Preparation stages:{Colors.NC}")
+            for line in format_timings(generator.stage_timings):
+                print(f"  {line}")
+        
+        if not success:
+            print_error(message)
+            return 1
         print_success(message)
+        
+        # Other deliveries only re-encode the mezzanine
+        for profile in args.deliver or []:
+            last_percent[0] = 0
+            success, message = generator.deliver(
+                profile, audio_path, delivery_path(output_path, profile),
+                progress_callback=progress,
+                progress_bar_callback=progress_bar
+            )
+            sys.stdout.write("\r" + " " * 90 + "\r")
+            if not success:
+                print_error(message)
+                return 1
+            print_success(message)
         return 0
-    else:
-        print_error(message)
-        return 1
+    finally:
+        staging.cleanup()
+        print_staging_report(staging)
+
+
+def delivery_path(output_path: str, profile: str) -> str:
+    """Output path of an extra delivery: slideshow.mp4 -> slideshow_youtube.mp4"""
+    out = Path(output_path)
+    return str(out.with_name(f"{out.stem}_{profile}.mp4"))
 
 
 def cmd_album(args):
     """Handle album processing command"""
+    from .album import AlbumProcessor, check_ffmpeg
+    from .slideshow import format_time
+    
     print_banner()
     
     # Check FFmpeg
@@ -264,6 +410,16 @@ def cmd_album(args):
         config.genre = args.genre
     if args.no_silence_removal:
         config.audio.remove_silence = False
+    if args.formats:
+        config.audio.formats = args.formats
+    if args.staging_budget is not None:
+        config.staging.budget_mb = args.staging_budget
+    
+    try:
+        config.audio.formats = parse_audio_formats(config.audio.formats)
+    except ValueError as e:
+        print_error(str(e))
+        return 1
     
     input_path = args.input or "."
     output_dir = args.output or "export_ready"
@@ -283,43 +439,173 @@ def cmd_album(args):
     print(f"  Sample rate: {config.audio.sample_rate} Hz")
     print(f"  Artist:      {config.artist}")
     print(f"  Genre:       {config.genre}")
+    if not args.single_file:
+        print(f"  Formats:     {', '.join(config.audio.formats)}")
+    if args.catalog and args.single_file:
+        print_error("--catalog and --single-file cannot be combined")
+        return 1
+    if args.videos and args.single_file:
+        print_error("--videos and --single-file cannot be combined")
+        return 1
+    if args.videos and not os.path.exists(args.videos):
+        print_error(f"Images not found: {args.videos}")
+        return 1
+    if args.videos and config.video.dedupe:
+        from .phash import has_numpy
+        if not has_numpy():
+            print_error("NumPy is required for video.dedupe (pip install numpy)")
+            return 1
+    if args.videos:
+        print(f"  Videos:      one per track from {args.videos}")
+    if args.single_file:
+        print("  Mode:        single-file master")
+    elif args.catalog:
+        print("  Mode:        incremental catalog (recursive)")
     print()
     
     # Process
     def progress(msg):
         print_info(msg)
     
-    success_count, error_count, tracks = processor.process_album(
-        input_path,
-        output_dir,
-        progress_callback=progress
-    )
-    
-    if not tracks:
-        print_error("No audio files found")
-        return 1
-    
-    # Generate metadata
     album_name = Path(input_path).name if Path(input_path).is_dir() else "Album"
-    processor.generate_metadata(output_dir, album_name, config.artist, config.genre)
-    processor.generate_cue_sheet(output_dir, album_name, config.artist)
+    processor.set_album_info(album_name, config.artist, config.genre)
+    single_file = None
+    if args.single_file:
+        single_file = args.single_file if isinstance(args.single_file, str) else f"{album_name}.wav"
+    
+    # Outputs are written in the staging area, then published
+    from .staging import StagingArea
+    staging = StagingArea(config.staging)
+    processor.staging = staging
+    try:
+        if args.catalog:
+            success_count, error_count, tracks = processor.process_catalog(
+                input_path,
+                output_dir,
+                progress_callback=progress
+            )
+        else:
+            success_count, error_count, tracks = processor.process_album(
+                input_path,
+                output_dir,
+                progress_callback=progress,
+                single_file=single_file
+            )
+        
+        if not tracks:
+            print_error("No audio files found")
+            return 1
+        
+        # Generate metadata
+        processor.generate_metadata(output_dir, album_name, config.artist, config.genre)
+        processor.generate_cue_sheet(output_dir, album_name, config.artist, single_file=single_file)
+        
+        video_errors = 0
+        if args.videos:
+            video_dir = os.path.join(output_dir, "videos")
+            watermark = config.watermark if config.watermark.enabled else None
+            _, video_errors = processor.render_videos(
+                args.videos, video_dir, config.video, watermark,
+                cores=args.cores, progress_callback=progress
+            )
+    finally:
+        staging.cleanup()
     
     # Summary
     print()
     print(f"{Colors.WHITE}Results:{Colors.NC}")
     for track in tracks:
         if track.success:
-            print_success(f"{track.track_number:02d}. {track.clean_name}")
+            unchanged = f" {Colors.DIM}(unchanged){Colors.NC}" if track.skipped else ""
+            print_success(f"{track.track_number:02d}. {track.clean_name} ({format_time(track.duration)}){unchanged}")
         else:
             print_error(f"{track.track_number:02d}. {track.clean_name}: {track.error}")
+        if track.video_error:
+            print_error(f"    Video: {track.video_error}")
     
     print()
-    if error_count == 0:
-        print_success(f"Album ready in {output_dir}/ ({success_count} tracks)")
+    print_staging_report(staging)
+    if error_count == 0 and video_errors == 0:
+        print_success(
+            f"Album ready in {output_dir}/ ({success_count} tracks, "
+            f"{format_time(processor.total_duration())})"
+        )
     else:
-        print_warning(f"Completed with {error_count} error(s)")
+        print_warning(f"Completed with {error_count + video_errors} error(s)")
+    
+    return 0 if error_count == 0 and video_errors == 0 else 1
+
+
+def cmd_watch(args):
+    """Re-render a slideshow whenever its image folder changes"""
+    from .slideshow import SlideshowGenerator, check_ffmpeg, format_time
+    from .watch import FolderWatcher
+    
+    print_banner()
+    
+    if not check_ffmpeg():
+        print_error("FFmpeg not found. Please install FFmpeg first.")
+        return 1
+    
+    config = load_config(args.config) if args.config else ProjectConfig()
+    try:
+        if args.export:
+            apply_export_profile(config.video, args.export)
+        if args.preset:
+            apply_preset(config.video, args.preset)
+    except ValueError as e:
+        print_error(str(e))
+        return 1
+    if args.duration:
+        config.video.duration = args.duration
+    if args.crossfade:
+        config.video.crossfade = args.crossfade
+    if args.transition:
+        config.video.transition = args.transition
+    
+    if not os.path.isdir(args.images):
+        print_error(f"Images directory not found: {args.images}")
+        return 1
+    if not os.path.exists(args.audio):
+        print_error(f"Audio file not found: {args.audio}")
+        return 1
+    
+    # Renders publish in place, only the caches follow the staging policy
+    from .staging import StagingArea
+    generator = SlideshowGenerator(
+        config.video,
+        watermark=config.watermark if config.watermark.enabled else None,
+        title=config.title if config.title.enabled else None,
+        cache_dir=StagingArea(config.staging).cache_root or None
+    )
+    watcher = FolderWatcher(
+        generator, args.images, args.audio, args.output,
+        poll_interval=args.interval, debounce=args.debounce
+    )
+    
+    print(f"{Colors.WHITE}Watching:{Colors.NC}")
+    print(f"  Images:      {args.images}")
+    print(f"  Audio:       {args.audio}")
+    print(f"  Output:      {args.output}")
+    print(f"  Polling:     every {args.interval:g}s, render after {args.debounce:g}s without changes")
+    if config.video.shuffle:
+        print_warning("Shuffle reorders every image on each change: segments cannot be reused")
+    print()
+    
+    def rendered(success, message):
+        if success:
+            print_success(message)
+        else:
+            print_error(message)
+        print_info(f"Watching for changes (Ctrl+C to stop, {format_time(generator.estimate_duration())} video)")
     
-    return 0 if error_count == 0 else 1
+    try:
+        watcher.run(on_render=rendered, progress_callback=print_info)
+    except KeyboardInterrupt:
+        watcher.stop()
+        print()
+        print_info(f"Stopped after {watcher.renders} render(s)")
+    return 0
 
 
 def cmd_init(args):
@@ -404,6 +690,187 @@ def cmd_exports(args):
     return 0
 
 
+def cmd_frame(args):
+    """Extract one frame from a frame store"""
+    from .framestore import FrameStore, store_dir_for
+    from .slideshow import parse_time, format_time
+    
+    source = args.input or "preview.mp4"
+    store_dir = source if os.path.isdir(source) else store_dir_for(source)
+    
+    try:
+        seconds = parse_time(args.at)
+    except ValueError as e:
+        print_error(str(e))
+        return 1
+    
+    try:
+        with FrameStore(store_dir) as store:
+            index = store.index_at(seconds)
+            output = args.output or f"frame_{format_time(seconds).replace(':', '-')}.png"
+            store.save_png(seconds, output)
+            print_success(
+                f"Frame {index} ({format_time(store.time_of(index))}, "
+                f"{store.width}x{store.height}) -> {output}"
+            )
+    except (FileNotFoundError, IndexError) as e:
+        print_error(str(e))
+        return 1
+    return 0
+
+
+def cmd_index(args):
+    """Build the perceptual-hash index and report near-duplicates"""
+    print_banner()
+    
+    if not args.phash:
+        print_error("Nothing to index (use --phash)")
+        return 1
+    
+    from .phash import PHashIndex, group_duplicates, has_numpy
+    if not has_numpy():
+        print_error("NumPy is required for perceptual hashing (pip install numpy)")
+        return 1
+    
+    from .slideshow import SlideshowGenerator, check_ffmpeg
+    
+    if not check_ffmpeg():
+        print_error("FFmpeg not found. Please install FFmpeg first.")
+        return 1
+    
+    images_path = args.images or "."
+    images = SlideshowGenerator(VideoConfig()).find_images(images_path)
+    if not images:
+        print_error(f"No images found in: {images_path}")
+        return 1
+    
+    print_info(f"Hashing {len(images)} images...")
+    hashes = PHashIndex().hashes(images, max_workers=args.jobs)
+    groups = group_duplicates(hashes, args.threshold)
+    
+    print()
+    print(f"{Colors.WHITE}Near-duplicate groups (distance <= {args.threshold}):{Colors.NC}")
+    for group in groups:
+        print(f"  {Colors.CYAN}{os.path.basename(group[0])}{Colors.NC}")
+        for path in group[1:]:
+            print(f"    {Colors.DIM}{os.path.basename(path)}{Colors.NC}")
+    
+    print()
+    duplicates = sum(len(g) - 1 for g in groups)
+    print_success(f"Indexed {len(hashes)} images, {duplicates} near-duplicate(s) in {len(groups)} group(s)")
+    if len(hashes) < len(images):
+        print_warning(f"{len(images) - len(hashes)} image(s) could not be decoded")
+    return 0
+
+
+def cmd_bench(args):
+    """Run benchmarks and budget checks"""
+    from .bench import measure_startup
+    
+    print_banner()
+    
+    if args.bench_command == 'startup':
+        report = measure_startup(budget_ms=args.budget)
+        print(f"{Colors.WHITE}Startup:{Colors.NC}")
+        print(f"  Import {report.module}: {report.total_ms:.1f} ms (budget {report.budget_ms:.0f} ms)")
+        for name in report.heavy_imports:
+            print_warning(f"Imported at startup: {name}")
+        if report.ok:
+            print_success("Startup within budget")
+            return 0
+        print_error("Startup over budget")
+        return 1
+    
+    if args.bench_command == 'calibrate':
+        from .costmodel import calibrate
+        
+        model = calibrate(
+            width=args.width, height=args.height, fps=args.fps,
+            seconds=args.seconds, supersample_factors=args.supersample,
+            progress_callback=print_info
+        )
+        print()
+        print(f"{Colors.WHITE}Throughput ({args.width}x{args.height}):{Colors.NC}")
+        px = args.width * args.height
+        for motion, rate in model.motion_px_per_s.items():
+            print(f"  motion {motion:12} {rate / px:8.1f} fps")
+        print(f"  xfade               {model.xfade_px_per_s / px:8.1f} fps")
+        for preset, rate in model.encode_px_per_s.items():
+            print(f"  x264 {preset:14} {rate / px:8.1f} fps")
+        print()
+        print(f"{Colors.WHITE}Memory per input:{Colors.NC}")
+        for factor, rate in model.input_bytes_per_px.items():
+            supersampled_px = px * int(factor) ** 2
+            print(f"  {factor}x supersampling  {supersampled_px * rate / (1024 * 1024):8.1f} MB")
+        print()
+        print_success("Cost model saved")
+        return 0
+    
+    if args.bench_command == 'encode':
+        from .bench import measure_encoding
+        
+        try:
+            baseline, policy = measure_encoding(
+                width=args.width, height=args.height, fps=args.fps,
+                crf=args.crf, preset=args.preset, maxrate=args.maxrate or "",
+                progress_callback=print_info
+            )
+        except RuntimeError as e:
+            print_error(str(e))
+            return 1
+        print()
+        print(f"{Colors.WHITE}Encoding ({args.width}x{args.height}, CRF {args.crf}, {args.preset}):{Colors.NC}")
+        for report in (baseline, policy):
+            print(
+                f"  {report.name:10} {report.size_bytes / 1024:9.0f} KB "
+                f"{report.bitrate_kbps:8.0f} kb/s {report.seconds:7.2f} s  SSIM {report.ssim:.4f}"
+            )
+        saved = 1 - policy.size_bytes / baseline.size_bytes if baseline.size_bytes else 0.0
+        faster = 1 - policy.seconds / baseline.seconds if baseline.seconds else 0.0
+        print()
+        print_success(
+            f"Policy: {saved:+.1%} smaller, {faster:+.1%} faster, "
+            f"SSIM {policy.ssim - baseline.ssim:+.4f}"
+        )
+        return 0
+    
+    if args.bench_command == 'golden':
+        from .bench import run_golden
+        
+        try:
+            results = run_golden(
+                args.dir, update=args.update, names=args.case,
+                min_ssim=args.min_ssim, min_psnr=args.min_psnr,
+                speed_tolerance=None if args.no_timing else args.speed_tolerance,
+                progress_callback=print_info
+            )
+        except RuntimeError as e:
+            print_error(str(e))
+            return 1
+        print()
+        print(f"{Colors.WHITE}Golden cases ({args.dir}):{Colors.NC}")
+        for r in results:
+            golden = f" (golden {r.golden_seconds:.2f}s)" if r.golden_seconds is not None else ""
+            line = (
+                f"{r.name:22} {r.seconds:6.2f}s{golden}  length {r.duration:7.3f}s  "
+                f"SSIM {r.ssim:.4f}  PSNR {r.psnr:5.1f} dB"
+            )
+            if r.ok:
+                print_success(line)
+            else:
+                print_error(f"{line}: {'; '.join(r.failures)}")
+        print()
+        failed = sum(1 for r in results if not r.ok)
+        if failed:
+            print_error(f"{failed} of {len(results)} case(s) failed")
+            return 1
+        print_success(f"{len(results)} case(s) {'recorded' if args.update else 'match their goldens'}")
+        return 0
+    
+    print_error("Missing benchmark name (see: panzoom bench --help)")
+    return 1
+
+
 def main():
     """Main entry point"""
     parser = argparse.ArgumentParser(
@@ -418,6 +885,7 @@ Examples:
   %(prog)s video -a music.wav --preview  # Quick preview
   %(prog)s video -a music.wav --watermark logo.png
   %(prog)s album -i ./audio -o ./export --artist "My Band"
+  %(prog)s watch -i ./dropbox -a music.wav -o live.mp4
   %(prog)s transitions  # List all transitions
   %(prog)s exports      # List export profiles
 """
@@ -425,6 +893,10 @@ Examples:
     
     parser.add_argument('-V', '--version', action='version', version=f'%(prog)s {__version__}')
     parser.add_argument('--no-color', action='store_true', help='Disable colored output')
+    parser.add_argument('--metrics-file', metavar='PATH',
+                        help='Write Prometheus metrics to this textfile (or set PANZOOM_METRICS_FILE)')
+    parser.add_argument('--metrics-port', type=int, metavar='PORT',
+                        help='Serve Prometheus metrics on http://127.0.0.1:PORT/metrics (watch and album)')
     
     subparsers = parser.add_subparsers(dest='command', help='Commands')
     
@@ -437,6 +909,19 @@ Examples:
     video_parser.add_argument('--preset', choices=list(PRESETS.keys()), help='Use style preset')
     video_parser.add_argument('--export', choices=list(EXPORT_PROFILES.keys()), help='Use export profile')
     video_parser.add_argument('--preview', action='store_true', help='Generate quick low-quality preview')
+    video_parser.add_argument('--timings', action='store_true', help='Show timings of the preparation stages')
+    video_parser.add_argument('--progressive', choices=['fmp4', 'hls'],
+                              help='Write fragmented MP4 or HLS, playable while rendering')
+    video_parser.add_argument('--frame-store', action='store_true',
+                              help='Also dump low-res raw frames (<output>.frames) for instant extraction')
+    
+    # Partial render
+    video_parser.add_argument('--from', dest='time_from', metavar='TIME',
+                              help='Render from this time (seconds, MM:SS or HH:MM:SS)')
+    video_parser.add_argument('--to', dest='time_to', metavar='TIME',
+                              help='Render up to this time')
+    video_parser.add_argument('--only-images', metavar='N[-M]',
+                              help='Render only images N to M (1-based)')
     
     # Video settings
     video_parser.add_argument('-d', '--duration', type=float, help='Duration per image (seconds)')
@@ -448,6 +933,10 @@ Examples:
     video_parser.add_argument('--pan', type=float, help='Pan intensity (0.0-1.0)')
     video_parser.add_argument('--zoom-dir', choices=['in', 'out', 'alternate', 'random'], help='Zoom direction')
     video_parser.add_argument('--pan-dir', choices=['left', 'right', 'alternate', 'random'], help='Pan direction')
+    video_parser.add_argument('--motion', choices=['expression', 'table'],
+                              help='Motion engine (table = precomputed per-frame values)')
+    video_parser.add_argument('--easing', choices=list(EASINGS.keys()),
+                              help='Motion easing curve (table motion only)')
     
     # Transitions
     all_transitions = list(TRANSITIONS.keys()) + ['random']
@@ -456,7 +945,17 @@ Examples:
     # Image order
     video_parser.add_argument('--shuffle', action='store_true', help='Randomize image order')
     video_parser.add_argument('--reverse', action='store_true', help='Reverse image order')
+    video_parser.add_argument('--dedupe', nargs='?', type=int, const=True, metavar='DIST',
+                              help='Drop near-duplicate images (perceptual hash distance, default 6)')
     video_parser.add_argument('-q', '--quality', type=int, help='Quality (0-51, lower=better)')
+    video_parser.add_argument('--mezzanine', nargs='?', const='ffv1', choices=['ffv1', 'x264'],
+                              help='Render through a cached lossless intermediate (default: ffv1)')
+    video_parser.add_argument('--deliver', action='append', choices=list(EXPORT_PROFILES.keys()),
+                              metavar='PROFILE', help='Also encode this export profile from the mezzanine (repeatable)')
+    video_parser.add_argument('--deadline', metavar='TIME',
+                              help='Pick the slowest x264 preset finishing in time (e.g. 20m, 1h30m)')
+    video_parser.add_argument('--staging-budget', type=int, metavar='MB',
+                              help='RAM for intermediate files (0 = always on disk)')
     
     # Watermark options
     video_parser.add_argument('--watermark', help='Watermark image file (PNG)')
@@ -464,7 +963,7 @@ Examples:
                               choices=['top-left', 'top-right', 'bottom-left', 'bottom-right', 'center'],
                               help='Watermark position')
     video_parser.add_argument('--watermark-opacity', type=float, help='Watermark opacity (0.0-1.0)')
-    video_parser.add_argument('--watermark-scale', type=float, help='Watermark size (0.0-1.0)')
+    video_parser.add_argument('--watermark-scale', type=float, help='Watermark width relative to video width (0.0-1.0)')
     
     # Title options
     video_parser.add_argument('--title', help='Add title card with text')
@@ -480,6 +979,33 @@ Examples:
     album_parser.add_argument('-l', '--loudness', type=float, help='Target loudness (LUFS)')
     album_parser.add_argument('-r', '--sample-rate', type=int, help='Sample rate (Hz)')
     album_parser.add_argument('--no-silence-removal', action='store_true', help='Keep silence')
+    album_parser.add_argument('--single-file', nargs='?', const=True, metavar='NAME',
+                              help='Render one gapless master (default: <album>.wav, .flac supported) with CUE sheet')
+    album_parser.add_argument('--catalog', action='store_true',
+                              help='Recursive incremental mode: only process new or changed tracks')
+    album_parser.add_argument('--formats', metavar='LIST',
+                              help='Output formats per track, e.g. wav,flac,mp3,m4a (one decode for all)')
+    album_parser.add_argument('--videos', metavar='IMAGES_DIR',
+                              help='Also render one slideshow per track (in <output>/videos), fitted to its duration')
+    album_parser.add_argument('--staging-budget', type=int, metavar='MB',
+                              help='RAM for intermediate files (0 = always on disk)')
+    album_parser.add_argument('--cores', type=int, metavar='N',
+                              help='CPU cores shared by concurrent track videos (default: all)')
+    
+    # Watch command
+    watch_parser = subparsers.add_parser('watch', help='Re-render a slideshow when its image folder changes')
+    watch_parser.add_argument('-i', '--images', required=True, help='Images directory to watch')
+    watch_parser.add_argument('-a', '--audio', required=True, help='Audio file')
+    watch_parser.add_argument('-o', '--output', default='slideshow.mp4', help='Output file (default: slideshow.mp4)')
+    watch_parser.add_argument('-c', '--config', help='Config file')
+    watch_parser.add_argument('--preset', choices=list(PRESETS.keys()), help='Use style preset')
+    watch_parser.add_argument('--export', choices=list(EXPORT_PROFILES.keys()), help='Use export profile')
+    watch_parser.add_argument('-d', '--duration', type=float, help='Duration per image (seconds)')
+    watch_parser.add_argument('-x', '--crossfade', type=float, help='Crossfade duration (seconds)')
+    watch_parser.add_argument('--transition', choices=list(TRANSITIONS.keys()) + ['random'], help='Transition type')
+    watch_parser.add_argument('--interval', type=float, default=2.0, help='Seconds between folder polls')
+    watch_parser.add_argument('--debounce', type=float, default=5.0,
+                              help='Seconds without changes before re-rendering')
     
     # Init command
     init_parser = subparsers.add_parser('init', help='Create config file')
@@ -491,15 +1017,72 @@ Examples:
     subparsers.add_parser('transitions', help='List available transitions')
     subparsers.add_parser('exports', help='List export profiles')
     
+    # Frame extraction
+    frame_parser = subparsers.add_parser('frame', help='Extract a frame from a frame store')
+    frame_parser.add_argument('-i', '--input', help='Rendered video or .frames directory (default: preview.mp4)')
+    frame_parser.add_argument('--at', required=True, metavar='TIME', help='Time (seconds, MM:SS or HH:MM:SS)')
+    frame_parser.add_argument('-o', '--output', help='Output PNG (default: frame_MM-SS.png)')
+    
+    # Image index
+    index_parser = subparsers.add_parser('index', help='Index images and find near-duplicates')
+    index_parser.add_argument('-i', '--images', help='Images directory (default: current)')
+    index_parser.add_argument('--phash', action='store_true', help='Compute perceptual hashes')
+    index_parser.add_argument('-t', '--threshold', type=int, default=6, help='Max hash distance of near-duplicates')
+    index_parser.add_argument('-j', '--jobs', type=int, help='Worker processes (default: CPU count)')
+    
+    # Benchmarks
+    bench_parser = subparsers.add_parser('bench', help='Run benchmarks and budget checks')
+    bench_sub = bench_parser.add_subparsers(dest='bench_command')
+    startup_parser = bench_sub.add_parser('startup', help='Check CLI import time and lazy imports')
+    startup_parser.add_argument('--budget', type=float, default=100.0, help='Budget in milliseconds')
+    calibrate_parser = bench_sub.add_parser('calibrate', help='Calibrate the render cost model')
+    calibrate_parser.add_argument('-w', '--width', type=int, default=1280, help='Benchmark width')
+    calibrate_parser.add_argument('-g', '--height', type=int, default=720, help='Benchmark height')
+    calibrate_parser.add_argument('-f', '--fps', type=int, default=30, help='Benchmark frame rate')
+    calibrate_parser.add_argument('--seconds', type=float, default=4.0, help='Length of each benchmark render')
+    calibrate_parser.add_argument('--supersample', type=int, action='append', metavar='N',
+                                  help='Supersampling factor to measure memory at (repeatable, default: 2)')
+    encode_parser = bench_sub.add_parser('encode', help='Compare plain and tuned x264 encodes of a slideshow')
+    encode_parser.add_argument('-w', '--width', type=int, default=1280, help='Benchmark width')
+    encode_parser.add_argument('-g', '--height', type=int, default=720, help='Benchmark height')
+    encode_parser.add_argument('-f', '--fps', type=int, default=30, help='Benchmark frame rate')
+    encode_parser.add_argument('--crf', type=int, default=20, help='CRF of both encodes')
+    encode_parser.add_argument('--preset', default='medium', help='x264 preset of both encodes')
+    encode_parser.add_argument('--maxrate', help='VBV cap of the tuned encode (e.g. 5M)')
+    golden_parser = bench_sub.add_parser('golden', help='Check renders against stored golden frames, lengths and times')
+    golden_parser.add_argument('--dir', default='golden', help='Golden outputs directory (default: golden)')
+    golden_parser.add_argument('--update', action='store_true', help='Record the current outputs as goldens')
+    golden_parser.add_argument('--case', action='append', metavar='NAME', help='Only run this case (repeatable)')
+    golden_parser.add_argument('--min-ssim', type=float, default=0.98, help='Lowest SSIM of a sampled frame')
+    golden_parser.add_argument('--min-psnr', type=float, default=35.0, help='Lowest PSNR of a sampled frame (dB)')
+    golden_parser.add_argument('--speed-tolerance', type=float, default=0.5,
+                               help='Allowed slowdown against the golden render time (0.25 = 25%%)')
+    golden_parser.add_argument('--no-timing', action='store_true', help='Do not compare render times')
+    
     args = parser.parse_args()
     
     if args.no_color:
         Colors.disable()
     
+    if args.metrics_file or args.metrics_port:
+        from . import metrics
+        if args.metrics_file:
+            metrics.REGISTRY.textfile = args.metrics_file
+        if args.metrics_port and args.command not in METRICS_SERVER_COMMANDS:
+            print_warning(f"--metrics-port is ignored by '{args.command}' (it exits before a scrape)")
+        elif args.metrics_port:
+            try:
+                metrics.serve(args.metrics_port)
+            except OSError as e:
+                print_error(f"Cannot serve metrics on port {args.metrics_port}: {e}")
+                return 1
+    
     if args.command == 'video':
         return cmd_video(args)
     elif args.command == 'album':
         return cmd_album(args)
+    elif args.command == 'watch':
+        return cmd_watch(args)
     elif args.command == 'init':
         return cmd_init(args)
     elif args.command == 'presets':
@@ -508,6 +1091,12 @@ Examples:
         return cmd_transitions(args)
     elif args.command == 'exports':
         return cmd_exports(args)
+    elif args.command == 'frame':
+        return cmd_frame(args)
+    elif args.command == 'index':
+        return cmd_index(args)
+    elif args.command == 'bench':
+        return cmd_bench(args)
     else:
         parser.print_help()
         return 0
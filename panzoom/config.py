@@ -3,7 +3,6 @@ Configuration management for PanZoom Slideshow
 """
 
 import os
-import yaml
 from dataclasses import dataclass, field, asdict
 from typing import Optional, List
 from pathlib import Path
@@ -24,6 +23,8 @@ class VideoConfig:
     zoom_direction: str = "alternate"  # "in", "out", "alternate", "random"
     pan_direction: str = "alternate"   # "left", "right", "alternate", "random"
     vertical_position: float = 0.3  # Y position (0=top, 0.5=center, 1=bottom)
+    motion: str = "expression"      # "expression" (zoompan) or "table" (precomputed)
+    easing: str = "linear"          # Motion curve for "table" (linear, ease-in, ease-out, ease-in-out)
     
     # Transition
     transition: str = "fade"        # Transition type
@@ -31,11 +32,18 @@ class VideoConfig:
     # Image ordering
     shuffle: bool = False           # Random image order
     reverse: bool = False           # Reverse order
+    dedupe: bool = False            # Drop near-duplicate images (perceptual hash)
+    dedupe_threshold: int = 6       # Max hash distance (0-64) of near-duplicates
     
     # Quality
     crf: int = 18                   # Quality (0-51, lower=better)
     preset: str = "slow"            # Encoding preset
     audio_bitrate: str = "320k"     # Audio quality
+    mezzanine: str = ""             # Lossless intermediate ("ffv1" or "x264", "" = off)
+    tune: str = "auto"              # x264 tune ("auto" = film, or stillimage without motion; "" = none)
+    gop_seconds: float = 4.0        # Max keyframe interval (seconds)
+    maxrate: str = ""               # VBV bitrate cap (e.g. "12M", "" = uncapped CRF)
+    bufsize: str = ""               # VBV buffer size (default: maxrate)
 
 
 @dataclass
@@ -48,6 +56,10 @@ class AudioConfig:
     channels: int = 2               # Output channels
     remove_silence: bool = True     # Remove silence at start/end
     silence_threshold: str = "-50dB"  # Silence detection threshold
+    # Analyze tracks (NumPy) and trim silence sample-accurately. The threshold then
+    # applies to source levels, before normalization (silenceremove sees normalized ones).
+    precise_trim: bool = True
+    formats: List[str] = field(default_factory=lambda: ["wav"])  # Outputs per track (see AUDIO_FORMATS)
 
 
 @dataclass
@@ -91,6 +103,16 @@ class TitleConfig:
     fade_out: float = 1.0
 
 
+@dataclass
+class StagingConfig:
+    """Where intermediate files of a job are written (see staging.StagingArea)"""
+    ram_dir: str = "/dev/shm"       # Preferred RAM-backed directory ("" = never)
+    disk_dir: str = ""              # Fallback ("" = next to the final output)
+    budget_mb: int = 2048           # RAM the intermediates of a job may hold at once
+    min_free_mb: int = 512          # RAM left free in ram_dir
+    cache_dir: str = ""             # Render caches ("" = disk_dir/cache if set, else ~/.cache/panzoom)
+
+
 @dataclass 
 class ProjectConfig:
     """Main project configuration"""
@@ -98,6 +120,7 @@ class ProjectConfig:
     audio: AudioConfig = field(default_factory=AudioConfig)
     watermark: WatermarkConfig = field(default_factory=WatermarkConfig)
     title: TitleConfig = field(default_factory=TitleConfig)
+    staging: StagingConfig = field(default_factory=StagingConfig)
     
     # Metadata
     artist: str = "Carnaverone Studio"
@@ -146,6 +169,8 @@ EXPORT_PROFILES = {
         "crf": 18,
         "preset": "slow",
         "audio_bitrate": "320k",
+        "maxrate": "12M",
+        "bufsize": "24M",
         "description": "Optimal pour YouTube (1080p60)"
     },
     "youtube4k": {
@@ -156,6 +181,8 @@ EXPORT_PROFILES = {
         "crf": 18,
         "preset": "slow",
         "audio_bitrate": "320k",
+        "maxrate": "68M",
+        "bufsize": "136M",
         "description": "YouTube 4K UHD"
     },
     "instagram_feed": {
@@ -166,6 +193,8 @@ EXPORT_PROFILES = {
         "crf": 20,
         "preset": "medium",
         "audio_bitrate": "256k",
+        "maxrate": "5M",
+        "bufsize": "10M",
         "description": "Instagram carré (1:1)"
     },
     "instagram_portrait": {
@@ -176,6 +205,8 @@ EXPORT_PROFILES = {
         "crf": 20,
         "preset": "medium",
         "audio_bitrate": "256k",
+        "maxrate": "5M",
+        "bufsize": "10M",
         "description": "Instagram portrait (4:5)"
     },
     "instagram_reels": {
@@ -186,6 +217,8 @@ EXPORT_PROFILES = {
         "crf": 20,
         "preset": "medium",
         "audio_bitrate": "256k",
+        "maxrate": "5M",
+        "bufsize": "10M",
         "description": "Instagram/TikTok vertical (9:16)"
     },
     "tiktok": {
@@ -196,6 +229,8 @@ EXPORT_PROFILES = {
         "crf": 20,
         "preset": "medium",
         "audio_bitrate": "256k",
+        "maxrate": "6M",
+        "bufsize": "12M",
         "description": "TikTok vertical (9:16)"
     },
     "facebook": {
@@ -206,6 +241,8 @@ EXPORT_PROFILES = {
         "crf": 22,
         "preset": "medium",
         "audio_bitrate": "192k",
+        "maxrate": "4M",
+        "bufsize": "8M",
         "description": "Facebook 720p"
     },
     "twitter": {
@@ -216,6 +253,8 @@ EXPORT_PROFILES = {
         "crf": 22,
         "preset": "medium",
         "audio_bitrate": "192k",
+        "maxrate": "5M",
+        "bufsize": "10M",
         "description": "Twitter/X 720p"
     },
     "preview": {
@@ -226,10 +265,38 @@ EXPORT_PROFILES = {
         "crf": 35,
         "preset": "ultrafast",
         "audio_bitrate": "96k",
+        "maxrate": "1M",
+        "bufsize": "2M",
         "description": "Aperçu rapide basse qualité"
     }
 }
 
+# Album output formats, all encoded from a single decode per track
+AUDIO_FORMATS = {
+    "wav": {
+        "extension": ".wav",
+        "codec": ["-c:a", "pcm_s16le"],
+        "description": "WAV 16-bit PCM",
+    },
+    "flac": {
+        "extension": ".flac",
+        "codec": ["-c:a", "flac", "-compression_level", "8"],
+        "description": "FLAC lossless",
+    },
+    "mp3": {
+        "extension": ".mp3",
+        "codec": ["-c:a", "libmp3lame", "-b:a", "320k", "-id3v2_version", "3"],
+        "description": "MP3 320 kbps",
+    },
+    "m4a": {
+        "extension": ".m4a",
+        "codec": ["-c:a", "aac", "-b:a", "256k", "-movflags", "+faststart"],
+        "description": "AAC 256 kbps (M4A)",
+    },
+}
+
+AUDIO_FORMAT_ALIASES = {"aac": "m4a"}
+
 # Preset configurations
 PRESETS = {
     "fast": {
@@ -285,6 +352,8 @@ def load_config(config_path: Optional[str] = None) -> ProjectConfig:
     config = ProjectConfig()
     
     if config_path and os.path.exists(config_path):
+        import yaml  # Only needed when a config file is used
+        
         with open(config_path, 'r') as f:
             data = yaml.safe_load(f)
             
@@ -309,6 +378,11 @@ def load_config(config_path: Optional[str] = None) -> ProjectConfig:
                     if hasattr(config.title, key):
                         setattr(config.title, key, value)
             
+            if 'staging' in data:
+                for key, value in data['staging'].items():
+                    if hasattr(config.staging, key):
+                        setattr(config.staging, key, value)
+            
             if 'artist' in data:
                 config.artist = data['artist']
             if 'genre' in data:
@@ -321,11 +395,14 @@ def load_config(config_path: Optional[str] = None) -> ProjectConfig:
 
 def save_config(config: ProjectConfig, config_path: str):
     """Save configuration to YAML file"""
+    import yaml
+    
     data = {
         'video': asdict(config.video),
         'audio': asdict(config.audio),
         'watermark': asdict(config.watermark),
         'title': asdict(config.title),
+        'staging': asdict(config.staging),
         'artist': config.artist,
         'genre': config.genre,
         'output_dir': config.output_dir
@@ -335,6 +412,27 @@ def save_config(config: ProjectConfig, config_path: str):
         yaml.dump(data, f, default_flow_style=False, sort_keys=False)
 
 
+def parse_audio_formats(formats) -> List[str]:
+    """Normalize a format list ("wav,flac" or a list), without duplicates"""
+    if isinstance(formats, str):
+        formats = formats.split(',')
+    result = []
+    for name in formats:
+        name = str(name).strip().lower()
+        name = AUDIO_FORMAT_ALIASES.get(name, name)
+        if not name:
+            continue
+        if name not in AUDIO_FORMATS:
+            raise ValueError(
+                f"Unknown audio format: {name}. Available: {list(AUDIO_FORMATS.keys())}"
+            )
+        if name not in result:
+            result.append(name)
+    if not result:
+        raise ValueError("At least one audio format is required")
+    return result
+
+
 def apply_preset(config: VideoConfig, preset_name: str) -> VideoConfig:
     """Apply a preset to video configuration"""
     if preset_name not in PRESETS:
@@ -354,7 +452,7 @@ def apply_export_profile(config: VideoConfig, profile_name: str) -> VideoConfig:
         raise ValueError(f"Unknown profile: {profile_name}. Available: {list(EXPORT_PROFILES.keys())}")
     
     profile = EXPORT_PROFILES[profile_name]
-    for key in ['width', 'height', 'fps', 'crf', 'preset', 'audio_bitrate']:
+    for key in ['width', 'height', 'fps', 'crf', 'preset', 'audio_bitrate', 'maxrate', 'bufsize']:
         if key in profile and hasattr(config, key):
             setattr(config, key, profile[key])
     
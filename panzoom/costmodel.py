@@ -0,0 +1,321 @@
+"""
+Render cost model: predicts wall time and peak memory of a render
+
+Rates are calibrated from short local benchmark renders (see ``calibrate``)
+and stored in the cache directory. Until calibrated, conservative defaults
+measured on a typical 8-core machine are used.
+"""
+
+import os
+import re
+import json
+import time
+import subprocess
+from dataclasses import dataclass, field, asdict
+from typing import Dict, List, Optional, Callable
+
+from .cache import get_cache_dir, partial_path
+
+
+# x264 presets from slowest (best compression) to fastest
+X264_PRESETS = [
+    "veryslow", "slower", "slow", "medium", "fast",
+    "faster", "veryfast", "superfast", "ultrafast",
+]
+
+# Encoder throughput relative to CRF 23: lower CRF means more bits to code
+CRF_SPEED_SLOPE = 0.015
+
+
+@dataclass
+class CostModel:
+    """Calibrated throughput and memory coefficients"""
+    # Output pixels per second for the per-image motion chain (scale + motion)
+    motion_px_per_s: Dict[str, float] = field(default_factory=lambda: {
+        "expression": 80e6,
+        "table": 100e6,
+    })
+    # Output pixels per second for one xfade transition
+    xfade_px_per_s: float = 800e6
+    # Encoded pixels per second for each x264 preset at CRF 23
+    encode_px_per_s: Dict[str, float] = field(default_factory=lambda: {
+        "veryslow": 15e6, "slower": 30e6, "slow": 60e6, "medium": 125e6,
+        "fast": 165e6, "faster": 230e6, "veryfast": 330e6,
+        "superfast": 450e6, "ultrafast": 620e6,
+    })
+    # Peak memory: fixed part plus bytes per input per supersampled pixel,
+    # for each supersampling factor (multiple of the output size)
+    base_memory_mb: float = 120.0
+    input_bytes_per_px: Dict[str, float] = field(default_factory=lambda: {
+        "2": 7.0,
+    })
+    # Encoder memory per output pixel (lookahead buffers, reference frames)
+    encoder_bytes_per_px: float = 80.0
+    calibrated: bool = False
+
+    @classmethod
+    def default_path(cls) -> str:
+        return os.path.join(get_cache_dir(), "costmodel.json")
+
+    @classmethod
+    def load(cls, path: Optional[str] = None) -> 'CostModel':
+        """Load the calibrated model, or defaults if never calibrated"""
+        path = path or cls.default_path()
+        model = cls()
+        if os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                for key, value in data.items():
+                    if hasattr(model, key):
+                        setattr(model, key, value)
+            except (OSError, ValueError):
+                pass
+        # Models calibrated before supersampling was a factor measured 2x only
+        if not isinstance(model.input_bytes_per_px, dict):
+            model.input_bytes_per_px = {"2": float(model.input_bytes_per_px)}
+        return model
+
+    def save(self, path: Optional[str] = None):
+        path = path or self.default_path()
+        tmp_path = partial_path(path, unique=True)
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(asdict(self), f, indent=2)
+        os.replace(tmp_path, path)
+
+    def encode_rate(self, preset: str, crf: int) -> float:
+        rate = self.encode_px_per_s.get(preset, self.encode_px_per_s["medium"])
+        return rate * max(0.2, 1 + CRF_SPEED_SLOPE * (crf - 23))
+
+    def input_bytes(self, supersample: int) -> float:
+        """Memory per supersampled input pixel, from the closest calibrated factor"""
+        rates = self.input_bytes_per_px
+        if str(supersample) in rates:
+            return rates[str(supersample)]
+        closest = min(rates, key=lambda factor: abs(float(factor) - supersample))
+        return rates[closest]
+
+
+@dataclass
+class RenderPlan:
+    """What a render has to compute, independent of the machine"""
+    width: int
+    height: int
+    fps: int
+    image_frames: int               # Frames produced by the motion chains
+    transition_frames: int          # Frames blended by xfade
+    output_frames: int              # Frames encoded
+    inputs: int                     # Images opened at once
+    motion: str = "expression"
+    preset: str = "medium"
+    crf: int = 23
+    supersample: int = 2
+
+    @classmethod
+    def from_generator(cls, generator, render_range=None, preset: Optional[str] = None) -> 'RenderPlan':
+        """Build the plan of a prepared SlideshowGenerator"""
+        cfg = generator.config
+        if render_range:
+            images = render_range.last_image - render_range.first_image + 1
+            duration = render_range.duration
+        else:
+            images = len(generator.images)
+            duration = generator.estimate_duration()
+
+        return cls(
+            width=cfg.width,
+            height=cfg.height,
+            fps=cfg.fps,
+            image_frames=int(images * cfg.duration * cfg.fps),
+            transition_frames=int(max(0, images - 1) * cfg.crossfade * cfg.fps),
+            output_frames=int(duration * cfg.fps),
+            inputs=images,
+            motion=cfg.motion,
+            preset=preset or cfg.preset,
+            crf=cfg.crf,
+            supersample=generator.SUPERSAMPLE,
+        )
+
+
+@dataclass
+class CostEstimate:
+    """Predicted cost of a render"""
+    seconds: float
+    peak_memory_mb: float
+    preset: str
+
+
+def estimate(plan: RenderPlan, model: Optional[CostModel] = None) -> CostEstimate:
+    """Predict wall time and peak memory of a render plan"""
+    model = model or CostModel.load()
+    px = plan.width * plan.height
+
+    motion_rate = model.motion_px_per_s.get(plan.motion, model.motion_px_per_s["expression"])
+    seconds = (
+        plan.image_frames * px / motion_rate +
+        plan.transition_frames * px / model.xfade_px_per_s +
+        plan.output_frames * px / model.encode_rate(plan.preset, plan.crf)
+    )
+
+    supersampled_px = px * plan.supersample ** 2
+    memory = (
+        model.base_memory_mb * 1024 * 1024 +
+        plan.inputs * supersampled_px * model.input_bytes(plan.supersample) +
+        px * model.encoder_bytes_per_px
+    )
+
+    return CostEstimate(
+        seconds=seconds,
+        peak_memory_mb=memory / (1024 * 1024),
+        preset=plan.preset,
+    )
+
+
+def choose_preset(plan: RenderPlan, deadline: float, model: Optional[CostModel] = None) -> CostEstimate:
+    """
+    Pick the slowest x264 preset predicted to finish within the deadline
+
+    Falls back to the fastest preset if none fits (its estimate then
+    exceeds the deadline, which callers can report).
+    """
+    model = model or CostModel.load()
+    result = None
+    for preset in X264_PRESETS:
+        plan.preset = preset
+        result = estimate(plan, model)
+        if result.seconds <= deadline:
+            return result
+    return result
+
+
+def parse_duration(value: str) -> float:
+    """Parse a deadline like "20m", "1h30m", "90s", "45" or "1:20:00" to seconds"""
+    text = value.strip().lower()
+    if ':' in text:
+        seconds = 0.0
+        for part in text.split(':'):
+            seconds = seconds * 60 + float(part)
+        return seconds
+
+    matches = re.findall(r'(\d+(?:\.\d+)?)\s*([hms]?)', text)
+    if not matches or ''.join(n + u for n, u in matches) != text.replace(' ', ''):
+        raise ValueError(f"Invalid duration: {value}")
+    units = {'h': 3600, 'm': 60, 's': 1, '': 1}
+    return sum(float(n) * units[u] for n, u in matches)
+
+
+def _timed_run(cmd: List[str]) -> Dict[str, float]:
+    """Run a command, returning wall seconds and child peak RSS (MB)"""
+    start = time.perf_counter()
+    process = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    _, status, rusage = os.wait4(process.pid, 0)
+    process.returncode = os.WEXITSTATUS(status) if os.WIFEXITED(status) else -1
+    elapsed = time.perf_counter() - start
+    if process.returncode != 0:
+        raise RuntimeError(f"Benchmark command failed: {' '.join(cmd)}")
+    # ru_maxrss is in KB on Linux
+    return {"seconds": elapsed, "rss_mb": rusage.ru_maxrss / 1024}
+
+
+def calibrate(
+    width: int = 1280,
+    height: int = 720,
+    fps: int = 30,
+    seconds: float = 4.0,
+    presets: Optional[List[str]] = None,
+    supersample_factors: Optional[List[int]] = None,
+    progress_callback: Optional[Callable[[str], None]] = None
+) -> CostModel:
+    """
+    Measure local throughput with short synthetic renders
+
+    Every stage is rendered to the null muxer from a generated test image so
+    no input files are needed: motion chains alone, an xfade, and encoding
+    of a test pattern for each preset. The memory of an input is measured
+    for each supersampling factor (by default the one renders use).
+    """
+    from .config import VideoConfig
+    from .slideshow import SlideshowGenerator
+
+    model = CostModel()
+    px = width * height
+    frames = int(seconds * fps)
+    presets = presets or X264_PRESETS
+    default_factor = SlideshowGenerator.SUPERSAMPLE
+    factors = supersample_factors or [default_factor]
+    work_dir = get_cache_dir("calibration")
+
+    # Synthetic 4:3 photo-like input
+    image = os.path.join(work_dir, "calibration.png")
+    if not os.path.exists(image):
+        _timed_run([
+            "ffmpeg", "-y", "-hide_banner", "-loglevel", "error",
+            "-f", "lavfi", "-i", "testsrc2=s=2400x1800",
+            "-frames:v", "1", image
+        ])
+
+    def render_null(num_images: int, motion: str, supersample: int = default_factor) -> Dict[str, float]:
+        cfg = VideoConfig(
+            width=width, height=height, fps=fps, duration=seconds,
+            crossfade=seconds / 2, motion=motion
+        )
+        generator = SlideshowGenerator(cfg)
+        generator.SUPERSAMPLE = supersample
+        generator.prepare_images([image] * num_images)
+        cmd = ["ffmpeg", "-y", "-hide_banner", "-loglevel", "error", *generator._image_inputs()]
+        cmd.extend([
+            "-filter_complex", generator._build_filter_complex(),
+            "-map", "[v]", "-f", "null", "-"
+        ])
+        return _timed_run(cmd)
+
+    runs = {}
+    for motion in ("expression", "table"):
+        if progress_callback:
+            progress_callback(f"Measuring {motion} motion...")
+        runs[motion] = render_null(1, motion)
+        model.motion_px_per_s[motion] = frames * px / runs[motion]["seconds"]
+
+    # Two images with a transition: the extra time over two motion chains
+    # is the xfade, the extra memory is the cost of one more input
+    if progress_callback:
+        progress_callback("Measuring transitions and memory...")
+    single = runs["expression"]
+    pair = render_null(2, "expression")
+    xfade_frames = int(seconds / 2 * fps)
+    xfade_time = max(pair["seconds"] - 2 * single["seconds"], 1e-3)
+    model.xfade_px_per_s = xfade_frames * px / xfade_time
+
+    model.input_bytes_per_px = {}
+    for factor in factors:
+        if factor == default_factor:
+            one, two = single, pair
+        else:
+            if progress_callback:
+                progress_callback(f"Measuring memory at {factor}x supersampling...")
+            one = render_null(1, "expression", factor)
+            two = render_null(2, "expression", factor)
+        model.input_bytes_per_px[str(factor)] = max(
+            1.0, (two["rss_mb"] - one["rss_mb"]) * 1024 * 1024 / (px * factor ** 2)
+        )
+
+    supersampled_px = px * default_factor ** 2
+    model.base_memory_mb = max(
+        16.0,
+        single["rss_mb"] - supersampled_px * model.input_bytes(default_factor) / (1024 * 1024)
+    )
+
+    for preset in presets:
+        if progress_callback:
+            progress_callback(f"Measuring x264 preset {preset}...")
+        run = _timed_run([
+            "ffmpeg", "-y", "-hide_banner", "-loglevel", "error",
+            "-f", "lavfi", "-i", f"testsrc2=s={width}x{height}:r={fps}:d={seconds}",
+            "-c:v", "libx264", "-preset", preset, "-crf", "23",
+            "-pix_fmt", "yuv420p", "-f", "null", "-"
+        ])
+        model.encode_px_per_s[preset] = frames * px / run["seconds"]
+
+    model.calibrated = True
+    model.save()
+    return model
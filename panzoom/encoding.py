@@ -0,0 +1,101 @@
+"""
+H.264 encoding policy for slideshow material
+
+Ken Burns video is slow, smooth motion over still photographs: nearly all
+of it predicts well from the previous frame, and the only hard frames are
+the transitions. The policy tunes x264 for that: a long GOP tied to the
+frame rate, scene-cut detection replaced by keyframes at the transition
+boundaries, film tuning (or stillimage when nothing moves), and the VBV
+caps of the target platform so transitions cannot spike the bitrate.
+"""
+
+from typing import List, Optional, Sequence
+
+from .config import VideoConfig
+
+
+GOP_SECONDS_MIN = 1.0               # Shortest allowed distance between keyframes
+
+# x264 tunes accepted in VideoConfig.tune besides "auto" and ""
+X264_TUNES = ("film", "animation", "grain", "stillimage", "fastdecode", "zerolatency")
+
+# Adaptive quantization mode 3 biases bits towards dark, flat areas:
+# skies and shadows in photos otherwise band during slow zooms
+X264_PARAMS = "aq-mode=3"
+
+
+def resolve_tune(config: VideoConfig, static: bool = False) -> str:
+    """x264 tune for a render ("auto": stillimage without motion, else film)"""
+    if config.tune == "auto":
+        return "stillimage" if static else "film"
+    return config.tune
+
+
+def keyframe_times(
+    config: VideoConfig,
+    num_images: int,
+    offset: float = 0.0,
+    start: float = 0.0,
+    duration: Optional[float] = None
+) -> List[float]:
+    """
+    Output times at which a transition ends and an image is fully shown
+
+    Args:
+        offset: Time of the first image in the output (e.g. title length)
+        start: Output start on the slideshow timeline (partial renders)
+        duration: Output duration, to drop keyframes past the end
+    """
+    step = config.duration - config.crossfade
+    if step <= 0:
+        return []
+    times = []
+    for i in range(1, num_images):
+        t = offset + i * step + config.crossfade - start
+        if t <= 0 or (duration is not None and t >= duration):
+            continue
+        times.append(round(t, 3))
+    return times
+
+
+def video_args(
+    config: VideoConfig,
+    keyframes: Sequence[float] = (),
+    static: bool = False,
+    policy: bool = True
+) -> List[str]:
+    """
+    x264 output arguments of a render
+
+    Args:
+        keyframes: Output times to force keyframes at (transition boundaries)
+        static: Nothing in the video moves (see resolve_tune)
+        policy: False gives the plain CRF/preset encode (benchmark baseline)
+    """
+    args = [
+        "-c:v", "libx264",
+        "-crf", str(config.crf),
+        "-preset", config.preset,
+        "-pix_fmt", "yuv420p",
+    ]
+    if not policy:
+        return args
+
+    tune = resolve_tune(config, static)
+    if tune:
+        args.extend(["-tune", tune])
+    args.extend(["-x264-params", X264_PARAMS])
+
+    gop = max(1, int(round(max(config.gop_seconds, GOP_SECONDS_MIN) * config.fps)))
+    args.extend(["-g", str(gop), "-keyint_min", str(max(1, config.fps))])
+    if keyframes:
+        # Transitions get their keyframes explicitly: scene-cut detection
+        # would only add extra ones in the middle of crossfades
+        args.extend([
+            "-sc_threshold", "0",
+            "-force_key_frames", ",".join(f"{t:.3f}" for t in keyframes),
+        ])
+
+    if config.maxrate:
+        args.extend(["-maxrate", config.maxrate, "-bufsize", config.bufsize or config.maxrate])
+    return args
@@ -0,0 +1,253 @@
+"""
+Memory-mapped store of low-resolution raw frames
+
+A render can dump its frames, scaled down to a fixed size, as raw RGB into
+one file next to an index. Any frame is then at a known byte offset, so
+reading it is a constant-time slice of a memory map instead of a seek and
+an H.264 decode.
+"""
+
+import os
+import json
+import math
+import mmap
+import struct
+import zlib
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from . import supervisor
+from .cache import partial_path
+
+
+FRAME_WIDTH = 256                   # Width of stored frames (height keeps aspect)
+PIX_FMT = "rgb24"
+BYTES_PER_PIXEL = 3
+RAW_NAME = "frames.raw"
+INDEX_NAME = "index.json"
+
+
+def store_dir_for(output_path: str) -> str:
+    """Frame store of a render: preview.mp4 -> preview.frames"""
+    out = Path(output_path)
+    return str(out.with_name(f"{out.stem}.frames"))
+
+
+def frame_size(width: int, height: int) -> Tuple[int, int]:
+    """Stored frame size for a video size (even dimensions)"""
+    w = min(FRAME_WIDTH, width)
+    h = max(2, int(round(w * height / width / 2)) * 2)
+    return w - w % 2, h
+
+
+def output_args(store_dir: str, width: int, height: int, stream: str) -> List[str]:
+    """
+    FFmpeg output arguments writing a stream to the store
+
+    The stream must already be scaled to (width, height); the raw file is
+    written under a temporary name until ``finalize``.
+    """
+    os.makedirs(store_dir, exist_ok=True)
+    return [
+        "-map", stream,
+        "-f", "rawvideo",
+        "-pix_fmt", PIX_FMT,
+        "-s", f"{width}x{height}",
+        partial_path(os.path.join(store_dir, RAW_NAME)),
+    ]
+
+
+def finalize(store_dir: str, width: int, height: int, fps: float, start: float = 0.0) -> int:
+    """
+    Publish a dumped store by writing its index
+
+    Args:
+        start: Time of the first frame on the video timeline (seconds)
+
+    Returns:
+        Number of frames in the store
+    """
+    raw_path = os.path.join(store_dir, RAW_NAME)
+    tmp_path = partial_path(raw_path)
+    size = width * height * BYTES_PER_PIXEL
+    frame_count = os.path.getsize(tmp_path) // size
+    os.replace(tmp_path, raw_path)
+
+    index = {
+        "width": width,
+        "height": height,
+        "pix_fmt": PIX_FMT,
+        "fps": fps,
+        "start": start,
+        "frame_count": frame_count,
+        "frame_bytes": size,
+    }
+    index_path = os.path.join(store_dir, INDEX_NAME)
+    tmp_path = partial_path(index_path, unique=True)
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(index, f, indent=2)
+    os.replace(tmp_path, index_path)
+    return frame_count
+
+
+def discard(store_dir: str):
+    """Remove the partial dump of a failed render"""
+    tmp_path = partial_path(os.path.join(store_dir, RAW_NAME))
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+
+
+def extract(
+    video_path: str,
+    store_dir: str,
+    width: int,
+    height: int,
+    fps: float,
+    start: float = 0.0,
+    trim: Optional[Tuple[float, float]] = None
+) -> Tuple[bool, str]:
+    """
+    Build a store from an existing video (one decode pass)
+
+    Args:
+        start: Time of the first stored frame on the video timeline
+        trim: Optional (start, duration) to read from the source video
+
+    Returns:
+        Tuple of (success, message)
+    """
+    cmd = ["ffmpeg", "-y", "-hide_banner", "-progress", "pipe:1", "-loglevel", "error"]
+    if trim:
+        cmd.extend(["-ss", f"{trim[0]:.3f}", "-t", f"{trim[1]:.3f}"])
+    cmd.extend([
+        "-i", video_path,
+        "-an", "-vf", f"fps={fps},scale={width}:{height}:flags=area",
+    ])
+    cmd.extend(output_args(store_dir, width, height, "0:v"))
+
+    try:
+        result = supervisor.run(cmd)
+    except FileNotFoundError:
+        return False, "FFmpeg not found. Please install FFmpeg."
+
+    if not result.ok:
+        discard(store_dir)
+        return False, f"Frame extraction failed: {result.error}"
+
+    count = finalize(store_dir, width, height, fps, start)
+    return True, f"{count} frames stored"
+
+
+class FrameStore:
+    """Read-only, memory-mapped access to a frame store"""
+
+    def __init__(self, store_dir: str):
+        index_path = os.path.join(store_dir, INDEX_NAME)
+        if not os.path.exists(index_path):
+            raise FileNotFoundError(f"No frame store in: {store_dir}")
+        with open(index_path, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+
+        self.store_dir = store_dir
+        self.width: int = index["width"]
+        self.height: int = index["height"]
+        self.fps: float = index["fps"]
+        self.start: float = index["start"]
+        self.frame_count: int = index["frame_count"]
+        self.frame_bytes: int = index["frame_bytes"]
+
+        self._file = open(os.path.join(store_dir, RAW_NAME), 'rb')
+        self._mmap = None
+        self._frames = None
+        if self.frame_count == 0:   # Empty file, which mmap refuses
+            return
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            import numpy as np
+            self._frames = np.frombuffer(
+                self._mmap, dtype=np.uint8, count=self.frame_count * self.frame_bytes
+            ).reshape(self.frame_count, self.height, self.width, BYTES_PER_PIXEL)
+        except ImportError:  # Frames are returned as memoryviews
+            pass
+
+    def __len__(self) -> int:
+        return self.frame_count
+
+    def __enter__(self) -> 'FrameStore':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @property
+    def end(self) -> float:
+        """Time just after the last stored frame"""
+        return self.start + self.frame_count / self.fps
+
+    def index_at(self, seconds: float) -> int:
+        """Index of the frame shown at a time on the video timeline"""
+        index = int(math.floor((seconds - self.start) * self.fps + 1e-6))
+        if not 0 <= index < self.frame_count:
+            raise IndexError(
+                f"No frame at {seconds:.3f}s (store covers {self.start:.3f}s-{self.end:.3f}s)"
+            )
+        return index
+
+    def time_of(self, index: int) -> float:
+        return self.start + index / self.fps
+
+    def frame(self, index: int):
+        """
+        Frame by index, without copying
+
+        Returns a (height, width, 3) uint8 array with NumPy, otherwise a
+        flat memoryview of RGB bytes.
+        """
+        if not 0 <= index < self.frame_count:
+            raise IndexError(f"Frame {index} out of range (0-{self.frame_count - 1})")
+        if self._frames is not None:
+            return self._frames[index]
+        offset = index * self.frame_bytes
+        return memoryview(self._mmap)[offset:offset + self.frame_bytes]
+
+    def frame_at(self, seconds: float):
+        """Frame shown at a time on the video timeline (see ``frame``)"""
+        return self.frame(self.index_at(seconds))
+
+    def save_png(self, seconds: float, path: str) -> str:
+        """Write the frame shown at a time as a PNG"""
+        write_png(path, self.width, self.height, self.frame_at(seconds))
+        return path
+
+    def close(self):
+        # Views handed out keep the map alive until they are released
+        self._frames = None
+        if self._mmap is not None:
+            try:
+                self._mmap.close()
+            except BufferError:
+                pass
+        self._file.close()
+
+
+def write_png(path: str, width: int, height: int, rgb) -> str:
+    """Encode raw RGB24 pixels as a PNG (no imaging library needed)"""
+    data = memoryview(rgb).cast('B')
+    stride = width * BYTES_PER_PIXEL
+    raw = b"".join(
+        b"\x00" + data[y * stride:(y + 1) * stride].tobytes() for y in range(height)
+    )
+
+    def chunk(tag: bytes, body: bytes) -> bytes:
+        crc = zlib.crc32(tag + body) & 0xffffffff
+        return struct.pack(">I", len(body)) + tag + body + struct.pack(">I", crc)
+
+    png = (
+        b"\x89PNG\r\n\x1a\n" +
+        chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)) +
+        chunk(b"IDAT", zlib.compress(raw, 6)) +
+        chunk(b"IEND", b"")
+    )
+    with open(path, 'wb') as f:
+        f.write(png)
+    return path
@@ -0,0 +1,271 @@
+"""
+In-memory rendering: images and audio from Python objects, no files
+
+Programs generating their images (charts, captions) can hand them to the
+renderer as encoded bytes, NumPy arrays or PIL images, and the audio as a
+file path or a PCM array. Each one reaches FFmpeg through its own pipe, an
+inherited descriptor read as ``pipe:N``. Arrays are sent as raw pixels or
+samples, so nothing is encoded, written or read back on the way. The
+video comes back as bytes (fragmented MP4 streamed over stdout) or is
+written to a path.
+"""
+
+import os
+import threading
+from typing import Any, Callable, List, Optional, Sequence, Tuple, Union
+
+from . import encoding
+from .config import VideoConfig, WatermarkConfig
+from .slideshow import SlideshowGenerator, ProgressInfo
+from .supervisor import SupervisedProcess
+
+
+# PCM arrays: (dtype kind, item size) -> FFmpeg raw audio format
+PCM_FORMATS = {
+    ("i", 2): "s16le",
+    ("i", 4): "s32le",
+    ("f", 4): "f32le",
+    ("f", 8): "f64le",
+}
+
+# Raw pixel formats of NumPy images (by channel count) and PIL modes
+ARRAY_PIX_FMTS = {1: "gray", 3: "rgb24", 4: "rgba"}
+PIL_PIX_FMTS = {"L": "gray", "RGB": "rgb24", "RGBA": "rgba"}
+
+READ_SIZE = 1 << 16
+WRITE_SIZE = 1 << 20
+
+
+def _raw_video_args(pix_fmt: str, width: int, height: int) -> List[str]:
+    return ["-f", "rawvideo", "-pix_fmt", pix_fmt, "-s", f"{width}x{height}"]
+
+
+def image_source(image: Any) -> Tuple[List[str], Any]:
+    """
+    Demuxer options and data of an in-memory image
+
+    Accepts encoded image bytes (PNG, JPEG, WebP..., probed by FFmpeg),
+    uint8 NumPy arrays (H x W, H x W x 3 RGB or H x W x 4 RGBA) and PIL
+    images. Arrays and PIL images are sent as raw pixels.
+    """
+    if isinstance(image, (bytes, bytearray, memoryview)):
+        return [], image
+
+    if hasattr(image, "dtype") and hasattr(image, "shape"):
+        import numpy as np
+        shape = image.shape
+        channels = 1 if len(shape) == 2 else shape[2] if len(shape) == 3 else 0
+        if image.dtype != np.uint8 or channels not in ARRAY_PIX_FMTS:
+            raise ValueError(
+                f"Unsupported image array {image.dtype} {shape} "
+                f"(uint8 HxW, HxWx3 or HxWx4 expected)"
+            )
+        return _raw_video_args(ARRAY_PIX_FMTS[channels], shape[1], shape[0]), np.ascontiguousarray(image)
+
+    if hasattr(image, "getbands") and hasattr(image, "tobytes"):
+        if image.mode not in PIL_PIX_FMTS:
+            image = image.convert("RGB")
+        width, height = image.size
+        return _raw_video_args(PIL_PIX_FMTS[image.mode], width, height), image.tobytes()
+
+    raise TypeError(f"Unsupported image object: {type(image).__name__}")
+
+
+def audio_source(audio: Any, sample_rate: Optional[int] = None) -> Tuple[List[str], Any]:
+    """
+    Demuxer options and data of the audio
+
+    Args:
+        audio: File path, or PCM NumPy array (samples, or samples x
+            channels) of int16, int32, float32 or float64
+        sample_rate: Sample rate of a PCM array
+
+    Returns:
+        (options, data), data None when the audio is a file
+    """
+    if isinstance(audio, (str, os.PathLike)):
+        return [], None
+
+    if hasattr(audio, "dtype") and hasattr(audio, "shape"):
+        import numpy as np
+        fmt = PCM_FORMATS.get((audio.dtype.kind, audio.dtype.itemsize))
+        if fmt is None or audio.ndim not in (1, 2):
+            raise ValueError(
+                f"Unsupported PCM array {audio.dtype} {audio.shape} "
+                f"(int16/int32/float32/float64, samples or samples x channels)"
+            )
+        if not sample_rate:
+            raise ValueError("sample_rate is required for PCM audio")
+        channels = 1 if audio.ndim == 1 else audio.shape[1]
+        data = np.ascontiguousarray(audio, dtype=audio.dtype.newbyteorder("<"))
+        return ["-f", fmt, "-ar", str(sample_rate), "-ac", str(channels)], data
+
+    raise TypeError(f"Unsupported audio object: {type(audio).__name__}")
+
+
+def _feed(fd: int, data: Any):
+    """Write data to a pipe, then close it (quietly stops if FFmpeg exited)"""
+    view = memoryview(data).cast('B')
+    try:
+        while view:
+            written = os.write(fd, view[:WRITE_SIZE])
+            view = view[written:]
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _build_command(
+    generator: SlideshowGenerator,
+    audio_args: List[str],
+    audio_url: str,
+    watermark_asset: Optional[str],
+    output_path: Optional[str]
+) -> List[str]:
+    cfg = generator.config
+    cmd = ["ffmpeg", "-y", "-hide_banner", "-loglevel", "error"]
+    if output_path:
+        cmd.extend(["-progress", "pipe:1"])
+    cmd.extend(generator._image_inputs())
+
+    audio_input = len(generator.images)
+    cmd.extend([*audio_args, "-i", audio_url])
+    watermark_input = None
+    if watermark_asset:
+        watermark_input = audio_input + 1
+        cmd.extend(["-i", watermark_asset])
+
+    cmd.extend([
+        "-filter_complex", generator._build_filter_complex(watermark_input=watermark_input),
+        "-map", "[v]", "-map", f"{audio_input}:a",
+    ])
+    cmd.extend(generator._thread_args())
+    cmd.extend(encoding.video_args(cfg, encoding.keyframe_times(cfg, len(generator.images))))
+    cmd.extend(["-c:a", "aac", "-b:a", cfg.audio_bitrate, "-shortest"])
+
+    if output_path:
+        cmd.extend(["-movflags", "+faststart", output_path])
+    else:
+        # A regular MP4 needs to seek back to write its index
+        cmd.extend([
+            "-movflags", "+frag_keyframe+empty_moov+default_base_moof",
+            "-f", "mp4", "pipe:1",
+        ])
+    return cmd
+
+
+def render(
+    images: Sequence[Any],
+    audio: Any,
+    output_path: Optional[str] = None,
+    config: Optional[VideoConfig] = None,
+    sample_rate: Optional[int] = None,
+    watermark: Optional[WatermarkConfig] = None,
+    progress_bar_callback: Optional[Callable[[ProgressInfo], None]] = None
+) -> Union[bytes, str]:
+    """
+    Render a slideshow from in-memory images and audio
+
+    Images get the same ordering, motion and transitions as files.
+    Near-duplicate removal and static image detection work on files and
+    are skipped; title cards are not supported. Every image uses one pipe,
+    so very long slideshows are bound by the open file limit.
+
+    Args:
+        images: Encoded bytes, NumPy arrays or PIL images (see image_source)
+        audio: Audio file path or PCM NumPy array (see audio_source)
+        output_path: Write the video here; None returns it as bytes
+            (fragmented MP4)
+        config: Video settings (default: VideoConfig())
+        sample_rate: Sample rate of PCM audio
+        watermark: Optional watermark (its logo is a file, as usual)
+        progress_bar_callback: Progress of renders to a path
+
+    Returns:
+        The video bytes, or output_path
+
+    Raises:
+        ValueError, TypeError: Unsupported input
+        RuntimeError: The render failed
+    """
+    if not images:
+        raise ValueError("No images")
+
+    generator = SlideshowGenerator(
+        config or VideoConfig(),
+        watermark=watermark if watermark and watermark.enabled else None
+    )
+    sources = [image_source(image) for image in images]
+    audio_args, audio_data = audio_source(audio, sample_rate)
+
+    pipes: List[Tuple[int, int, Any]] = []   # (read fd, write fd, data)
+
+    def open_pipe(data: Any) -> str:
+        read_fd, write_fd = os.pipe()
+        pipes.append((read_fd, write_fd, data))
+        unfed.append(write_fd)
+        return f"pipe:{read_fd}"
+
+    writers = []
+    unfed: List[int] = []       # Write ends not handed to a writer yet
+    try:
+        urls = [open_pipe(data) for _, data in sources]
+        options = dict(zip(urls, (args for args, _ in sources)))
+        generator.prepare_images(urls)
+        for img in generator.images:
+            img.source_args = options[img.path]
+        audio_url = os.fspath(audio) if audio_data is None else open_pipe(audio_data)
+
+        watermark_asset = None
+        if generator.watermark:
+            success, watermark_asset = generator.prepare_watermark()
+            if not success:
+                raise RuntimeError(watermark_asset)
+
+        cmd = _build_command(generator, audio_args, audio_url, watermark_asset, output_path)
+        read_fds = [read_fd for read_fd, _, _ in pipes]
+
+        # One writer per pipe: FFmpeg reads its inputs in its own order
+        for _, write_fd, data in pipes:
+            writer = threading.Thread(target=_feed, args=(write_fd, data), daemon=True)
+            unfed.remove(write_fd)
+            writer.start()
+            writers.append(writer)
+
+        if output_path:
+            success, message = generator._run_ffmpeg(
+                cmd, generator.estimate_duration(), progress_bar_callback, pass_fds=read_fds
+            )
+            if not success:
+                raise RuntimeError(message)
+            return output_path
+
+        process = SupervisedProcess(
+            cmd, raw_stdout=True, stall_timeout=generator.STALL_TIMEOUT, pass_fds=read_fds
+        )
+        chunks = []
+        try:
+            while True:
+                chunk = process.read(READ_SIZE)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+        except BaseException:
+            process.cancel()
+            raise
+        finally:
+            result = process.wait()
+        if not result.ok:
+            raise RuntimeError(f"FFmpeg error: {result.error}")
+        return b"".join(chunks)
+    except FileNotFoundError:
+        raise RuntimeError("FFmpeg not found. Please install FFmpeg.")
+    finally:
+        # Closing the read ends unblocks writers FFmpeg never drained
+        for read_fd, _, _ in pipes:
+            os.close(read_fd)
+        for write_fd in unfed:
+            os.close(write_fd)
+        for writer in writers:
+            writer.join()
@@ -0,0 +1,249 @@
+"""
+Render and album metrics in the Prometheus text format
+
+Metrics are plain in-process counters and histograms, updated once per
+render or album (never per frame), and exported either as a textfile for
+node_exporter's textfile collector or from a small local HTTP endpoint.
+The textfile path can also be set with the PANZOOM_METRICS_FILE
+environment variable. Counters carry on from the values already in the
+textfile, so one-shot commands add up across runs.
+"""
+
+import os
+import threading
+from typing import Dict, List, Optional, Sequence
+
+
+def _format(value: float) -> str:
+    """Number as Prometheus expects it (exact integers, no rounding)"""
+    value = float(value)
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+class Counter:
+    """Monotonic counter"""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help = help_text
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0):
+        self.value += amount
+
+    def samples(self) -> List[str]:
+        return [f"{self.name} {_format(self.value)}"]
+
+    def restore(self, values: Dict[str, float]):
+        self.value += values.get(self.name, 0.0)
+
+
+class Histogram:
+    """Cumulative histogram with fixed buckets"""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, buckets: Sequence[float]):
+        self.name = name
+        self.help = help_text
+        self.buckets = sorted(buckets)
+        self.counts = [0] * len(self.buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+        self.count += 1
+        self.sum += value
+
+    def samples(self) -> List[str]:
+        lines = [
+            f'{self.name}_bucket{{le="{_format(bound)}"}} {count}'
+            for bound, count in zip(self.buckets, self.counts)
+        ]
+        lines.append(f'{self.name}_bucket{{le="+Inf"}} {self.count}')
+        lines.append(f"{self.name}_sum {_format(self.sum)}")
+        lines.append(f"{self.name}_count {self.count}")
+        return lines
+
+    def restore(self, values: Dict[str, float]):
+        # Buckets that changed since the file was written start from zero
+        for i, bound in enumerate(self.buckets):
+            self.counts[i] += int(values.get(f'{self.name}_bucket{{le="{_format(bound)}"}}', 0))
+        self.count += int(values.get(f"{self.name}_count", 0))
+        self.sum += values.get(f"{self.name}_sum", 0.0)
+
+
+class Registry:
+    """Set of metrics, rendered and updated under one lock"""
+
+    def __init__(self):
+        self.metrics: Dict[str, object] = {}
+        self.lock = threading.Lock()
+        self.textfile: Optional[str] = os.environ.get("PANZOOM_METRICS_FILE") or None
+        self._restored: Optional[str] = None   # Textfile whose values were added
+
+    def counter(self, name: str, help_text: str) -> Counter:
+        return self.metrics.setdefault(name, Counter(name, help_text))
+
+    def histogram(self, name: str, help_text: str, buckets: Sequence[float]) -> Histogram:
+        return self.metrics.setdefault(name, Histogram(name, help_text, buckets))
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format"""
+        lines = []
+        with self.lock:
+            for metric in self.metrics.values():
+                lines.append(f"# HELP {metric.name} {metric.help}")
+                lines.append(f"# TYPE {metric.name} {metric.kind}")
+                lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+    def _restore(self, path: str):
+        """Add the values of an earlier textfile (the first time it is written)"""
+        values: Dict[str, float] = {}
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    if line.startswith('#'):
+                        continue
+                    sample, _, value = line.rstrip('\n').rpartition(' ')
+                    try:
+                        values[sample] = float(value)
+                    except ValueError:
+                        continue
+        except FileNotFoundError:
+            pass
+        for metric in self.metrics.values():
+            metric.restore(values)
+        self._restored = path
+
+    def write_textfile(self, path: Optional[str] = None):
+        """
+        Write the metrics atomically (the collector never sees a partial file)
+
+        The first write to a file adds the values it already holds. Several
+        processes writing the same file at once can still lose updates.
+        """
+        path = path or self.textfile
+        if not path:
+            return
+        with self.lock:
+            if self._restored != path:
+                self._restore(path)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(self.render())
+        os.replace(tmp_path, path)
+
+
+REGISTRY = Registry()
+
+RENDERS_STARTED = REGISTRY.counter(
+    "panzoom_renders_started_total", "Slideshow renders started")
+RENDERS_FINISHED = REGISTRY.counter(
+    "panzoom_renders_finished_total", "Slideshow renders finished successfully")
+RENDERS_FAILED = REGISTRY.counter(
+    "panzoom_renders_failed_total", "Slideshow renders failed or cancelled")
+IMAGES_PROCESSED = REGISTRY.counter(
+    "panzoom_images_processed_total", "Images in finished renders")
+RENDER_SECONDS = REGISTRY.counter(
+    "panzoom_render_seconds_total", "Wall time spent in finished renders")
+OUTPUT_SECONDS = REGISTRY.counter(
+    "panzoom_output_seconds_total", "Video duration produced by finished renders")
+RENDER_DURATION = REGISTRY.histogram(
+    "panzoom_render_duration_seconds", "Wall time of finished renders",
+    [10, 30, 60, 120, 300, 600, 1200, 1800, 3600, 7200])
+ENCODE_SPEED = REGISTRY.histogram(
+    "panzoom_encode_speed_ratio", "FFmpeg encode speed (output seconds per wall second)",
+    [0.1, 0.25, 0.5, 1, 2, 4, 8, 16])
+FFMPEG_PEAK_RSS = REGISTRY.histogram(
+    "panzoom_ffmpeg_peak_rss_bytes", "Peak resident memory of FFmpeg children",
+    [2 ** n * 1024 * 1024 for n in range(5, 15)])
+TRACKS_PROCESSED = REGISTRY.counter(
+    "panzoom_album_tracks_processed_total", "Album tracks processed successfully")
+TRACKS_FAILED = REGISTRY.counter(
+    "panzoom_album_tracks_failed_total", "Album tracks that failed")
+ALBUM_SECONDS = REGISTRY.counter(
+    "panzoom_album_seconds_total", "Wall time spent processing albums")
+
+
+def _flush():
+    # Exporting must never fail a render
+    try:
+        REGISTRY.write_textfile()
+    except OSError:
+        pass
+
+
+def render_started():
+    with REGISTRY.lock:
+        RENDERS_STARTED.inc()
+
+
+def render_finished(
+    success: bool,
+    wall_seconds: float,
+    output_seconds: float = 0.0,
+    images: int = 0,
+    speed: float = 0.0,
+    peak_rss_bytes: int = 0
+):
+    """Record the outcome of a slideshow render and flush the textfile"""
+    with REGISTRY.lock:
+        if success:
+            RENDERS_FINISHED.inc()
+            IMAGES_PROCESSED.inc(images)
+            RENDER_SECONDS.inc(wall_seconds)
+            OUTPUT_SECONDS.inc(output_seconds)
+            RENDER_DURATION.observe(wall_seconds)
+            if speed > 0:
+                ENCODE_SPEED.observe(speed)
+        else:
+            RENDERS_FAILED.inc()
+        if peak_rss_bytes:
+            FFMPEG_PEAK_RSS.observe(peak_rss_bytes)
+    _flush()
+
+
+def album_finished(success_count: int, error_count: int, wall_seconds: float):
+    """Record a processed album and flush the textfile"""
+    with REGISTRY.lock:
+        TRACKS_PROCESSED.inc(success_count)
+        TRACKS_FAILED.inc(error_count)
+        ALBUM_SECONDS.inc(wall_seconds)
+    _flush()
+
+
+def serve(port: int, host: str = "127.0.0.1"):
+    """
+    Serve /metrics over HTTP from a daemon thread
+
+    Returns:
+        The HTTP server (call shutdown() to stop it)
+    """
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?')[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = REGISTRY.render().encode('utf-8')
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
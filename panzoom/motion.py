@@ -0,0 +1,148 @@
+"""
+Precomputed Ken Burns motion tables
+
+Instead of letting zoompan evaluate z/x/y expressions for every output
+frame, the per-frame values are computed once in Python and written as a
+sendcmd script driving a plain scale + crop chain.
+"""
+
+import os
+from dataclasses import dataclass
+from typing import List, Tuple
+
+from .cache import partial_path
+
+
+# Easing curves mapping linear progress (0..1) to eased progress (0..1).
+# Written with plain arithmetic so they work on floats and NumPy arrays.
+EASINGS = {
+    "linear": lambda f: f,
+    "ease-in": lambda f: f * f,
+    "ease-out": lambda f: f * (2 - f),
+    "ease-in-out": lambda f: f * f * (3 - 2 * f),
+}
+
+
+@dataclass
+class MotionTable:
+    """Per-frame motion values of one image"""
+    zoom: List[float]               # Zoom factor (1.0 = full frame)
+    x: List[float]                  # Horizontal position (fraction of free room)
+
+
+def compute_motion(
+    num_frames: int,
+    zoom_intensity: float,
+    pan_intensity: float,
+    zoom_in: bool,
+    pan_left_to_right: bool,
+    easing: str = "linear"
+) -> MotionTable:
+    """Compute zoom and pan values for every frame of an image"""
+    if easing not in EASINGS:
+        raise ValueError(f"Unknown easing: {easing}. Available: {list(EASINGS.keys())}")
+    ease = EASINGS[easing]
+    last = max(1, num_frames - 1)
+
+    try:
+        import numpy as np
+    except ImportError:  # NumPy is optional, tables are small
+        np = None
+
+    if np is not None:
+        frac = ease(np.arange(num_frames, dtype=np.float64) / last)
+    else:
+        frac = [ease(k / last) for k in range(num_frames)]
+
+    def lerp(a: float, b: float):
+        if np is not None:
+            return (a + (b - a) * frac).tolist()
+        return [a + (b - a) * f for f in frac]
+
+    if zoom_in:
+        zoom = lerp(1.0, 1.0 + zoom_intensity)
+    else:
+        zoom = lerp(1.0 + zoom_intensity, 1.0)
+
+    if pan_left_to_right:
+        x = lerp(0.0, pan_intensity)
+    else:
+        x = lerp(pan_intensity, 0.0)
+
+    return MotionTable(zoom=zoom, x=x)
+
+
+def write_sendcmd(
+    table: MotionTable,
+    scale_target: str,
+    crop_target: str,
+    fps: int,
+    in_size: Tuple[int, int],
+    out_size: Tuple[int, int],
+    y_pos: float,
+    path: str,
+    supersample: int = 2
+) -> str:
+    """
+    Write a motion table as a sendcmd script for a scale + crop pair
+
+    The geometry is zoompan's on the supersampled image of in_size: the
+    window is in_size / zoom, panned over the room left by the output
+    size and clipped to the image. Instead of resizing the window, the
+    image is scaled to supersample times the output size times the zoom
+    and a window of supersample times the output size is cropped from it, so every frame leaving
+    the crop has the same size. Commands are scheduled half a frame early
+    so rounding never delays them to the next frame.
+    """
+    in_w, in_h = in_size
+    out_w, out_h = out_size
+    lines = []
+    for k, (z, x) in enumerate(zip(table.zoom, table.x)):
+        t = max(0.0, (k - 0.5) / fps)
+        # Window position on the supersampled image, then on the scaled one
+        left = min(max((in_w - out_w) * x, 0.0), in_w - in_w / z)
+        top = min(max((in_h - out_h) * y_pos, 0.0), in_h - in_h / z)
+        left *= supersample * out_w * z / in_w
+        top *= supersample * out_h * z / in_h
+        lines.append(
+            f"{t:.6f} {scale_target} w {int(round(supersample * out_w * z))},"
+            f"{scale_target} h {int(round(supersample * out_h * z))},"
+            f"{crop_target} x {int(left)},{crop_target} y {int(top)};"
+        )
+
+    tmp_path = partial_path(path, unique=True)
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(lines))
+        f.write('\n')
+    os.replace(tmp_path, path)
+    return path
+
+
+def max_displacement(
+    start: Tuple[float, float, float, float],
+    end: Tuple[float, float, float, float],
+    out_width: int,
+    out_height: int
+) -> float:
+    """
+    Largest on-screen move of the picture between two crop windows
+
+    Windows are (x, y, w, h) in input pixels, each scaled to the output
+    size. The move is linear in the input position, so checking the edges
+    of the first window covers everything visible in it.
+
+    Returns:
+        Displacement in output pixels
+    """
+    x0, y0, w0, h0 = start
+    x1, y1, w1, h1 = end
+
+    def move(p: float, a0: float, s0: float, a1: float, s1: float, size: int) -> float:
+        return abs((p - a1) * size / s1 - (p - a0) * size / s0)
+
+    return max(
+        move(x0, x0, w0, x1, w1, out_width),
+        move(x0 + w0, x0, w0, x1, w1, out_width),
+        move(y0, y0, h0, y1, h1, out_height),
+        move(y0 + h0, y0, h0, y1, h1, out_height),
+    )
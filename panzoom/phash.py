@@ -0,0 +1,224 @@
+"""
+Perceptual-hash image index for near-duplicate detection
+
+Images are decoded by FFmpeg straight to a 32x32 grayscale thumbnail and
+hashed with a DCT (pHash) in NumPy. Hashes are cached by path + size +
+mtime, and near-duplicates are grouped through a BK-tree on Hamming
+distance, so curation scales to folders of thousands of frames.
+"""
+
+import os
+import json
+import subprocess
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from .cache import get_cache_dir, file_signature, partial_path
+
+
+HASH_SIZE = 8                       # 8x8 low frequencies -> 64-bit hash
+THUMB_SIZE = 32                     # Side of the thumbnail fed to the DCT
+DEFAULT_THRESHOLD = 6               # Max Hamming distance of near-duplicates
+
+
+def _dct_matrix(n: int):
+    import numpy as np
+    k = np.arange(n)
+    m = np.cos(np.pi * (2 * k[None, :] + 1) * k[:, None] / (2 * n))
+    m[0] *= 1 / np.sqrt(2)
+    return m * np.sqrt(2 / n)
+
+
+def compute_phash(path: str) -> Optional[int]:
+    """Perceptual hash of an image, None if it cannot be decoded"""
+    import numpy as np
+
+    cmd = [
+        "ffmpeg", "-hide_banner", "-loglevel", "error",
+        "-i", path,
+        "-vf", f"scale={THUMB_SIZE}:{THUMB_SIZE}:flags=area,format=gray",
+        "-frames:v", "1",
+        "-f", "rawvideo", "pipe:1"
+    ]
+    try:
+        result = subprocess.run(cmd, capture_output=True)
+    except FileNotFoundError:
+        return None
+    if result.returncode != 0 or len(result.stdout) != THUMB_SIZE * THUMB_SIZE:
+        return None
+
+    pixels = np.frombuffer(result.stdout, dtype=np.uint8).reshape(THUMB_SIZE, THUMB_SIZE)
+    dct = _dct_matrix(THUMB_SIZE)
+    coeffs = dct @ pixels.astype(np.float64) @ dct.T
+    low = coeffs[:HASH_SIZE, :HASH_SIZE].flatten()
+    # Median without the DC term, which only reflects overall brightness
+    bits = low > np.median(low[1:])
+
+    value = 0
+    for bit in bits:
+        value = (value << 1) | int(bit)
+    return value
+
+
+def has_numpy() -> bool:
+    """Check if NumPy (needed for hashing) is available"""
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+class BKTree:
+    """Metric tree for fast Hamming-radius queries"""
+
+    def __init__(self):
+        self.root: Optional[Tuple[int, List[str], Dict[int, tuple]]] = None
+
+    def add(self, value: int, item: str):
+        if self.root is None:
+            self.root = (value, [item], {})
+            return
+        node = self.root
+        while True:
+            node_value, items, children = node
+            d = hamming(value, node_value)
+            if d == 0:
+                items.append(item)
+                return
+            if d not in children:
+                children[d] = (value, [item], {})
+                return
+            node = children[d]
+
+    def search(self, value: int, radius: int) -> List[Tuple[int, str]]:
+        """All (distance, item) within radius of value"""
+        found = []
+        stack = [self.root] if self.root else []
+        while stack:
+            node_value, items, children = stack.pop()
+            d = hamming(value, node_value)
+            if d <= radius:
+                found.extend((d, item) for item in items)
+            for child_d, child in children.items():
+                if d - radius <= child_d <= d + radius:
+                    stack.append(child)
+        return found
+
+
+class PHashIndex:
+    """Persistent perceptual-hash index, keyed by path + size + mtime"""
+
+    def __init__(self, index_path: Optional[str] = None):
+        self.index_path = index_path or os.path.join(get_cache_dir("phash"), "index.json")
+        self._entries: Dict[str, dict] = {}
+        if os.path.exists(self.index_path):
+            try:
+                with open(self.index_path, 'r', encoding='utf-8') as f:
+                    self._entries = json.load(f)
+            except (OSError, ValueError):
+                self._entries = {}
+
+    def save(self):
+        tmp_path = partial_path(self.index_path, unique=True)
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._entries, f)
+        os.replace(tmp_path, self.index_path)
+
+    def hashes(self, paths: List[str], max_workers: Optional[int] = None) -> Dict[str, int]:
+        """
+        Hashes of all images (in the order of paths), computing missing
+        ones in a process pool
+
+        Raises:
+            RuntimeError: Hashes are missing and NumPy is not installed
+        """
+        result = {}
+        missing = []
+        signatures = {}
+        for path in paths:
+            try:
+                sig = file_signature(path)
+            except OSError:
+                continue
+            signatures[path] = sig
+            entry = self._entries.get(sig["path"])
+            if entry and entry["size"] == sig["size"] and entry["mtime"] == sig["mtime"]:
+                result[path] = int(entry["hash"], 16)
+            else:
+                missing.append(path)
+
+        if missing:
+            if not has_numpy():
+                raise RuntimeError("NumPy is required for perceptual hashing (pip install numpy)")
+            with ProcessPoolExecutor(max_workers=max_workers) as pool:
+                for path, value in zip(missing, pool.map(compute_phash, missing, chunksize=16)):
+                    if value is None:
+                        continue
+                    result[path] = value
+                    sig = signatures[path]
+                    self._entries[sig["path"]] = {
+                        "size": sig["size"],
+                        "mtime": sig["mtime"],
+                        "hash": f"{value:016x}",
+                    }
+            self.save()
+
+        return {path: result[path] for path in paths if path in result}
+
+
+def group_duplicates(hashes: Dict[str, int], threshold: int = DEFAULT_THRESHOLD) -> List[List[str]]:
+    """
+    Group images within threshold of their group's first image
+
+    Images are taken in the order of ``hashes``; each one not grouped yet
+    starts a group with the later images close to it. Groups do not chain:
+    in a slow sequence (A close to B, B close to C) C is only grouped with
+    A if it is close to A itself.
+    """
+    order = {path: i for i, path in enumerate(hashes)}
+    tree = BKTree()
+    for path in order:
+        tree.add(hashes[path], path)
+
+    grouped = set()
+    groups = []
+    for path in order:
+        if path in grouped:
+            continue
+        members = [
+            other for _, other in tree.search(hashes[path], threshold)
+            if other not in grouped and order[other] > order[path]
+        ]
+        if members:
+            members.sort(key=order.__getitem__)
+            grouped.update(members)
+            groups.append([path, *members])
+    return groups
+
+
+def dedupe(
+    paths: List[str],
+    threshold: int = DEFAULT_THRESHOLD,
+    index: Optional[PHashIndex] = None
+) -> Tuple[List[str], List[str]]:
+    """
+    Drop near-identical images, keeping the first of each group
+
+    Raises:
+        RuntimeError: NumPy is needed and not installed
+
+    Returns:
+        Tuple of (kept paths in original order, dropped paths)
+    """
+    index = index or PHashIndex()
+    hashes = index.hashes(paths)
+    dropped = set()
+    for group in group_duplicates(hashes, threshold):
+        dropped.update(group[1:])
+    kept = [p for p in paths if p not in dropped]
+    return kept, [p for p in paths if p in dropped]
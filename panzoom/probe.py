@@ -0,0 +1,209 @@
+"""
+Media metadata probing with a persistent cache
+"""
+
+import os
+import json
+import shutil
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, asdict
+from typing import Dict, List, Optional
+
+from .cache import get_cache_dir, file_signature, partial_path
+
+
+@dataclass
+class AudioProbe:
+    """Audio stream properties reported by ffprobe"""
+    duration: float = 0.0           # Seconds
+    codec: str = ""
+    sample_rate: int = 0            # Hz
+    channels: int = 0
+    bit_rate: int = 0               # bits/s (0 = unknown)
+
+
+def probe_file(path: str) -> Optional[AudioProbe]:
+    """Probe the first audio stream of a file, None if unreadable"""
+    cmd = [
+        "ffprobe", "-v", "error",
+        "-select_streams", "a:0",
+        "-show_entries", "format=duration,bit_rate:stream=codec_name,sample_rate,channels,duration,bit_rate",
+        "-of", "json",
+        path
+    ]
+    try:
+        result = subprocess.run(cmd, capture_output=True, text=True)
+    except FileNotFoundError:
+        return None
+    if result.returncode != 0:
+        return None
+
+    try:
+        data = json.loads(result.stdout)
+    except ValueError:
+        return None
+
+    fmt = data.get("format", {})
+    streams = data.get("streams", [])
+    if not streams:
+        return None
+    stream = streams[0]
+
+    def number(*values, cast=float):
+        for value in values:
+            try:
+                return cast(float(value))
+            except (TypeError, ValueError):
+                continue
+        return cast(0)
+
+    return AudioProbe(
+        duration=number(stream.get("duration"), fmt.get("duration")),
+        codec=stream.get("codec_name", ""),
+        sample_rate=number(stream.get("sample_rate"), cast=int),
+        channels=number(stream.get("channels"), cast=int),
+        bit_rate=number(stream.get("bit_rate"), fmt.get("bit_rate"), cast=int),
+    )
+
+
+@dataclass
+class ImageProbe:
+    """Image dimensions reported by ffprobe"""
+    width: int = 0
+    height: int = 0
+
+
+def probe_image(path: str) -> Optional[ImageProbe]:
+    """Probe the dimensions of an image, None if unreadable"""
+    cmd = [
+        "ffprobe", "-v", "error",
+        "-select_streams", "v:0",
+        "-show_entries", "stream=width,height",
+        "-of", "json",
+        path
+    ]
+    try:
+        result = subprocess.run(cmd, capture_output=True, text=True)
+    except FileNotFoundError:
+        return None
+    if result.returncode != 0:
+        return None
+
+    try:
+        streams = json.loads(result.stdout).get("streams", [])
+        width, height = int(streams[0]["width"]), int(streams[0]["height"])
+    except (ValueError, LookupError, TypeError):
+        return None
+    if width <= 0 or height <= 0:
+        return None
+    return ImageProbe(width=width, height=height)
+
+
+def _lock_file(f):
+    """Hold an exclusive lock on an open file until it is closed (POSIX only)"""
+    try:
+        import fcntl
+    except ImportError:
+        return
+    fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+
+
+class ProbeCache:
+    """Probe results cached on disk, keyed by path + size + mtime"""
+
+    CACHE_NAME = "audio.json"
+    RESULT = AudioProbe
+    probe = staticmethod(probe_file)
+
+    def __init__(self, cache_path: Optional[str] = None):
+        self.cache_path = cache_path or os.path.join(get_cache_dir("probe"), self.CACHE_NAME)
+        self._entries: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+        self._changed = set()       # Entries probed since the cache was loaded
+        self.hits = 0
+        self.misses = 0
+        self._load()
+
+    def _read(self) -> Dict[str, dict]:
+        if not os.path.exists(self.cache_path):
+            return {}
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _load(self):
+        self._entries = self._read()
+
+    def save(self):
+        """
+        Write the cache atomically if anything changed
+
+        Other caches (concurrent renders, other processes) may have saved
+        since this one was loaded: under a lock file, their entries are
+        read back and kept, with the entries probed here taking precedence.
+        """
+        with self._lock:
+            if not self._changed:
+                return
+            with open(f"{self.cache_path}.lock", 'w') as lock:
+                _lock_file(lock)
+                entries = self._read()
+                entries.update({key: self._entries[key] for key in self._changed})
+                tmp_path = partial_path(self.cache_path, unique=True)
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(entries, f)
+                os.replace(tmp_path, self.cache_path)
+            self._entries = entries
+            self._changed.clear()
+
+    def get(self, path: str):
+        """Probe a file, reusing the cached result if it is unchanged"""
+        try:
+            sig = file_signature(path)
+        except OSError:
+            return None
+
+        with self._lock:
+            entry = self._entries.get(sig["path"])
+            if entry and entry.get("size") == sig["size"] and entry.get("mtime") == sig["mtime"]:
+                self.hits += 1
+                return self.RESULT(**entry["probe"])
+
+        probe = self.probe(path)
+        with self._lock:
+            self.misses += 1
+            if probe is not None:
+                self._entries[sig["path"]] = {
+                    "size": sig["size"],
+                    "mtime": sig["mtime"],
+                    "probe": asdict(probe),
+                }
+                self._changed.add(sig["path"])
+        return probe
+
+    def probe_many(self, paths: List[str], max_workers: Optional[int] = None) -> Dict[str, object]:
+        """Probe files in parallel (ffprobe runs are I/O and process bound)"""
+        if not paths:
+            return {}
+        workers = max_workers or min(16, (os.cpu_count() or 1) * 2)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = dict(zip(paths, pool.map(self.get, paths)))
+        self.save()
+        return results
+
+
+class ImageProbeCache(ProbeCache):
+    """Image dimensions, cached like audio probes"""
+
+    CACHE_NAME = "images.json"
+    RESULT = ImageProbe
+    probe = staticmethod(probe_image)
+
+
+def check_ffprobe() -> bool:
+    """Check if ffprobe is available"""
+    return shutil.which("ffprobe") is not None
@@ -5,16 +5,25 @@ Video slideshow generation with Ken Burns effect
 import os
 import sys
 import re
+import json
 import random
 import shutil
 import subprocess
 import threading
 import time
 from pathlib import Path
-from typing import List, Optional, Tuple, Callable
-from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple, Callable
+from dataclasses import dataclass, replace
 
-from .config import VideoConfig, WatermarkConfig, TitleConfig, TRANSITIONS
+from .config import VideoConfig, WatermarkConfig, TitleConfig, TRANSITIONS, apply_export_profile
+from .motion import compute_motion, write_sendcmd, max_displacement
+from .cache import (
+    get_cache_dir, cache_key, file_signature, file_hash, partial_path, prune_lru, touch
+)
+from . import encoding, framestore, metrics, supervisor
+from .staging import StagingArea
+from .taskgraph import TaskGraph, TaskError, TaskTiming
+from .supervisor import SupervisedProcess, DEFAULT_STALL_TIMEOUT
 
 
 @dataclass
@@ -25,6 +34,31 @@ class ImageInfo:
     zoom_in: bool
     pan_left_to_right: bool
     transition: str = "fade"
+    static: bool = False            # Motion below a pixel: rendered as a held frame
+    source_args: Optional[List[str]] = None  # Demuxer options of a piped image (one frame)
+    size: Optional[Tuple[int, int]] = None   # Pixel size of the source, when known
+
+
+@dataclass
+class RenderRange:
+    """Part of the slideshow to render (times on the slideshow timeline)"""
+    first_image: int                # Index of first image to render
+    last_image: int                 # Index of last image to render (inclusive)
+    start: float                    # Range start (seconds)
+    end: float                      # Range end (seconds)
+    
+    @property
+    def duration(self) -> float:
+        return self.end - self.start
+
+
+@dataclass
+class Mezzanine:
+    """Lossless render of the slideshow video, re-encoded for delivery"""
+    path: str
+    width: int
+    height: int
+    fps: int
 
 
 @dataclass
@@ -36,6 +70,7 @@ class ProgressInfo:
     speed: float = 0.0
     percent: float = 0.0
     eta_seconds: float = 0.0
+    playable_seconds: float = 0.0   # Already watchable (progressive outputs)
 
 
 class SlideshowGenerator:
@@ -44,18 +79,87 @@ class SlideshowGenerator:
     SUPPORTED_FORMATS = {'.png', '.jpg', '.jpeg', '.webp', '.bmp', '.tiff'}
     SUPPORTED_AUDIO = {'.wav', '.mp3', '.aac', '.flac', '.ogg', '.m4a'}
     
+    # Output containers: regular MP4 (moov written at the end), fragmented
+    # MP4 and HLS, both playable while the render is still running
+    OUTPUT_MODES = ("mp4", "fmp4", "hls")
+    SEGMENT_SECONDS = 4
+    
+    # Incremental renders cache the timeline in segments of about this many
+    # images (at most the maximum): a change only re-renders the segments
+    # it touches
+    TIMELINE_SEGMENT_IMAGES = 8
+    TIMELINE_SEGMENT_MAX_IMAGES = 24
+    
+    # Settings overridden in preview mode
+    PREVIEW_SETTINGS = {
+        "width": 640,
+        "height": 360,
+        "fps": 15,
+        "crf": 35,
+        "preset": "ultrafast",
+    }
+    
+    # FFmpeg supervision: renders report progress every ~0.5s, so a long
+    # silence means FFmpeg is stuck. No wall-clock limit by default.
+    STALL_TIMEOUT = DEFAULT_STALL_TIMEOUT
+    WALL_TIMEOUT: Optional[float] = None
+    
+    # Images moving less than this (output pixels) over their duration are
+    # rendered as one frame held for the duration
+    STATIC_THRESHOLD = 1.0
+    
+    # Audio layout shared by clips that get concatenated without re-encoding
+    CONCAT_SAMPLE_RATE = 48000
+    CONCAT_CHANNELS = 2
+    
+    # Cached title-less bodies beyond this total size are evicted, least
+    # recently used first
+    BODY_CACHE_BYTES = 2 * 1024 ** 3
+    
+    # Images are scaled to this multiple of the output size before motion
+    # so subpixel moves stay smooth
+    SUPERSAMPLE = 2
+    
+    # Size estimate of encoded video reserved in the staging area (bits per
+    # pixel and frame, generous for slideshow material)
+    STAGING_BITS_PER_PIXEL = 0.1
+    
+    # Lossless intermediate codecs: FFV1 is intra-only (fast seeks, larger),
+    # lossless x264 is smaller but slower to decode
+    MEZZANINE_CODECS = {
+        "ffv1": ["-c:v", "ffv1", "-level", "3", "-g", "1", "-slices", "16", "-pix_fmt", "yuv420p"],
+        "x264": ["-c:v", "libx264", "-qp", "0", "-preset", "ultrafast", "-pix_fmt", "yuv420p"],
+    }
+    
     def __init__(
         self,
         config: VideoConfig,
         watermark: Optional[WatermarkConfig] = None,
-        title: Optional[TitleConfig] = None
+        title: Optional[TitleConfig] = None,
+        cache_dir: Optional[str] = None
     ):
         self.config = config
         self.watermark = watermark
         self.title = title
+        self.cache_dir = cache_dir
         self.images: List[ImageInfo] = []
+        self.dropped_images: List[str] = []
         self._progress_info = ProgressInfo()
         self._stop_flag = False
+        self._live_output: Optional[Tuple[str, str]] = None  # (mode, path)
+        self.mezzanine: Optional[Mezzanine] = None
+        self._peak_rss = 0  # Bytes, largest FFmpeg child of the current render
+        self._process: Optional[SupervisedProcess] = None
+        self.threads = 0    # FFmpeg threads per render (0 = FFmpeg default)
+        self.stage_timings: List[TaskTiming] = []  # Preparation stages of the last render
+        self._stage_memo: dict = {}
+        self.staging: Optional[StagingArea] = None  # Where outputs are written before publishing
+        # Watermark asset prepared by another generator (see prepare_watermark)
+        self.watermark_asset: Optional[str] = None
+        # Seed random effects and shuffling per image name instead of drawing
+        # them in list order, and alternate directions within name-chosen
+        # segments (adding an image leaves the other segments unchanged)
+        self.effect_seed: Optional[int] = None
     
     def find_images(self, path: str) -> List[str]:
         """Find all supported images in a directory or file list"""
@@ -72,31 +176,100 @@ class SlideshowGenerator:
         
         return sorted(set(images))
     
+    def collect_images(self, path: str) -> List[str]:
+        """Find images, dropping near-duplicates if dedupe is enabled"""
+        images = self.find_images(path)
+        self.dropped_images = []
+        if self.config.dedupe and len(images) > 1:
+            from .phash import dedupe
+            images, self.dropped_images = dedupe(images, self.config.dedupe_threshold)
+        return images
+    
+    def prescale_images(
+        self,
+        image_paths: List[str],
+        max_workers: Optional[int] = None
+    ) -> List[str]:
+        """
+        Decode and scale images once to the supersampled working size
+        
+        The scaled copies are cached by source file and output size, so
+        renders sharing a set of images (e.g. one video per album track)
+        skip decoding and downscaling the full-size originals. The scale
+        in the filter graph is then a no-op. Images that fail to scale are
+        kept as they are.
+        
+        Returns:
+            Paths to use as render inputs, in the same order
+        """
+        from concurrent.futures import ThreadPoolExecutor
+        
+        cfg = self.config
+        width, height = cfg.width * self.SUPERSAMPLE, cfg.height * self.SUPERSAMPLE
+        scaled_dir = self._cache_subdir("scaled")
+        
+        def scale(path: str) -> str:
+            key = cache_key("scaled", file_signature(path), width, height)
+            scaled_path = os.path.join(scaled_dir, f"{key}.png")
+            if os.path.exists(scaled_path):
+                return scaled_path
+            
+            tmp_path = partial_path(scaled_path, unique=True)
+            # Light PNG compression: these are decoded far more often than written
+            cmd = [
+                "ffmpeg", "-y", "-hide_banner", "-loglevel", "error",
+                "-i", path,
+                "-vf", (
+                    f"scale={width}:{height}:force_original_aspect_ratio=increase:"
+                    f"flags=lanczos,format=rgb24"
+                ),
+                "-frames:v", "1",
+                "-compression_level", "1",
+                tmp_path
+            ]
+            result = supervisor.run(cmd, stall_timeout=self.STALL_TIMEOUT)
+            if not result.ok or not os.path.exists(tmp_path):
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                return path
+            os.replace(tmp_path, scaled_path)
+            return scaled_path
+        
+        with ThreadPoolExecutor(max_workers=max_workers or os.cpu_count() or 1) as pool:
+            return list(pool.map(scale, image_paths))
+    
     def prepare_images(self, image_paths: List[str]) -> List[ImageInfo]:
         """Prepare image list with effects parameters"""
         if not image_paths:
             raise ValueError("No images found")
         
         # Apply ordering
-        if self.config.shuffle:
+        if self.config.shuffle and self.effect_seed is not None:
+            image_paths = sorted(
+                image_paths, key=lambda p: cache_key(self.effect_seed, os.path.basename(p))
+            )
+        elif self.config.shuffle:
             random.shuffle(image_paths)
         elif self.config.reverse:
             image_paths = list(reversed(image_paths))
         
         # Get transition list for random mode
         transition_list = list(TRANSITIONS.keys())
+        first_of_pair = self._alternate_parity(image_paths)
         
         images = []
         for i, path in enumerate(image_paths):
+            rng = self._effect_random(path)
+            
             # Determine zoom direction
             if self.config.zoom_direction == "in":
                 zoom_in = True
             elif self.config.zoom_direction == "out":
                 zoom_in = False
             elif self.config.zoom_direction == "random":
-                zoom_in = random.choice([True, False])
+                zoom_in = rng.choice([True, False])
             else:  # alternate
-                zoom_in = (i % 2 == 0)
+                zoom_in = first_of_pair[i]
             
             # Determine pan direction
             if self.config.pan_direction == "left":
@@ -104,13 +277,13 @@ class SlideshowGenerator:
             elif self.config.pan_direction == "right":
                 pan_lr = False
             elif self.config.pan_direction == "random":
-                pan_lr = random.choice([True, False])
+                pan_lr = rng.choice([True, False])
             else:  # alternate
-                pan_lr = (i % 2 == 0)
+                pan_lr = first_of_pair[i]
             
             # Determine transition
             if self.config.transition == "random":
-                transition = random.choice(transition_list)
+                transition = rng.choice(transition_list)
             else:
                 transition = self.config.transition
             
@@ -125,12 +298,129 @@ class SlideshowGenerator:
         self.images = images
         return images
     
-    def _build_filter_complex(
+    def _alternate_parity(self, image_paths: List[str]) -> List[bool]:
+        """Which images take the first of the two "alternate" directions
+        
+        Directions alternate by position, restarting at every image that
+        starts a timeline segment when effect_seed is set. Inserting an
+        image then only flips the images after it in its own segment.
+        """
+        parity = []
+        run = 0
+        for i, path in enumerate(image_paths):
+            if i and self.effect_seed is not None and self._starts_segment(path):
+                run = 0
+            parity.append(run % 2 == 0)
+            run += 1
+        return parity
+    
+    def _effect_random(self, path: str):
+        """Random source of an image's effects (see effect_seed)"""
+        if self.effect_seed is None:
+            return random
+        return random.Random(f"{self.effect_seed}:{os.path.basename(path)}")
+    
+    def _crop_window(
         self,
-        with_watermark: bool = False,
-        with_title: bool = False
-    ) -> str:
-        """Build FFmpeg filter_complex string"""
+        img: ImageInfo,
+        in_width: float,
+        in_height: float,
+        progress: float
+    ) -> Tuple[float, float, float, float]:
+        """
+        Crop window (x, y, w, h) of an image at a point of its motion
+        
+        Mirrors zoompan (which the table chain reproduces): the window is
+        iw/zoom x ih/zoom, clipped to the image. Sizes are those of the
+        supersampled input.
+        """
+        cfg = self.config
+        zoom = cfg.zoom_intensity
+        z = 1 + zoom * progress if img.zoom_in else 1 + zoom - zoom * progress
+        pan = cfg.pan_intensity * (progress if img.pan_left_to_right else 1 - progress)
+        y_pos = cfg.vertical_position
+        
+        w, h = in_width / z, in_height / z
+        x = min(max((in_width - cfg.width) * pan, 0.0), in_width - w)
+        y = min(max((in_height - cfg.height) * y_pos, 0.0), in_height - h)
+        return x, y, w, h
+    
+    def detect_static_images(self) -> int:
+        """
+        Flag images whose motion stays below STATIC_THRESHOLD
+        
+        Image sizes are probed (and cached) only when the zoom setting
+        leaves room for it: zoom alone moves the frame edges by about
+        width * zoom pixels.
+        
+        Returns:
+            Number of static images
+        """
+        cfg = self.config
+        zoom = cfg.zoom_intensity
+        for img in self.images:
+            img.static = False
+        if max(cfg.width, cfg.height) * zoom / (1 + zoom) >= 2 * self.STATIC_THRESHOLD:
+            return 0
+        
+        self._probe_sizes()
+        
+        count = 0
+        for img in self.images:
+            if img.size is None:
+                continue
+            in_w, in_h = self._supersampled_size(img.size)
+            moved = max_displacement(
+                self._crop_window(img, in_w, in_h, 0.0),
+                self._crop_window(img, in_w, in_h, 1.0),
+                cfg.width, cfg.height
+            )
+            if moved < self.STATIC_THRESHOLD:
+                img.static = True
+                count += 1
+        return count
+    
+    def _probe_sizes(self):
+        """Fill in the pixel size of the images (file probes are cached on disk)"""
+        files = []
+        for img in self.images:
+            if img.size is not None:
+                continue
+            if img.source_args is None:
+                files.append(img)
+            elif "-s" in img.source_args:
+                # Raw pixels piped from memory carry their size
+                width, height = img.source_args[img.source_args.index("-s") + 1].split("x")
+                img.size = (int(width), int(height))
+        if not files:
+            return
+        
+        from .probe import ImageProbeCache
+        probes = ImageProbeCache().probe_many([img.path for img in files])
+        for img in files:
+            probe = probes.get(img.path)
+            if probe:
+                img.size = (probe.width, probe.height)
+    
+    def _supersampled_size(self, size: Tuple[int, int]) -> Tuple[int, int]:
+        """Size of an image after the supersampling scale
+        
+        Same rounding as scale with force_original_aspect_ratio=increase.
+        """
+        width, height = size
+        out_w, out_h = self.config.width * self.SUPERSAMPLE, self.config.height * self.SUPERSAMPLE
+        return (
+            max(out_w, (out_h * width + height // 2) // height),
+            max(out_h, (out_w * height + width // 2) // width)
+        )
+    
+    def _build_filter_complex(self, watermark_input: Optional[int] = None) -> str:
+        """Build FFmpeg filter_complex string
+        
+        Args:
+            watermark_input: Input index of the pre-rendered watermark asset
+                (see ``prepare_watermark``), or None for no watermark
+        """
         cfg = self.config
         num_frames = max(2, int(round(cfg.duration * cfg.fps)))
         zoom = cfg.zoom_intensity
@@ -138,16 +428,22 @@ class SlideshowGenerator:
         y_pos = cfg.vertical_position
         
         filters = []
-        
-        # Calculate input offset for watermark/title
-        input_offset = 0
-        if with_title and self.title and self.title.enabled:
-            input_offset += 1
+        if cfg.motion == "table":
+            self._probe_sizes()
         
         # Process each image
         for img in self.images:
             i = img.index
-            input_idx = i + input_offset
+            
+            if img.static:
+                filters.append(self._build_still_filter(img, num_frames))
+                continue
+            
+            # The motion table needs the image size; zoompan does without
+            if cfg.motion == "table" and img.size is not None:
+                filters.append(self._build_table_motion_filter(img, num_frames))
+                continue
+            
             frac = f"(on/{num_frames - 1})"
             
             # Zoom expression
@@ -166,8 +462,9 @@ class SlideshowGenerator:
             y_expr = f"(ih-oh)*{y_pos}"
             
             filters.append(
-                f"[{input_idx}:v]"
-                f"scale={cfg.width * 2}:{cfg.height * 2}:force_original_aspect_ratio=increase,"
+                f"[{i}:v]"
+                f"scale={cfg.width * self.SUPERSAMPLE}:{cfg.height * self.SUPERSAMPLE}:"
+                f"force_original_aspect_ratio=increase,"
                 f"zoompan=z='{z_expr}':x='{x_expr}':y='{y_expr}':"
                 f"d={num_frames}:s={cfg.width}x{cfg.height}:fps={cfg.fps},"
                 f"format=yuv420p[v{i}]"
@@ -199,7 +496,7 @@ class SlideshowGenerator:
             filters.append(f"[v0]format=yuv420p[{final_label}]")
         
         # Add watermark if enabled
-        if with_watermark and self.watermark and self.watermark.enabled:
+        if watermark_input is not None and self.watermark and self.watermark.enabled:
             wm = self.watermark
             # Calculate position
             positions = {
@@ -211,30 +508,95 @@ class SlideshowGenerator:
             }
             pos = positions.get(wm.position, positions["bottom-right"])
             
-            # Get watermark input index
-            wm_input = len(self.images) + input_offset + 1  # After audio
-            
+            # The asset is already sized and faded: overlay only blends the
+            # region it covers, and its single frame is reused for the video
             filters.append(
-                f"[{wm_input}:v]scale=iw*{wm.scale}:-1,format=rgba,"
-                f"colorchannelmixer=aa={wm.opacity}[wm]"
-            )
-            filters.append(
-                f"[{final_label}][wm]overlay={pos}[vfinal]"
+                f"[{final_label}][{watermark_input}:v]overlay={pos}:"
+                f"alpha=premultiplied:eof_action=repeat[vfinal]"
             )
             final_label = "vfinal"
         
-        # Add title overlay as intro if enabled
-        if with_title and self.title and self.title.enabled:
-            # Title is handled as a separate input, will be concatenated
-            pass
-        
         # Replace last label with [v] for output
         filters[-1] = filters[-1].rsplit('[', 1)[0] + '[v]'
         
         return ";".join(filters)
     
-    def _build_title_filter(self) -> str:
-        """Build filter for title card"""
+    def _build_table_motion_filter(self, img: ImageInfo, num_frames: int) -> str:
+        """Build a scale/crop chain driven by a precomputed motion table
+        
+        The geometry is zoompan's. The zoom goes into the scale (of the
+        supersampled image, to SUPERSAMPLE times the output size times the
+        zoom) and the crop keeps SUPERSAMPLE times the output size, so the
+        frames reaching the final scale never change size.
+        """
+        cfg = self.config
+        i = img.index
+        scale_target, crop_target = f"scale@m{i}", f"crop@m{i}"
+        win_w, win_h = cfg.width * self.SUPERSAMPLE, cfg.height * self.SUPERSAMPLE
+        in_w, in_h = self._supersampled_size(img.size)
+        
+        key = cache_key(
+            "motion", i, num_frames, cfg.fps, in_w, in_h, cfg.width, cfg.height, self.SUPERSAMPLE,
+            cfg.zoom_intensity, cfg.pan_intensity, cfg.vertical_position, cfg.easing,
+            img.zoom_in, img.pan_left_to_right
+        )
+        path = os.path.join(self._cache_subdir("motion"), f"{key}.cmd")
+        if not os.path.exists(path):
+            table = compute_motion(
+                num_frames, cfg.zoom_intensity, cfg.pan_intensity,
+                img.zoom_in, img.pan_left_to_right, cfg.easing
+            )
+            write_sendcmd(
+                table, scale_target, crop_target, cfg.fps,
+                (in_w, in_h), (cfg.width, cfg.height), cfg.vertical_position, path,
+                supersample=self.SUPERSAMPLE
+            )
+        
+        # The image is supersampled and converted once, then repeated for the
+        # crop to move over. The commands at time 0 set the first zoom before
+        # any frame is scaled. The crop must follow that scale directly: it
+        # clips to the size of its input link, which only the scale updates.
+        return (
+            f"[{i}:v]scale={in_w}:{in_h},format=yuv444p,"
+            f"tpad=stop_mode=clone:stop={num_frames - 1},"
+            f"sendcmd=f={_filter_path(path)},"
+            f"{scale_target}={win_w}:{win_h},"
+            f"{crop_target}=w={win_w}:h={win_h}:x=0:y=0,"
+            f"scale={cfg.width}:{cfg.height},setsar=1,"
+            f"format=yuv420p[v{i}]"
+        )
+    
+    def _build_still_filter(self, img: ImageInfo, num_frames: int) -> str:
+        """Build the chain of a static image: one frame, cloned for the duration
+        
+        The crop is the first frame of the image's motion. tpad clones
+        frames by reference, so filtering costs one frame and the encoder
+        gets exact duplicates, which it codes almost for free.
+        """
+        cfg = self.config
+        i = img.index
+        y_pos = cfg.vertical_position
+        zoom = 1.0 if img.zoom_in else 1 + cfg.zoom_intensity
+        pan = 0.0 if img.pan_left_to_right else cfg.pan_intensity
+        
+        return (
+            f"[{i}:v]"
+            f"scale={cfg.width * self.SUPERSAMPLE}:{cfg.height * self.SUPERSAMPLE}:"
+            f"force_original_aspect_ratio=increase,"
+            f"crop=w=iw/{zoom}:h=ih/{zoom}:"
+            f"x='clip((iw-{cfg.width})*{pan},0,iw-ow)':"
+            f"y='clip((ih-{cfg.height})*{y_pos},0,ih-oh)',"
+            f"scale={cfg.width}:{cfg.height},setsar=1,"
+            f"format=yuv444p,"
+            f"tpad=stop_mode=clone:stop={num_frames - 1}[v{i}]"
+        )
+    
+    def _build_title_filter(self, title_file: str, subtitle_file: Optional[str] = None) -> str:
+        """Build filter for title card
+        
+        Text is read from files (``expansion=none``) so quotes, colons and
+        percent signs in titles need no filtergraph escaping.
+        """
         if not self.title or not self.title.enabled:
             return ""
         
@@ -251,17 +613,17 @@ class SlideshowGenerator:
         )
         
         # Main title text
-        title_y = f"(h-text_h)/2-{t.subtitle_size}" if t.subtitle else "(h-text_h)/2"
+        title_y = f"(h-text_h)/2-{t.subtitle_size}" if subtitle_file else "(h-text_h)/2"
         filters.append(
-            f"[bg]drawtext=text='{t.text}':"
+            f"[bg]drawtext=textfile={_filter_path(title_file)}:expansion=none:"
             f"fontsize={t.font_size}:fontcolor={t.font_color}:"
             f"x=(w-text_w)/2:y={title_y}[titled]"
         )
         
         # Subtitle if present
-        if t.subtitle:
+        if subtitle_file:
             filters.append(
-                f"[titled]drawtext=text='{t.subtitle}':"
+                f"[titled]drawtext=textfile={_filter_path(subtitle_file)}:expansion=none:"
                 f"fontsize={t.subtitle_size}:fontcolor={t.font_color}:"
                 f"x=(w-text_w)/2:y=(h-text_h)/2+{t.font_size//2}[titlesub]"
             )
@@ -272,11 +634,367 @@ class SlideshowGenerator:
         # Fade in/out
         filters.append(
             f"[{final}]fade=t=in:st=0:d={t.fade_in},"
-            f"fade=t=out:st={t.duration - t.fade_out}:d={t.fade_out}[title]"
+            f"fade=t=out:st={t.duration - t.fade_out}:d={t.fade_out},"
+            f"format=yuv420p[title]"
         )
         
         return ";".join(filters)
     
+    def _title_key(self) -> str:
+        """Cache key of the title clip (title settings + output format)"""
+        cfg = self.config
+        return cache_key(
+            "title", self.title,
+            cfg.width, cfg.height, cfg.fps, cfg.crf, cfg.preset, cfg.audio_bitrate,
+            self.CONCAT_SAMPLE_RATE, self.CONCAT_CHANNELS
+        )
+    
+    def _body_key(self, audio_path: str, with_watermark: bool) -> str:
+        """Cache key of the slideshow body (everything but the title)"""
+        return cache_key(
+            "body", self.config,
+            [(file_signature(img.path), img.zoom_in, img.pan_left_to_right, img.transition)
+             for img in self.images],
+            file_signature(audio_path),
+            self.watermark if with_watermark else None,
+            file_signature(self.watermark.image_path) if with_watermark else None,
+            self.CONCAT_SAMPLE_RATE, self.CONCAT_CHANNELS
+        )
+    
+    def _segment_key(self, rng: RenderRange, with_watermark: bool) -> str:
+        """Cache key of a timeline segment (its images and its cut)"""
+        offset = self.image_start(rng.first_image)
+        return cache_key(
+            "segment", replace(self.config, audio_bitrate=""),
+            [(file_signature(img.path), img.zoom_in, img.pan_left_to_right,
+              img.transition, img.static)
+             for img in self.images[rng.first_image:rng.last_image + 1]],
+            round(rng.start - offset, 3), round(rng.duration, 3),
+            self.watermark if with_watermark else None,
+            file_signature(self.watermark.image_path) if with_watermark else None
+        )
+    
+    def _mezzanine_key(self, with_watermark: bool) -> str:
+        """Cache key of the mezzanine (everything but delivery encode settings)"""
+        return cache_key(
+            "mezzanine", replace(self.config, crf=0, preset="", audio_bitrate=""),
+            [(file_signature(img.path), img.zoom_in, img.pan_left_to_right, img.transition)
+             for img in self.images],
+            self.watermark if with_watermark else None,
+            file_signature(self.watermark.image_path) if with_watermark else None
+        )
+    
+    def render_title(self) -> Tuple[bool, str]:
+        """
+        Render the title card as a standalone intro clip
+        
+        Clips are cached by title settings and output format, so identical
+        titles across jobs are only rendered once.
+        
+        Returns:
+            Tuple of (success, clip path or error message)
+        """
+        if not self.title or not self.title.enabled:
+            return False, "Title is not enabled"
+        
+        cfg = self.config
+        t = self.title
+        title_dir = self._cache_subdir("titles")
+        key = self._title_key()
+        clip_path = os.path.join(title_dir, f"{key}.mp4")
+        
+        if os.path.exists(clip_path):
+            return True, clip_path
+        
+        title_file = os.path.join(title_dir, f"{key}.title.txt")
+        with open(title_file, 'w', encoding='utf-8') as f:
+            f.write(t.text)
+        subtitle_file = None
+        if t.subtitle:
+            subtitle_file = os.path.join(title_dir, f"{key}.subtitle.txt")
+            with open(subtitle_file, 'w', encoding='utf-8') as f:
+                f.write(t.subtitle)
+        
+        tmp_path = partial_path(clip_path, unique=True)
+        cmd = [
+            "ffmpeg", "-y", "-hide_banner", "-progress", "pipe:1", "-loglevel", "error",
+            "-f", "lavfi",
+            "-i", f"anullsrc=r={self.CONCAT_SAMPLE_RATE}:cl=stereo",
+            "-filter_complex", self._build_title_filter(title_file, subtitle_file),
+            "-map", "[title]",
+            "-map", "0:a",
+            "-t", str(t.duration),
+            *encoding.video_args(cfg),
+            "-c:a", "aac",
+            "-b:a", cfg.audio_bitrate,
+            "-ac", str(self.CONCAT_CHANNELS),
+            tmp_path
+        ]
+        
+        try:
+            result = supervisor.run(cmd, stall_timeout=self.STALL_TIMEOUT)
+        except FileNotFoundError:
+            return False, "FFmpeg not found. Please install FFmpeg."
+        
+        if not result.ok or not os.path.exists(tmp_path):
+            return False, f"Title render failed: {result.error}"
+        
+        os.replace(tmp_path, clip_path)
+        return True, clip_path
+    
+    def _watermark_width(self) -> int:
+        """Watermark width in output pixels (scale is relative to video width)"""
+        return max(2, int(round(self.config.width * self.watermark.scale / 2)) * 2)
+    
+    def _watermark_key(self) -> str:
+        """Cache key of the watermark asset (logo content and output size)"""
+        wm = self.watermark
+        return cache_key(
+            "watermark", file_hash(wm.image_path),
+            wm.scale, wm.opacity, self.config.width, self.config.height
+        )
+    
+    def prepare_watermark(self) -> Tuple[bool, str]:
+        """
+        Pre-render the watermark as a premultiplied RGBA asset
+        
+        The asset is sized in output pixels with opacity applied, and cached
+        by logo content, scale, opacity and output size.
+        
+        Returns:
+            Tuple of (success, asset path or error message)
+        """
+        if not self.watermark or not self.watermark.enabled:
+            return False, "Watermark is not enabled"
+        
+        if self.watermark_asset and os.path.exists(self.watermark_asset):
+            return True, self.watermark_asset
+        
+        wm = self.watermark
+        if not os.path.exists(wm.image_path):
+            return False, f"Watermark file not found: {wm.image_path}"
+        
+        width = self._watermark_width()
+        key = self._watermark_key()
+        asset_dir = self._cache_subdir("watermarks")
+        asset_path = os.path.join(asset_dir, f"{key}.png")
+        
+        if os.path.exists(asset_path):
+            return True, asset_path
+        
+        tmp_path = partial_path(asset_path, unique=True)
+        cmd = [
+            "ffmpeg", "-y", "-hide_banner", "-loglevel", "error",
+            "-i", wm.image_path,
+            "-vf", (
+                f"scale={width}:-2:flags=lanczos,format=rgba,"
+                f"colorchannelmixer=aa={wm.opacity},premultiply=inplace=1"
+            ),
+            "-frames:v", "1",
+            tmp_path
+        ]
+        
+        try:
+            result = supervisor.run(cmd, stall_timeout=self.STALL_TIMEOUT)
+        except FileNotFoundError:
+            return False, "FFmpeg not found. Please install FFmpeg."
+        
+        if not result.ok or not os.path.exists(tmp_path):
+            return False, f"Watermark preparation failed: {result.error}"
+        
+        os.replace(tmp_path, asset_path)
+        return True, asset_path
+    
+    def render_mezzanine(
+        self,
+        watermark_asset: Optional[str] = None,
+        progress_callback: Optional[Callable[[str], None]] = None,
+        progress_bar_callback: Optional[Callable[[ProgressInfo], None]] = None,
+        cached_only: bool = False
+    ) -> Tuple[bool, str]:
+        """
+        Render the slideshow video (no audio) to a lossless intermediate
+        
+        The mezzanine is cached by everything that shapes the pictures, but
+        not by CRF, preset or audio bitrate: changing those, or exporting
+        another profile, only re-encodes it (see ``deliver``).
+        
+        Args:
+            cached_only: Do not render, only look up an existing mezzanine
+        
+        Returns:
+            Tuple of (success, mezzanine path or error message)
+        """
+        cfg = self.config
+        if cfg.mezzanine not in self.MEZZANINE_CODECS:
+            return False, f"Unknown mezzanine codec: {cfg.mezzanine}"
+        
+        mezzanine_dir = self._cache_subdir("mezzanine")
+        path = os.path.join(
+            mezzanine_dir, f"{self._mezzanine_key(watermark_asset is not None)}.mkv"
+        )
+        
+        if os.path.exists(path):
+            if progress_callback:
+                progress_callback("Reusing cached mezzanine")
+        elif cached_only:
+            return False, "No cached mezzanine"
+        else:
+            tmp_path = partial_path(path, unique=True)
+            cmd = ["ffmpeg", "-y", "-hide_banner", "-progress", "pipe:1", "-loglevel", "error"]
+            cmd.extend(self._image_inputs())
+            watermark_input = None
+            if watermark_asset:
+                watermark_input = len(self.images)
+                cmd.extend(["-i", watermark_asset])
+            cmd.extend([
+                "-filter_complex", self._build_filter_complex(watermark_input=watermark_input),
+                "-map", "[v]",
+            ])
+            cmd.extend(self._thread_args())
+            cmd.extend(self.MEZZANINE_CODECS[cfg.mezzanine])
+            cmd.append(tmp_path)
+            
+            if progress_callback:
+                progress_callback(f"Rendering mezzanine ({cfg.mezzanine} lossless)...")
+            success, message = self._run_ffmpeg(cmd, self._body_duration(), progress_bar_callback)
+            if not success:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                return False, message
+            os.replace(tmp_path, path)
+        
+        self.mezzanine = Mezzanine(path, cfg.width, cfg.height, cfg.fps)
+        return True, path
+    
+    def deliver(
+        self,
+        profile_name: str,
+        audio_path: str,
+        output_path: str,
+        progress_callback: Optional[Callable[[str], None]] = None,
+        progress_bar_callback: Optional[Callable[[ProgressInfo], None]] = None
+    ) -> Tuple[bool, str]:
+        """
+        Encode an export profile from the mezzanine of the last render
+        
+        Only the final encode runs (plus scaling/frame rate conversion when
+        the profile differs from the mezzanine). Profiles with another
+        aspect ratio need their own render.
+        
+        Returns:
+            Tuple of (success, message)
+        """
+        m = self.mezzanine
+        if not m or not os.path.exists(m.path):
+            return False, "No mezzanine available (render with a mezzanine codec first)"
+        
+        try:
+            target = apply_export_profile(replace(self.config), profile_name)
+        except ValueError as e:
+            return False, str(e)
+        
+        if abs(target.width / target.height - m.width / m.height) > 0.01:
+            return False, (
+                f"{profile_name} ({target.width}x{target.height}) does not match the "
+                f"mezzanine aspect ratio ({m.width}x{m.height})"
+            )
+        
+        has_title = bool(self.title and self.title.enabled)
+        original_config = self.config
+        self.config = target
+        duration = self.estimate_duration()
+        final_path = self._scratch_path(output_path, duration)
+        body_path = self._scratch_path(partial_path(output_path), duration) if has_title else final_path
+        
+        try:
+            if progress_callback:
+                progress_callback(f"Encoding {profile_name} from mezzanine...")
+            cmd = self._build_delivery_command(audio_path, body_path, for_concat=has_title)
+            success, message = self._run_ffmpeg(cmd, self._body_duration(), progress_bar_callback)
+            if not success:
+                return False, message
+            
+            if has_title:
+                success, title_clip = self.render_title()
+                if not success:
+                    return False, title_clip
+                success, message = concat_clips([title_clip, body_path], final_path)
+                if not success:
+                    return False, message
+            
+            self._publish(final_path, output_path)
+            return True, f"Video created: {output_path} ({self._output_size_mb(output_path):.1f} MB)"
+        except FileNotFoundError:
+            return False, "FFmpeg not found. Please install FFmpeg."
+        finally:
+            self.config = original_config
+            self._discard(body_path)
+            self._discard(final_path)
+    
+    def _playable_duration(self, info: ProgressInfo) -> float:
+        """How much of a progressive output can already be played"""
+        mode, path = self._live_output
+        
+        if mode == "hls":
+            # Sum of the segments already listed in the playlist
+            total = 0.0
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        if line.startswith("#EXTINF:"):
+                            total += float(line[8:].split(',')[0])
+            except (OSError, ValueError):
+                pass
+            return total
+        
+        # Fragments are flushed when the next keyframe (forced every
+        # segment) arrives
+        seg = self.SEGMENT_SECONDS
+        return int(info.time_encoded // seg) * seg
+    
+    def _run_ffmpeg(
+        self,
+        cmd: List[str],
+        total_duration: float,
+        progress_bar_callback: Optional[Callable[[ProgressInfo], None]] = None,
+        pass_fds: Sequence[int] = ()
+    ) -> Tuple[bool, str]:
+        """Run FFmpeg under supervision, with progress tracking
+        
+        Args:
+            pass_fds: Descriptors inherited by FFmpeg (piped inputs)
+        """
+        self._progress_info = ProgressInfo()
+        if self._stop_flag:
+            return False, "Generation cancelled"
+        
+        process = SupervisedProcess(
+            cmd, stall_timeout=self.STALL_TIMEOUT, wall_timeout=self.WALL_TIMEOUT,
+            pass_fds=pass_fds
+        )
+        self._process = process
+        try:
+            for line in process.lines():
+                info = self._parse_ffmpeg_progress(line, total_duration)
+                if info and progress_bar_callback:
+                    if self._live_output and line.startswith("progress="):
+                        info.playable_seconds = self._playable_duration(info)
+                    progress_bar_callback(info)
+        except BaseException:
+            process.cancel()
+            raise
+        finally:
+            result = process.wait()
+            self._process = None
+        
+        self._peak_rss = max(self._peak_rss, result.peak_rss_bytes)
+        if result.cancelled:
+            return False, "Generation cancelled"
+        if not result.ok:
+            return False, f"FFmpeg error: {result.error}"
+        return True, ""
+    
     def _parse_ffmpeg_progress(self, line: str, total_duration: float) -> Optional[ProgressInfo]:
         """Parse FFmpeg progress output"""
         info = self._progress_info
@@ -318,7 +1036,12 @@ class SlideshowGenerator:
         output_path: str,
         progress_callback: Optional[Callable[[str], None]] = None,
         progress_bar_callback: Optional[Callable[[ProgressInfo], None]] = None,
-        preview: bool = False
+        preview: bool = False,
+        render_range: Optional[RenderRange] = None,
+        output_mode: str = "mp4",
+        frame_store: Optional[str] = None,
+        image_files: Optional[List[str]] = None,
+        incremental: bool = False
     ) -> Tuple[bool, str]:
         """
         Generate slideshow video
@@ -330,134 +1053,741 @@ class SlideshowGenerator:
             progress_callback: Optional callback for text progress updates
             progress_bar_callback: Optional callback for progress bar updates
             preview: Generate low-quality preview
+            render_range: Only render this part of the slideshow (no title)
+            output_mode: "mp4", or "fmp4"/"hls" to write a file that can be
+                played (and survives a kill) while rendering
+            frame_store: Directory to dump low-res raw frames to (see
+                framestore.FrameStore)
+            image_files: Images to use instead of searching image_path
+            incremental: Render the slideshow as cached timeline segments,
+                so that re-rendering after a change only redoes the
+                segments it touches (see ``_generate_segments``)
         
         Returns:
             Tuple of (success, message)
         """
-        self._stop_flag = False
+        started = time.perf_counter()
+        self._peak_rss = 0
+        self._progress_info = ProgressInfo()
+        metrics.render_started()
         
-        # Validate audio
-        audio = Path(audio_path)
-        if not audio.exists():
-            return False, f"Audio file not found: {audio_path}"
-        if audio.suffix.lower() not in self.SUPPORTED_AUDIO:
-            return False, f"Unsupported audio format: {audio.suffix}"
+        success, message = self._generate(
+            image_path, audio_path, output_path,
+            progress_callback, progress_bar_callback,
+            preview, render_range, output_mode, frame_store, image_files, incremental
+        )
         
-        # Find and prepare images
-        image_files = self.find_images(image_path)
-        if not image_files:
-            return False, f"No images found in: {image_path}"
+        if render_range:
+            output_seconds = render_range.duration
+            images = render_range.last_image - render_range.first_image + 1
+        else:
+            output_seconds = self.estimate_duration() if self.images else 0.0
+            images = len(self.images)
+        metrics.render_finished(
+            success, time.perf_counter() - started, output_seconds, images,
+            self._progress_info.speed, self._peak_rss
+        )
+        return success, message
+    
+    def _generate(
+        self,
+        image_path: str,
+        audio_path: str,
+        output_path: str,
+        progress_callback: Optional[Callable[[str], None]] = None,
+        progress_bar_callback: Optional[Callable[[ProgressInfo], None]] = None,
+        preview: bool = False,
+        render_range: Optional[RenderRange] = None,
+        output_mode: str = "mp4",
+        frame_store: Optional[str] = None,
+        image_files: Optional[List[str]] = None,
+        incremental: bool = False
+    ) -> Tuple[bool, str]:
+        """Render for generate (which records metrics around it)"""
+        self._stop_flag = False
         
-        self.prepare_images(image_files)
+        if output_mode not in self.OUTPUT_MODES:
+            return False, f"Unknown output mode: {output_mode}"
+        if incremental and (render_range or output_mode != "mp4" or frame_store):
+            return False, "Incremental renders only write whole MP4 slideshows"
         
-        if progress_callback:
-            progress_callback(f"Found {len(self.images)} images")
+        # Check for watermark file
+        has_watermark = (
+            self.watermark and 
+            self.watermark.enabled and 
+            os.path.exists(self.watermark.image_path)
+        )
+        has_title = bool(self.title and self.title.enabled) and render_range is None
+        progressive = output_mode != "mp4"
+        use_mezzanine = bool(self.config.mezzanine) and not progressive
         
-        # Adjust config for preview mode
+        # Adjust config for preview mode (before any stage: they all
+        # work at output size)
         original_config = None
         if preview:
             original_config = (
                 self.config.width, self.config.height,
                 self.config.fps, self.config.crf, self.config.preset
             )
-            self.config.width = 640
-            self.config.height = 360
-            self.config.fps = 15
-            self.config.crf = 35
-            self.config.preset = "ultrafast"
+            for key, value in self.PREVIEW_SETTINGS.items():
+                setattr(self.config, key, value)
         
-        # Check for watermark file
-        has_watermark = (
-            self.watermark and 
-            self.watermark.enabled and 
-            os.path.exists(self.watermark.image_path)
+        # Frame store times are on the full video timeline (with the title)
+        title_offset = self.title.duration if self.title and self.title.enabled else 0.0
+        store_start = (render_range.start if render_range else 0.0) + title_offset
+        store_size = framestore.frame_size(self.config.width, self.config.height)
+        all_images = self.images
+        
+        try:
+            try:
+                stages = self._prepare(image_path, audio_path, image_files, has_watermark, has_title)
+            except TaskError as e:
+                return False, str(e)
+            all_images = self.images
+            
+            if progress_callback:
+                progress_callback(f"Found {len(self.images)} images")
+                if self.dropped_images:
+                    progress_callback(f"Dropped {len(self.dropped_images)} near-duplicate image(s)")
+                if stages["prepare"]:
+                    progress_callback(
+                        f"{stages['prepare']} image(s) without visible motion, held as still frames"
+                    )
+                probe = stages["audio"]
+                if probe and render_range is None and probe.duration + 0.05 < self._body_duration():
+                    progress_callback(
+                        f"Audio ({format_time(probe.duration)}) is shorter than the slideshow "
+                        f"({format_time(self._body_duration())}): the video ends with it"
+                    )
+            
+            watermark_asset = stages.get("watermark")
+            title_clip = stages.get("title")
+            
+            if incremental:
+                return self._generate_segments(
+                    audio_path, output_path, watermark_asset, title_clip,
+                    progress_callback, progress_bar_callback
+                )
+            
+            # Through a mezzanine, only the delivery encode depends on
+            # CRF/preset/audio settings. Partial renders seek into an
+            # existing mezzanine but never render a full one.
+            mezzanine_ready = False
+            if use_mezzanine:
+                mezzanine_ready, message = self.render_mezzanine(
+                    watermark_asset, progress_callback, progress_bar_callback,
+                    cached_only=render_range is not None
+                )
+                if not mezzanine_ready and render_range is None:
+                    return False, message
+            
+            # Partial render: only the images intersecting the range, with
+            # audio seeked to where the first of them starts
+            audio_offset = 0.0
+            trim = None
+            body_duration = self._body_duration()
+            if render_range and mezzanine_ready:
+                trim = (render_range.start, render_range.duration)
+                body_duration = render_range.duration
+            elif render_range:
+                audio_offset = self.image_start(render_range.first_image)
+                trim = (render_range.start - audio_offset, render_range.duration)
+                body_duration = render_range.duration
+                self.images = [
+                    replace(img, index=k) for k, img in enumerate(
+                        all_images[render_range.first_image:render_range.last_image + 1]
+                    )
+                ]
+                if progress_callback:
+                    progress_callback(
+                        f"Partial render: images {render_range.first_image + 1}-"
+                        f"{render_range.last_image + 1}, "
+                        f"{format_time(render_range.start)}-{format_time(render_range.end)}"
+                    )
+            
+            # Progressive outputs are written in one pass: the cached title
+            # clip is decoded and joined in the filter graph
+            if progressive:
+                intro_clip = title_clip
+                cmd = self._build_body_command(
+                    audio_path, output_path, watermark_asset,
+                    audio_offset=audio_offset, trim=trim,
+                    output_mode=output_mode, intro_clip=intro_clip,
+                    frame_store=frame_store
+                )
+                if progress_callback:
+                    progress_callback(f"Starting progressive render ({output_mode})...")
+                
+                total = body_duration + (self.title.duration if intro_clip else 0)
+                self._live_output = (output_mode, output_path)
+                success, message = self._run_ffmpeg(cmd, total, progress_bar_callback)
+                if not success:
+                    return False, message
+                if frame_store:
+                    framestore.finalize(
+                        frame_store, *store_size, self.config.fps,
+                        0.0 if intro_clip else store_start
+                    )
+                return True, f"Video created: {output_path} ({self._output_size_mb(output_path):.1f} MB)"
+            
+            # With a title, the body is cached on its own so that retitling
+            # only re-renders the short intro clip and a stream-copy concat
+            body_path = output_path
+            if has_title:
+                body_dir = self._cache_subdir("bodies")
+                body_path = os.path.join(
+                    body_dir, f"{self._body_key(audio_path, has_watermark)}.mp4"
+                )
+            
+            # Frames are dumped by the body render itself, or decoded
+            # from the cached body/mezzanine when there is no such render
+            frames_source = None
+            if has_title and os.path.exists(body_path):
+                if progress_callback:
+                    progress_callback("Reusing cached slideshow body")
+                touch(body_path)
+                frames_source = (body_path, None)
+            else:
+                if has_title:
+                    target = partial_path(body_path, unique=True)
+                else:
+                    target = final_path = self._scratch_path(output_path, body_duration)
+                if mezzanine_ready:
+                    cmd = self._build_delivery_command(audio_path, target, has_title, trim=trim)
+                    frames_source = (self.mezzanine.path, trim)
+                else:
+                    cmd = self._build_body_command(
+                        audio_path, target, watermark_asset, has_title,
+                        audio_offset=audio_offset, trim=trim,
+                        frame_store=frame_store
+                    )
+                
+                if progress_callback:
+                    mode = "preview" if preview else "full quality"
+                    source = " from mezzanine" if mezzanine_ready else ""
+                    progress_callback(f"Starting video generation ({mode}{source})...")
+                
+                success, message = self._run_ffmpeg(
+                    cmd, body_duration, progress_bar_callback
+                )
+                if not success:
+                    self._discard(target)
+                    return False, message
+                if has_title:
+                    os.replace(target, body_path)
+                    prune_lru(body_dir, self.BODY_CACHE_BYTES, keep=(body_path,))
+                else:
+                    self._publish(final_path, output_path)
+            
+            if frame_store:
+                if frames_source:
+                    if progress_callback:
+                        progress_callback("Extracting frame store...")
+                    success, message = framestore.extract(
+                        frames_source[0], frame_store, *store_size,
+                        self.config.fps, store_start, frames_source[1]
+                    )
+                    if not success:
+                        return False, message
+                else:
+                    framestore.finalize(frame_store, *store_size, self.config.fps, store_start)
+            
+            if has_title:
+                final_path = self._scratch_path(output_path, self.estimate_duration())
+                success, message = concat_clips([title_clip, body_path], final_path)
+                if not success:
+                    self._discard(final_path)
+                    return False, message
+                self._publish(final_path, output_path)
+            
+            # Get output file size
+            if os.path.exists(output_path):
+                return True, f"Video created: {output_path} ({self._output_size_mb(output_path):.1f} MB)"
+            else:
+                return False, "Output file was not created"
+                
+        except FileNotFoundError:
+            return False, "FFmpeg not found. Please install FFmpeg."
+        except Exception as e:
+            return False, f"Error: {str(e)}"
+        finally:
+            self.images = all_images
+            self._live_output = None
+            if frame_store:
+                framestore.discard(frame_store)
+            
+            # Restore original config if preview
+            if original_config:
+                (self.config.width, self.config.height,
+                 self.config.fps, self.config.crf, self.config.preset) = original_config
+    
+    def _generate_segments(
+        self,
+        audio_path: str,
+        output_path: str,
+        watermark_asset: Optional[str],
+        title_clip: Optional[str],
+        progress_callback: Optional[Callable[[str], None]] = None,
+        progress_bar_callback: Optional[Callable[[ProgressInfo], None]] = None
+    ) -> Tuple[bool, str]:
+        """
+        Render the slideshow from cached timeline segments
+        
+        Each segment (see ``timeline_segments``) is rendered without audio
+        and cached by its own images, so adding, replacing or removing an
+        image only re-renders the segments around it. The segments are
+        then joined by stream copy and muxed with the audio; the output is
+        replaced only once complete. Segments of the previous render of
+        the same output that are no longer used are then deleted.
+        
+        Returns:
+            Tuple of (success, message)
+        """
+        segment_dir = self._cache_subdir("segments")
+        ranges = self.timeline_segments()
+        all_images = self.images
+        clips = []
+        rendered = 0
+        
+        for number, rng in enumerate(ranges, 1):
+            path = os.path.join(
+                segment_dir, f"{self._segment_key(rng, watermark_asset is not None)}.mp4"
+            )
+            clips.append(path)
+            if os.path.exists(path):
+                continue
+            
+            if progress_callback:
+                progress_callback(
+                    f"Rendering segment {number}/{len(ranges)}: images "
+                    f"{rng.first_image + 1}-{rng.last_image + 1}"
+                )
+            offset = self.image_start(rng.first_image)
+            self.images = [
+                replace(img, index=k) for k, img in enumerate(
+                    all_images[rng.first_image:rng.last_image + 1]
+                )
+            ]
+            tmp_path = partial_path(path, unique=True)
+            try:
+                cmd = self._build_segment_command(
+                    tmp_path, watermark_asset, (rng.start - offset, rng.duration)
+                )
+            finally:
+                self.images = all_images
+            
+            success, message = self._run_ffmpeg(cmd, rng.duration, progress_bar_callback)
+            if not success:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                return False, message
+            os.replace(tmp_path, path)
+            rendered += 1
+        
+        if progress_callback:
+            progress_callback(
+                f"{rendered} segment(s) rendered, {len(ranges) - rendered} reused from cache"
+            )
+        
+        # The previous output stays in place until the new one is complete
+        duration = self.estimate_duration()
+        final_path = self._scratch_path(output_path, duration)
+        body_path = self._scratch_path(partial_path(output_path), duration) if title_clip else final_path
+        list_path = f"{body_path}.txt"
+        with open(list_path, 'w', encoding='utf-8') as f:
+            for clip in clips:
+                escaped = os.path.abspath(clip).replace("'", "'\\''")
+                f.write(f"file '{escaped}'\n")
+        
+        cmd = [
+            "ffmpeg", "-y", "-hide_banner", "-progress", "pipe:1", "-loglevel", "error",
+            "-f", "concat", "-safe", "0", "-i", list_path,
+            "-i", audio_path,
+            "-map", "0:v", "-map", "1:a",
+            "-c:v", "copy",
+            "-c:a", "aac", "-b:a", self.config.audio_bitrate,
+        ]
+        if title_clip:
+            cmd.extend([
+                "-ar", str(self.CONCAT_SAMPLE_RATE),
+                "-ac", str(self.CONCAT_CHANNELS),
+            ])
+        cmd.extend(["-shortest", "-movflags", "+faststart", body_path])
+        
+        try:
+            if progress_callback:
+                progress_callback("Joining segments with audio...")
+            success, message = self._run_ffmpeg(cmd, self._body_duration(), progress_bar_callback)
+            if success and title_clip:
+                success, message = concat_clips([title_clip, body_path], final_path)
+            if not success:
+                return False, message
+            self._publish(final_path, output_path)
+        finally:
+            if os.path.exists(list_path):
+                os.remove(list_path)
+            self._discard(body_path)
+            self._discard(final_path)
+        
+        self._prune_segments(segment_dir, output_path, clips)
+        return True, (
+            f"Video created: {output_path} ({self._output_size_mb(output_path):.1f} MB, "
+            f"{rendered}/{len(ranges)} segment(s) rendered)"
+        )
+    
+    @staticmethod
+    def _prune_segments(segment_dir: str, output_path: str, clips: List[str]):
+        """Delete segments the previous render of output_path used and this one does not"""
+        index_path = os.path.join(
+            segment_dir, f"{cache_key('output', os.path.abspath(output_path))}.json"
         )
+        try:
+            with open(index_path, 'r', encoding='utf-8') as f:
+                previous = json.load(f)
+        except (OSError, ValueError):
+            previous = []
+        
+        current = [os.path.basename(clip) for clip in clips]
+        for name in set(previous) - set(current):
+            path = os.path.join(segment_dir, name)
+            if os.path.exists(path):
+                os.remove(path)
+        
+        tmp_path = partial_path(index_path)
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(current, f)
+        os.replace(tmp_path, index_path)
+    
+    def _prepare(
+        self,
+        image_path: str,
+        audio_path: str,
+        image_files: Optional[List[str]],
+        with_watermark: bool,
+        with_title: bool
+    ) -> dict:
+        """
+        Run the preparation stages of a render as a task graph
+        
+        Image discovery, audio validation/probing, watermark and title
+        rendering are independent and run concurrently; image preparation
+        (ordering, effects, static detection) follows discovery. Watermark
+        and title results are memoized on the generator, so later renders
+        by the same generator skip them while their files still exist. Timings are kept in
+        ``stage_timings``.
+        
+        Returns:
+            Stage results by name ("images", "prepare", "audio", and
+            "watermark"/"title" when enabled)
+        
+        Raises:
+            TaskError: A stage failed (message ready for the user)
+        """
+        def audio_stage():
+            audio = Path(audio_path)
+            if not audio.exists():
+                raise RuntimeError(f"Audio file not found: {audio_path}")
+            if audio.suffix.lower() not in self.SUPPORTED_AUDIO:
+                raise RuntimeError(f"Unsupported audio format: {audio.suffix}")
+            from .probe import ProbeCache
+            cache = ProbeCache()
+            probe = cache.get(audio_path)
+            cache.save()
+            return probe
+        
+        def images_stage():
+            files = self.collect_images(image_path) if image_files is None else list(image_files)
+            if not files:
+                raise RuntimeError(f"No images found in: {image_path}")
+            return files
+        
+        def prepare_stage(files):
+            self.prepare_images(files)
+            return self.detect_static_images()
+        
+        def checked(result: Tuple[bool, str]) -> str:
+            success, value = result
+            if not success:
+                raise RuntimeError(value)
+            return value
+        
+        graph = TaskGraph(memo=self._stage_memo)
+        graph.add("audio", audio_stage)
+        graph.add("images", images_stage)
+        graph.add("prepare", prepare_stage, deps=["images"])
+        if with_watermark:
+            graph.add(
+                "watermark", lambda: checked(self.prepare_watermark()),
+                key=self._watermark_key(), valid=os.path.exists
+            )
+        if with_title:
+            graph.add(
+                "title", lambda: checked(self.render_title()),
+                key=self._title_key(), valid=os.path.exists
+            )
+        
+        try:
+            return graph.run(should_stop=lambda: self._stop_flag)
+        finally:
+            self.stage_timings = graph.timings
+    
+    @staticmethod
+    def _output_size_mb(output_path: str) -> float:
+        """Size of an output, including HLS segments next to a playlist"""
+        out = Path(output_path)
+        if not out.exists():
+            return 0.0
+        size = out.stat().st_size
+        if out.suffix == ".m3u8":
+            size += sum(p.stat().st_size for p in out.parent.glob(f"{out.stem}_*"))
+        return size / (1024 * 1024)
+    
+    def _cache_subdir(self, name: str) -> str:
+        """Cache directory of render intermediates, under the staging policy's root"""
+        root = self.cache_dir or (self.staging.cache_root if self.staging else "")
+        return get_cache_dir(name, root)
+
+    def _scratch_path(self, destination: str, seconds: float = 0.0) -> str:
+        """Where to write a file before publishing it to ``destination``"""
+        if not self.staging:
+            return partial_path(destination)
+        cfg = self.config
+        expected = seconds * cfg.width * cfg.height * cfg.fps * self.STAGING_BITS_PER_PIXEL / 8
+        return self.staging.path(destination, int(expected))
+    
+    def _publish(self, path: str, destination: str):
+        if self.staging:
+            self.staging.publish(path, destination)
+        else:
+            os.replace(path, destination)
+    
+    def _discard(self, path: str):
+        if self.staging:
+            self.staging.discard(path)
+        elif os.path.exists(path):
+            os.remove(path)
+    
+    def _thread_args(self) -> List[str]:
+        """Thread limits for filtering and encoding (concurrent renders)"""
+        if not self.threads:
+            return []
+        return [
+            "-filter_complex_threads", str(self.threads),
+            "-threads", str(self.threads),
+        ]
+    
+    def _image_inputs(self) -> List[str]:
+        """FFmpeg input arguments of the images"""
+        args = []
+        # Every image is a single frame: zoompan generates its frames from
+        # it, the other chains repeat it. A looped input would make zoompan
+        # emit a whole motion per input frame, running past the slideshow.
+        for img in self.images:
+            args.extend([*(img.source_args or []), "-framerate", str(self.config.fps), "-i", img.path])
+        return args
+    
+    def _build_body_command(
+        self,
+        audio_path: str,
+        output_path: str,
+        watermark_asset: Optional[str] = None,
+        for_concat: bool = False,
+        audio_offset: float = 0.0,
+        trim: Optional[Tuple[float, float]] = None,
+        output_mode: str = "mp4",
+        intro_clip: Optional[str] = None,
+        frame_store: Optional[str] = None
+    ) -> List[str]:
+        """Build the FFmpeg command rendering the slideshow itself
         
-        # Build FFmpeg command
+        Args:
+            audio_offset: Seek into the audio (partial renders)
+            trim: Optional (start, duration) of the output, relative to the
+                first rendered image
+            output_mode: Output container (see OUTPUT_MODES)
+            intro_clip: Clip (with audio) joined in front in the filter graph
+            frame_store: Also write low-res raw frames to this store
+        """
         cmd = ["ffmpeg", "-y", "-hide_banner", "-progress", "pipe:1", "-loglevel", "error"]
         
         # Input images
-        for img in self.images:
-            cmd.extend(["-loop", "1", "-t", str(self.config.duration), "-i", img.path])
+        cmd.extend(self._image_inputs())
         
         # Input audio
+        audio_input = len(self.images)
+        if audio_offset > 0:
+            cmd.extend(["-ss", f"{audio_offset:.3f}"])
         cmd.extend(["-i", audio_path])
         
         # Watermark input
-        if has_watermark:
-            cmd.extend(["-i", self.watermark.image_path])
+        watermark_input = None
+        if watermark_asset:
+            watermark_input = audio_input + 1
+            cmd.extend(["-i", watermark_asset])
+        
+        # Intro clip input
+        intro_input = None
+        if intro_clip:
+            intro_input = len(self.images) + (2 if watermark_asset else 1)
+            cmd.extend(["-i", intro_clip])
         
         # Filter complex
-        filter_complex = self._build_filter_complex(with_watermark=has_watermark)
+        filter_complex = self._build_filter_complex(watermark_input=watermark_input)
+        video_out, audio_out = "[v]", f"{audio_input}:a"
+        if intro_input is not None:
+            filter_complex += (
+                f";[{intro_input}:v]setsar=1[intro];[v]setsar=1[body];"
+                f"[intro][{intro_input}:a][body][{audio_input}:a]concat=n=2:v=1:a=1[vc][ac]"
+            )
+            video_out, audio_out = "[vc]", "[ac]"
+        if frame_store:
+            store_w, store_h = framestore.frame_size(self.config.width, self.config.height)
+            filter_complex += (
+                f";{video_out}split[vout][vs];"
+                f"[vs]scale={store_w}:{store_h}:flags=area[vstore]"
+            )
+            video_out = "[vout]"
         cmd.extend(["-filter_complex", filter_complex])
+        cmd.extend(self._thread_args())
+        
+        # Output mapping and encoding. Progressive outputs place their
+        # own keyframes at segment boundaries.
+        keyframes = []
+        if output_mode == "mp4":
+            keyframes = encoding.keyframe_times(
+                self.config, len(self.images),
+                offset=self.title.duration if intro_clip else 0.0,
+                start=trim[0] if trim else 0.0,
+                duration=trim[1] if trim else None
+            )
+        # Clips joined by stream copy share the same tune
+        static = not for_concat and all(img.static for img in self.images)
+        cmd.extend(["-map", video_out, "-map", audio_out])
+        cmd.extend(encoding.video_args(self.config, keyframes, static))
+        cmd.extend(["-c:a", "aac", "-b:a", self.config.audio_bitrate])
+        
+        # Match the title clip audio layout so both can be stream-copied
+        if for_concat:
+            cmd.extend([
+                "-ar", str(self.CONCAT_SAMPLE_RATE),
+                "-ac", str(self.CONCAT_CHANNELS),
+            ])
+        
+        if trim:
+            cmd.extend(["-ss", f"{trim[0]:.3f}", "-t", f"{trim[1]:.3f}"])
+        
+        # Progressive outputs: regular keyframes so every segment/fragment
+        # can be flushed and played on its own
+        seg = self.SEGMENT_SECONDS
+        if output_mode != "mp4":
+            cmd.extend(["-force_key_frames", f"expr:gte(t,n_forced*{seg})"])
+        if output_mode == "fmp4":
+            cmd.extend(["-movflags", "+frag_keyframe+empty_moov+default_base_moof"])
+        elif output_mode == "hls":
+            out = Path(output_path)
+            cmd.extend([
+                "-f", "hls",
+                "-hls_time", str(seg),
+                "-hls_playlist_type", "event",
+                "-hls_segment_type", "fmp4",
+                "-hls_fmp4_init_filename", f"{out.stem}_init.mp4",
+                "-hls_segment_filename", str(out.with_name(f"{out.stem}_%05d.m4s")),
+            ])
+        
+        cmd.extend(["-shortest", output_path])
         
-        # Output mapping and encoding
+        # Second output: the raw frame store, cut like the main output
+        if frame_store:
+            if trim:
+                cmd.extend(["-ss", f"{trim[0]:.3f}", "-t", f"{trim[1]:.3f}"])
+            cmd.extend(framestore.output_args(frame_store, store_w, store_h, "[vstore]"))
+        return cmd
+    
+    def _build_segment_command(
+        self,
+        output_path: str,
+        watermark_asset: Optional[str],
+        trim: Tuple[float, float]
+    ) -> List[str]:
+        """Build the FFmpeg command rendering one timeline segment (no audio)
+        
+        Args:
+            trim: (start, duration) of the segment, relative to the first
+                rendered image
+        """
+        cmd = ["ffmpeg", "-y", "-hide_banner", "-progress", "pipe:1", "-loglevel", "error"]
+        cmd.extend(self._image_inputs())
+        watermark_input = None
+        if watermark_asset:
+            watermark_input = len(self.images)
+            cmd.extend(["-i", watermark_asset])
         cmd.extend([
+            "-filter_complex", self._build_filter_complex(watermark_input=watermark_input),
             "-map", "[v]",
-            "-map", f"{len(self.images)}:a",
-            "-c:v", "libx264",
-            "-crf", str(self.config.crf),
-            "-preset", self.config.preset,
-            "-pix_fmt", "yuv420p",
-            "-c:a", "aac",
-            "-b:a", self.config.audio_bitrate,
-            "-shortest",
-            output_path
         ])
+        cmd.extend(self._thread_args())
         
-        if progress_callback:
-            mode = "preview" if preview else "full quality"
-            progress_callback(f"Starting video generation ({mode})...")
+        # Segments are joined by stream copy: same tune for all of them
+        keyframes = encoding.keyframe_times(
+            self.config, len(self.images), start=trim[0], duration=trim[1]
+        )
+        cmd.extend(encoding.video_args(self.config, keyframes))
+        cmd.extend(["-ss", f"{trim[0]:.3f}", "-t", f"{trim[1]:.3f}", "-an", output_path])
+        return cmd
+    
+    def _build_delivery_command(
+        self,
+        audio_path: str,
+        output_path: str,
+        for_concat: bool = False,
+        trim: Optional[Tuple[float, float]] = None
+    ) -> List[str]:
+        """Build the FFmpeg command encoding the mezzanine for delivery
         
-        # Estimate total duration for progress
-        total_duration = self.estimate_duration()
+        Args:
+            trim: Optional (start, duration) on the slideshow timeline
+        """
+        cfg = self.config
+        m = self.mezzanine
+        cmd = ["ffmpeg", "-y", "-hide_banner", "-progress", "pipe:1", "-loglevel", "error"]
         
-        # Run FFmpeg with progress tracking
-        try:
-            process = subprocess.Popen(
-                cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                universal_newlines=True
-            )
-            
-            # Read progress
-            while True:
-                if self._stop_flag:
-                    process.terminate()
-                    return False, "Generation cancelled"
-                
-                line = process.stdout.readline()
-                if not line and process.poll() is not None:
-                    break
-                
-                if line and progress_bar_callback:
-                    info = self._parse_ffmpeg_progress(line, total_duration)
-                    if info:
-                        progress_bar_callback(info)
-            
-            # Get final result
-            _, stderr = process.communicate()
-            
-            # Restore original config if preview
-            if original_config:
-                (self.config.width, self.config.height,
-                 self.config.fps, self.config.crf, self.config.preset) = original_config
-            
-            if process.returncode != 0:
-                return False, f"FFmpeg error: {stderr}"
-            
-            # Get output file size
-            if os.path.exists(output_path):
-                size_mb = os.path.getsize(output_path) / (1024 * 1024)
-                return True, f"Video created: {output_path} ({size_mb:.1f} MB)"
-            else:
-                return False, "Output file was not created"
-                
-        except FileNotFoundError:
-            return False, "FFmpeg not found. Please install FFmpeg."
-        except Exception as e:
-            return False, f"Error: {str(e)}"
+        if trim:
+            cmd.extend(["-ss", f"{trim[0]:.3f}"])
+        cmd.extend(["-i", m.path])
+        if trim:
+            cmd.extend(["-ss", f"{trim[0]:.3f}"])
+        cmd.extend(["-i", audio_path])
+        
+        filters = []
+        if (cfg.width, cfg.height) != (m.width, m.height):
+            filters.append(f"scale={cfg.width}:{cfg.height}:flags=lanczos,setsar=1")
+        if cfg.fps != m.fps:
+            filters.append(f"fps={cfg.fps}")
+        if filters:
+            cmd.extend(["-vf", ",".join(filters)])
+        cmd.extend(self._thread_args())
+        
+        keyframes = encoding.keyframe_times(
+            cfg, len(self.images),
+            start=trim[0] if trim else 0.0,
+            duration=trim[1] if trim else None
+        )
+        static = not for_concat and all(img.static for img in self.images)
+        cmd.extend(["-map", "0:v", "-map", "1:a"])
+        cmd.extend(encoding.video_args(cfg, keyframes, static))
+        cmd.extend(["-c:a", "aac", "-b:a", cfg.audio_bitrate])
+        
+        if for_concat:
+            cmd.extend([
+                "-ar", str(self.CONCAT_SAMPLE_RATE),
+                "-ac", str(self.CONCAT_CHANNELS),
+            ])
+        
+        if trim:
+            cmd.extend(["-t", f"{trim[1]:.3f}"])
+        
+        cmd.extend(["-shortest", output_path])
+        return cmd
     
     def generate_preview(
         self,
@@ -465,26 +1795,115 @@ class SlideshowGenerator:
         audio_path: str,
         output_path: str = "preview.mp4",
         progress_callback: Optional[Callable[[str], None]] = None,
-        progress_bar_callback: Optional[Callable[[ProgressInfo], None]] = None
+        progress_bar_callback: Optional[Callable[[ProgressInfo], None]] = None,
+        render_range: Optional[RenderRange] = None,
+        output_mode: str = "mp4",
+        frame_store: Optional[str] = None
     ) -> Tuple[bool, str]:
         """Generate a quick low-quality preview"""
         return self.generate(
             image_path, audio_path, output_path,
             progress_callback, progress_bar_callback,
-            preview=True
+            preview=True, render_range=render_range, output_mode=output_mode,
+            frame_store=frame_store
         )
     
     def cancel(self):
-        """Cancel ongoing generation"""
+        """Cancel ongoing generation (the running FFmpeg is stopped at once)"""
         self._stop_flag = True
+        process = self._process
+        if process:
+            process.cancel()
+    
+    def image_start(self, index: int) -> float:
+        """Time at which an image starts (its incoming transition offset)"""
+        return index * (self.config.duration - self.config.crossfade)
+    
+    def _range_for(self, start: float, end: float) -> RenderRange:
+        """Select the images whose segment intersects [start, end)"""
+        if not self.images:
+            raise ValueError("No images prepared")
+        
+        step = self.config.duration - self.config.crossfade
+        if step <= 0:
+            raise ValueError("Crossfade must be shorter than image duration")
+        
+        total = self._body_duration()
+        start = max(0.0, start)
+        end = min(total, end)
+        if end <= start:
+            raise ValueError(f"Empty range: slideshow body is {total:.1f}s long")
+        
+        # Image i covers [i*step, i*step + duration)
+        first = max(0, int((start - self.config.duration) // step) + 1)
+        last = min(len(self.images) - 1, int(end // step))
+        if self.image_start(last) >= end:
+            last -= 1
+        
+        return RenderRange(first_image=first, last_image=last, start=start, end=end)
+    
+    def _starts_segment(self, path: str) -> bool:
+        """Whether a timeline segment starts at this image (by its name)"""
+        return int(cache_key("segment", os.path.basename(path)), 16) % self.TIMELINE_SEGMENT_IMAGES == 0
+    
+    def timeline_segments(self) -> List[RenderRange]:
+        """
+        Split the slideshow into segments of about TIMELINE_SEGMENT_IMAGES images
+        
+        Segments start where an image starts, so each one holds the
+        transition into its first image (and renders the end of the
+        previous image for it). Which images start a segment depends on
+        their names, not their positions: inserting or removing an image
+        only changes the segment around it, the others keep their images
+        and stay cached.
+        """
+        starts = [0]
+        for i in range(1, len(self.images)):
+            if (i - starts[-1] >= self.TIMELINE_SEGMENT_MAX_IMAGES
+                    or self._starts_segment(self.images[i].path)):
+                starts.append(i)
+        
+        segments = []
+        for k, first in enumerate(starts):
+            end = self.image_start(starts[k + 1]) if k + 1 < len(starts) else self._body_duration()
+            segments.append(self._range_for(self.image_start(first), end))
+        return segments
+    
+    def range_from_times(self, start: Optional[float], end: Optional[float]) -> RenderRange:
+        """
+        Build a render range from output video times
+        
+        Times include the title card when one is enabled; partial renders
+        only cover the slideshow itself.
+        """
+        offset = self.title.duration if self.title and self.title.enabled else 0.0
+        start = (start or 0.0) - offset
+        end = (end if end is not None else self.estimate_duration()) - offset
+        return self._range_for(start, end)
+    
+    def range_from_images(self, first: int, last: int) -> RenderRange:
+        """Build a render range covering images first..last (1-based, inclusive)"""
+        if first < 1 or last > len(self.images) or first > last:
+            raise ValueError(f"Invalid image range {first}-{last} (1-{len(self.images)})")
+        
+        start = self.image_start(first - 1)
+        end = self.image_start(last - 1) + self.config.duration
+        return self._range_for(start, end)
+    
+    def _body_duration(self) -> float:
+        """Duration of the slideshow without title card"""
+        if not self.images:
+            return 0
+        
+        n = len(self.images)
+        return max(0, self.config.duration * n - self.config.crossfade * (n - 1))
     
     def estimate_duration(self) -> float:
         """Estimate total video duration in seconds"""
         if not self.images:
             return 0
         
-        n = len(self.images)
-        total = self.config.duration * n - self.config.crossfade * (n - 1)
+        total = self._body_duration()
         
         # Add title duration if enabled
         if self.title and self.title.enabled:
@@ -530,6 +1949,67 @@ def get_ffmpeg_version() -> Optional[str]:
     return None
 
 
+def _filter_path(path: str) -> str:
+    """Escape a file path as a filter option value inside a filtergraph
+    
+    Option values and the graph description are unescaped one after the
+    other, so the path is escaped for both levels.
+    """
+    value = re.sub(r"([\\':])", r"\\\1", path)
+    return re.sub(r"([\\'\[\],;])", r"\\\1", value)
+
+
+def concat_clips(clip_paths: List[str], output_path: str) -> Tuple[bool, str]:
+    """
+    Concatenate clips sharing the same encoding without re-encoding
+    
+    Returns:
+        Tuple of (success, message)
+    """
+    list_path = partial_path(output_path) + ".txt"
+    with open(list_path, 'w', encoding='utf-8') as f:
+        for clip in clip_paths:
+            escaped = os.path.abspath(clip).replace("'", "'\\''")
+            f.write(f"file '{escaped}'\n")
+    
+    cmd = [
+        "ffmpeg", "-y", "-hide_banner", "-progress", "pipe:1", "-loglevel", "error",
+        "-f", "concat", "-safe", "0",
+        "-i", list_path,
+        "-c", "copy",
+        "-movflags", "+faststart",
+        output_path
+    ]
+    
+    try:
+        result = supervisor.run(cmd)
+    except FileNotFoundError:
+        return False, "FFmpeg not found. Please install FFmpeg."
+    finally:
+        if os.path.exists(list_path):
+            os.remove(list_path)
+    
+    if not result.ok:
+        return False, f"FFmpeg concat error: {result.error}"
+    return True, output_path
+
+
+def parse_time(value: str) -> float:
+    """Parse seconds, MM:SS or HH:MM:SS (fractions allowed) to seconds"""
+    parts = value.strip().split(':')
+    if not parts or len(parts) > 3:
+        raise ValueError(f"Invalid time: {value}")
+    try:
+        seconds = 0.0
+        for part in parts:
+            seconds = seconds * 60 + float(part)
+    except ValueError:
+        raise ValueError(f"Invalid time: {value}")
+    if seconds < 0:
+        raise ValueError(f"Invalid time: {value}")
+    return seconds
+
+
 def format_time(seconds: float) -> str:
     """Format seconds to HH:MM:SS"""
     h = int(seconds // 3600)
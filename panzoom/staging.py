@@ -0,0 +1,270 @@
+"""
+Staging area for render intermediates
+
+Files a job writes before its final outputs exist (video bodies waiting
+for the title card, joined segments, album tracks before they are
+published) go to a staging area instead of wherever the job happens to
+run. A file is staged in RAM (/dev/shm by default) when it fits the byte
+budget and leaves enough memory free. Otherwise it is written next to its
+destination, or in a configured disk directory, never in /tmp by
+accident. Finished files are published atomically, and whatever is left
+is removed when the job ends, whether it succeeded, failed or was
+cancelled. Directories of jobs that were killed before they could clean
+up are swept by the next job.
+
+Render caches that outlive a job (segments, scaled images, mezzanines,
+bodies) follow the same policy through ``cache_root``: they go to the
+configured disk directory rather than the home directory.
+"""
+
+import os
+import re
+import time
+import socket
+import errno
+import shutil
+import tempfile
+import threading
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+from .cache import partial_path
+from .config import StagingConfig
+
+
+MB = 1024 * 1024
+
+# Job directories are named after the host and process that own them
+DIR_PREFIX = "panzoom-"
+_OWNED_DIR = re.compile(rf"^{DIR_PREFIX}(.+)-(\d+)-[^-]+$")
+# Directories named before they carried a PID are swept once this old
+LEGACY_DIR_AGE = 24 * 3600
+
+_swept = set()
+_swept_lock = threading.Lock()
+
+
+@dataclass
+class StagingReport:
+    """What a job wrote through its staging area"""
+    files: int = 0
+    ram_bytes: int = 0              # Written to the RAM directory
+    disk_bytes: int = 0             # Written to disk (budget or space exceeded)
+    peak_ram_bytes: int = 0         # Largest RAM reservation at a time
+
+    @property
+    def bytes_written(self) -> int:
+        return self.ram_bytes + self.disk_bytes
+
+
+class StagingArea:
+    """
+    Scratch space of one job, as a context manager
+
+    ``path`` hands out a location for a file that is later either
+    published to its destination or discarded. RAM reservations use the
+    expected size given by the caller and are released when the file is
+    published or discarded.
+    """
+
+    def __init__(self, config: Optional[StagingConfig] = None):
+        self.config = config or StagingConfig()
+        self._lock = threading.Lock()
+        self._ram_dir: Optional[str] = None
+        self._disk_dir: Optional[str] = None
+        self._files: Dict[str, Tuple[bool, int]] = {}   # path -> (in RAM, reserved bytes)
+        self._ram_reserved = 0
+        self._count = 0
+        self.report = StagingReport()
+        # Unowned directories are only swept from RAM, which no other host sees
+        if self.config.ram_dir:
+            _sweep_once(self.config.ram_dir, unowned=True)
+        if self.config.disk_dir:
+            _sweep_once(self.config.disk_dir, unowned=False)
+
+    @property
+    def cache_root(self) -> str:
+        """Root of the render caches ("" = the default, see cache.get_cache_dir)"""
+        cfg = self.config
+        if cfg.cache_dir:
+            return cfg.cache_dir
+        if cfg.disk_dir and not os.environ.get("PANZOOM_CACHE_DIR"):
+            return os.path.join(cfg.disk_dir, "cache")
+        return ""
+
+    def _mkdtemp(self, root: str) -> str:
+        return tempfile.mkdtemp(prefix=f"{DIR_PREFIX}{_host()}-{os.getpid()}-", dir=root)
+
+    def __enter__(self) -> 'StagingArea':
+        return self
+
+    def __exit__(self, *exc):
+        self.cleanup()
+
+    def _ram_fits(self, expected_bytes: int) -> bool:
+        cfg = self.config
+        root = cfg.ram_dir
+        if cfg.budget_mb <= 0 or not root:
+            return False
+        if not os.path.isdir(root) or not os.access(root, os.W_OK):
+            return False
+        if self._ram_reserved + expected_bytes > cfg.budget_mb * MB:
+            return False
+        try:
+            free = shutil.disk_usage(root).free
+        except OSError:
+            return False
+        return free - expected_bytes >= cfg.min_free_mb * MB
+
+    def path(self, destination: str, expected_bytes: int = 0) -> str:
+        """
+        Location to write a file that will end up at ``destination``
+
+        Args:
+            destination: Final path (for intermediates that are removed
+                afterwards: where they would otherwise have been written)
+            expected_bytes: Size estimate, reserved against the RAM budget
+        """
+        name = os.path.basename(destination)
+        with self._lock:
+            self._count += 1
+            in_ram = self._ram_fits(expected_bytes)
+            if in_ram:
+                if self._ram_dir is None:
+                    self._ram_dir = self._mkdtemp(self.config.ram_dir)
+                path = os.path.join(self._ram_dir, f"{self._count:04d}-{name}")
+                self._ram_reserved += expected_bytes
+                self.report.peak_ram_bytes = max(self.report.peak_ram_bytes, self._ram_reserved)
+            elif self.config.disk_dir:
+                if self._disk_dir is None:
+                    os.makedirs(self.config.disk_dir, exist_ok=True)
+                    self._disk_dir = self._mkdtemp(self.config.disk_dir)
+                path = os.path.join(self._disk_dir, f"{self._count:04d}-{name}")
+            else:
+                # Same filesystem as the destination: publishing is a rename
+                path = partial_path(destination)
+            self._files[path] = (in_ram, expected_bytes if in_ram else 0)
+        return path
+
+    def _release(self, path: str):
+        """Stop tracking a file, counting what was written to it"""
+        with self._lock:
+            entry = self._files.pop(path, None)
+            if entry is None:
+                return
+            in_ram, reserved = entry
+            self._ram_reserved -= reserved
+            size = os.path.getsize(path) if os.path.exists(path) else 0
+            self.report.files += 1
+            if in_ram:
+                self.report.ram_bytes += size
+            else:
+                self.report.disk_bytes += size
+
+    def publish(self, path: str, destination: str) -> str:
+        """Move a finished file to its destination atomically"""
+        self._release(path)
+        try:
+            os.replace(path, destination)
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                raise
+            # Another filesystem: copy next to the destination, then rename
+            tmp_path = partial_path(destination)
+            try:
+                shutil.copyfile(path, tmp_path)
+                os.replace(tmp_path, destination)
+            finally:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+            os.remove(path)
+        return destination
+
+    def discard(self, path: str):
+        """Remove an intermediate that is no longer needed"""
+        self._release(path)
+        if os.path.exists(path):
+            os.remove(path)
+
+    def cleanup(self):
+        """Remove every file still staged (failed or cancelled steps)"""
+        for path in list(self._files):
+            self.discard(path)
+        for directory in (self._ram_dir, self._disk_dir):
+            if directory:
+                shutil.rmtree(directory, ignore_errors=True)
+        self._ram_dir = self._disk_dir = None
+
+
+def _host() -> str:
+    """This host's name, usable in a directory name"""
+    return re.sub(r"[^A-Za-z0-9.]", "_", socket.gethostname()) or "localhost"
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def sweep_stale(root: str, unowned: bool = False) -> int:
+    """
+    Remove job directories left in root by processes that no longer run
+
+    A job killed by SIGKILL (or a SIGTERM it could not handle) never runs
+    its cleanup, and in /dev/shm its files keep holding RAM. Only
+    directories of this host are checked: a disk_dir on a shared mount
+    also holds the live jobs of other hosts, whose PIDs mean nothing here.
+    Directories without an owner (named by earlier versions) are removed
+    with unowned, after LEGACY_DIR_AGE.
+
+    Returns:
+        Number of directories removed
+    """
+    try:
+        entries = list(os.scandir(root))
+    except OSError:
+        return 0
+
+    host = _host()
+    removed = 0
+    for entry in entries:
+        if not entry.name.startswith(DIR_PREFIX) or not entry.is_dir(follow_symlinks=False):
+            continue
+        match = _OWNED_DIR.match(entry.name)
+        if match:
+            pid = int(match.group(2))
+            stale = match.group(1) == host and pid != os.getpid() and not _pid_alive(pid)
+        elif unowned:
+            try:
+                stale = time.time() - entry.stat(follow_symlinks=False).st_mtime > LEGACY_DIR_AGE
+            except OSError:
+                continue
+        else:
+            continue
+        if stale:
+            shutil.rmtree(entry.path, ignore_errors=True)
+            removed += 1
+    return removed
+
+
+def _sweep_once(root: str, unowned: bool):
+    """Sweep a root the first time this process stages anything there"""
+    with _swept_lock:
+        if root in _swept:
+            return
+        _swept.add(root)
+    sweep_stale(root, unowned)
+
+
+def format_report(report: StagingReport) -> str:
+    """One-line summary of a staging report"""
+    return (
+        f"{report.bytes_written / MB:.1f} MB in {report.files} file(s) "
+        f"({report.ram_bytes / MB:.1f} MB in RAM, {report.disk_bytes / MB:.1f} MB on disk, "
+        f"peak RAM {report.peak_ram_bytes / MB:.1f} MB)"
+    )
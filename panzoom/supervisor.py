@@ -0,0 +1,244 @@
+"""
+Supervised FFmpeg child processes
+
+Both output streams are drained by background threads into bounded ring
+buffers, so a chatty process can never block on a full pipe. A watchdog
+enforces stall (no output) and wall-clock timeouts and handles
+cancellation, escalating from terminate to kill. Results are returned as a
+ProcessResult with the exit code, the tail of stderr and resource usage.
+"""
+
+import os
+import time
+import queue
+import threading
+import subprocess
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Iterator, List, Optional, Sequence
+
+
+DEFAULT_STALL_TIMEOUT = 300.0       # Seconds without any output before giving up
+KILL_GRACE = 5.0                    # Seconds between terminate and kill
+TAIL_LINES = 50                     # Lines kept from each stream
+POLL_INTERVAL = 0.1
+
+_EOF = object()
+
+
+@dataclass
+class ProcessResult:
+    """Outcome of a supervised process"""
+    returncode: int
+    stderr_tail: str = ""
+    wall_seconds: float = 0.0
+    user_seconds: float = 0.0
+    system_seconds: float = 0.0
+    peak_rss_bytes: int = 0
+    cancelled: bool = False
+    timeout: Optional[str] = None   # "stall" or "wall" if the watchdog fired
+
+    @property
+    def ok(self) -> bool:
+        return self.returncode == 0 and not self.cancelled and not self.timeout
+
+    @property
+    def error(self) -> str:
+        """Human readable failure reason"""
+        if self.cancelled:
+            return "Cancelled"
+        if self.timeout == "stall":
+            return f"Process stalled (no output), killed. {self.stderr_tail}".strip()
+        if self.timeout == "wall":
+            return f"Process exceeded its time limit, killed. {self.stderr_tail}".strip()
+        return self.stderr_tail or f"Exit code {self.returncode}"
+
+
+class SupervisedProcess:
+    """
+    A child process with drained pipes, timeouts and prompt cancellation
+
+    With ``raw_stdout`` the caller reads binary stdout through ``read``;
+    otherwise stdout lines are available from ``lines``. ``write`` feeds
+    stdin when ``stdin`` is set. Reads and writes count as activity for the
+    stall timeout. ``pass_fds`` are inherited by the child under the same
+    numbers (FFmpeg reads them as ``pipe:N``).
+    """
+
+    def __init__(
+        self,
+        cmd: List[str],
+        stdin: bool = False,
+        raw_stdout: bool = False,
+        stall_timeout: Optional[float] = DEFAULT_STALL_TIMEOUT,
+        wall_timeout: Optional[float] = None,
+        tail_lines: int = TAIL_LINES,
+        pass_fds: Sequence[int] = ()
+    ):
+        self.cmd = cmd
+        self.stall_timeout = stall_timeout
+        self.wall_timeout = wall_timeout
+        self.stdout_tail = deque(maxlen=tail_lines)
+        self.stderr_tail = deque(maxlen=tail_lines)
+        self._lines: "queue.Queue" = queue.Queue()
+        self._raw_stdout = raw_stdout
+        self._stdout_done = raw_stdout
+        self._cancel = threading.Event()
+        self._finished = threading.Event()
+        self._timeout: Optional[str] = None
+        self._started = time.monotonic()
+        self._activity = self._started
+
+        self.process = subprocess.Popen(
+            cmd,
+            stdin=subprocess.PIPE if stdin else subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            pass_fds=tuple(pass_fds)
+        )
+
+        self._threads = [threading.Thread(target=self._drain_stderr, daemon=True)]
+        if not raw_stdout:
+            self._threads.append(threading.Thread(target=self._drain_stdout, daemon=True))
+        self._threads.append(threading.Thread(target=self._watchdog, daemon=True))
+        for thread in self._threads:
+            thread.start()
+
+    def _touch(self):
+        self._activity = time.monotonic()
+
+    def _drain_stdout(self):
+        for raw in iter(self.process.stdout.readline, b""):
+            self._touch()
+            line = raw.decode('utf-8', errors='replace')
+            self.stdout_tail.append(line)
+            self._lines.put(line)
+        self._lines.put(_EOF)
+
+    def _drain_stderr(self):
+        for raw in iter(self.process.stderr.readline, b""):
+            self._touch()
+            self.stderr_tail.append(raw.decode('utf-8', errors='replace'))
+
+    def _watchdog(self):
+        deadline_kill = None
+        while not self._finished.wait(POLL_INTERVAL):
+            now = time.monotonic()
+            if deadline_kill is not None:
+                if now >= deadline_kill:
+                    self._signal(self.process.kill)
+                    return
+                continue
+            if not self._cancel.is_set():
+                if self.wall_timeout and now - self._started > self.wall_timeout:
+                    self._timeout = "wall"
+                elif self.stall_timeout and now - self._activity > self.stall_timeout:
+                    self._timeout = "stall"
+                else:
+                    continue
+            self._signal(self.process.terminate)
+            deadline_kill = now + KILL_GRACE
+
+    def _signal(self, send: Callable[[], None]):
+        try:
+            send()
+        except OSError:  # Already gone
+            pass
+
+    def cancel(self):
+        """Ask the process to stop (terminate, then kill after a grace period)"""
+        self._cancel.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def lines(self) -> Iterator[str]:
+        """Stdout lines as they arrive, until the process closes stdout"""
+        while not self._stdout_done:
+            line = self._lines.get()
+            if line is _EOF:
+                self._stdout_done = True
+                return
+            yield line
+
+    def read(self, size: int) -> bytes:
+        """Read binary stdout (raw_stdout mode)"""
+        data = self.process.stdout.read(size)
+        self._touch()
+        return data
+
+    def write(self, data: bytes) -> bool:
+        """Feed stdin; False once the process stopped reading"""
+        try:
+            self.process.stdin.write(data)
+        except (BrokenPipeError, ValueError):
+            return False
+        self._touch()
+        return True
+
+    def close_stdin(self):
+        try:
+            self.process.stdin.close()
+        except BrokenPipeError:
+            pass
+
+    def wait(self) -> ProcessResult:
+        """Wait for exit and collect the result"""
+        if self.process.stdin:
+            self.close_stdin()
+        if not self._raw_stdout:
+            for _ in self.lines():
+                pass
+        else:
+            # Unread output would block the child forever
+            self.process.stdout.close()
+
+        rusage = None
+        if hasattr(os, "wait4"):
+            try:
+                _, status, rusage = os.wait4(self.process.pid, 0)
+                self.process.returncode = (
+                    os.WEXITSTATUS(status) if os.WIFEXITED(status) else -os.WTERMSIG(status)
+                )
+            except ChildProcessError:  # Reaped elsewhere (e.g. by a signal call)
+                pass
+        if self.process.returncode is None:
+            self.process.wait()
+
+        self._finished.set()
+        for thread in self._threads:
+            thread.join()
+        self.process.stdout.close()
+        self.process.stderr.close()
+
+        return ProcessResult(
+            returncode=self.process.returncode,
+            stderr_tail="".join(self.stderr_tail).strip(),
+            wall_seconds=time.monotonic() - self._started,
+            user_seconds=rusage.ru_utime if rusage else 0.0,
+            system_seconds=rusage.ru_stime if rusage else 0.0,
+            # ru_maxrss is in KB on Linux
+            peak_rss_bytes=rusage.ru_maxrss * 1024 if rusage else 0,
+            cancelled=self.cancelled,
+            timeout=self._timeout,
+        )
+
+
+def run(
+    cmd: List[str],
+    on_line: Optional[Callable[[str], None]] = None,
+    stall_timeout: Optional[float] = DEFAULT_STALL_TIMEOUT,
+    wall_timeout: Optional[float] = None
+) -> ProcessResult:
+    """
+    Run a command to completion under supervision
+
+    Args:
+        on_line: Called (in the calling thread) for every stdout line
+    """
+    proc = SupervisedProcess(cmd, stall_timeout=stall_timeout, wall_timeout=wall_timeout)
+    for line in proc.lines():
+        if on_line:
+            on_line(line)
+    return proc.wait()
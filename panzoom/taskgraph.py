@@ -0,0 +1,159 @@
+"""
+Small task-graph executor for render preparation
+
+Stages are declared with their dependencies and run on a thread pool as
+soon as their inputs are ready, so independent ones (image discovery,
+audio probing, title and watermark rendering) overlap. The stages
+themselves mostly wait on FFmpeg/ffprobe children, which is why threads
+are enough. Results can be memoized across runs by a key, and every run
+records per-stage timings.
+"""
+
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+
+class TaskError(Exception):
+    """A stage failed (the message is the stage's own error)"""
+
+    def __init__(self, task: str, message: str):
+        super().__init__(message)
+        self.task = task
+
+
+@dataclass
+class TaskTiming:
+    """When a stage ran, relative to the start of the graph"""
+    name: str
+    start: float
+    seconds: float
+    cached: bool = False
+    error: Optional[str] = None
+
+
+@dataclass
+class _Task:
+    name: str
+    func: Callable[..., Any]
+    deps: Sequence[str]
+    key: Optional[str]
+    valid: Optional[Callable[[Any], bool]] = None
+
+
+class TaskGraph:
+    """
+    Dependency graph of callables
+
+    Each task is called with the results of its dependencies, in the order
+    they were declared. A task with a ``key`` whose result is already in
+    ``memo`` is not run again, unless its ``valid`` check rejects the
+    memoized result (e.g. a file that has since been deleted).
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, memo: Optional[Dict[str, Any]] = None):
+        self.max_workers = max_workers
+        self.memo = memo if memo is not None else {}
+        self.results: Dict[str, Any] = {}
+        self.timings: List[TaskTiming] = []
+        self._tasks: Dict[str, _Task] = {}
+        self._lock = threading.Lock()
+
+    def add(
+        self,
+        name: str,
+        func: Callable[..., Any],
+        deps: Sequence[str] = (),
+        key: Optional[str] = None,
+        valid: Optional[Callable[[Any], bool]] = None
+    ) -> 'TaskGraph':
+        if name in self._tasks:
+            raise ValueError(f"Duplicate task: {name}")
+        for dep in deps:
+            if dep not in self._tasks:
+                raise ValueError(f"Task {name} depends on unknown task {dep}")
+        self._tasks[name] = _Task(name, func, tuple(deps), key, valid)
+        return self
+
+    def _record(self, timing: TaskTiming):
+        with self._lock:
+            self.timings.append(timing)
+
+    def _call(self, task: _Task, started: float) -> Any:
+        t0 = time.perf_counter()
+        memo_key = f"{task.name}:{task.key}" if task.key else None
+        if memo_key and memo_key in self.memo and (
+            task.valid is None or task.valid(self.memo[memo_key])
+        ):
+            self._record(TaskTiming(task.name, t0 - started, 0.0, cached=True))
+            return self.memo[memo_key]
+
+        try:
+            result = task.func(*[self.results[d] for d in task.deps])
+        except Exception as e:
+            self._record(TaskTiming(
+                task.name, t0 - started, time.perf_counter() - t0,
+                error=str(e) or type(e).__name__
+            ))
+            raise
+        self._record(TaskTiming(task.name, t0 - started, time.perf_counter() - t0))
+        if memo_key:
+            self.memo[memo_key] = result
+        return result
+
+    def run(self, should_stop: Optional[Callable[[], bool]] = None) -> Dict[str, Any]:
+        """
+        Run every task, each as soon as its dependencies are done
+
+        Dependencies are declared before their dependents, so the graph
+        cannot have cycles. On the first failure no new task is started;
+        running ones finish, then a TaskError is raised.
+
+        Args:
+            should_stop: Polled between tasks to cancel the run
+
+        Returns:
+            Results by task name
+        """
+        started = time.perf_counter()
+        pending = dict(self._tasks)
+        running = {}
+        failure: Optional[TaskError] = None
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            while pending or running:
+                if failure is None and should_stop and should_stop():
+                    failure = TaskError("", "Generation cancelled")
+                if failure is None:
+                    for name, task in list(pending.items()):
+                        if all(d in self.results for d in task.deps):
+                            del pending[name]
+                            running[pool.submit(self._call, task, started)] = name
+                if not running:
+                    break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        self.results[name] = future.result()
+                    except Exception as e:
+                        if failure is None:
+                            message = e.args[0] if isinstance(e, TaskError) else str(e)
+                            failure = TaskError(name, message or type(e).__name__)
+
+        self.timings.sort(key=lambda t: t.start)
+        if failure is not None:
+            raise failure
+        return self.results
+
+
+def format_timings(timings: Sequence[TaskTiming]) -> List[str]:
+    """One line per stage: start offset, duration and state"""
+    lines = []
+    for t in timings:
+        state = " (cached)" if t.cached else f" (failed: {t.error})" if t.error else ""
+        lines.append(f"{t.name:12} +{t.start:6.2f}s {t.seconds:7.2f}s{state}")
+    return lines
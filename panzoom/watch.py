@@ -0,0 +1,206 @@
+"""
+Hot-folder watching: re-render a slideshow when its images change
+
+The folder is polled rather than watched with inotify, which does not see
+changes made by other hosts on network mounts. Polling is cheap while
+nothing happens: adding, removing or renaming a file changes the
+directory's mtime, so an unchanged directory costs one stat per poll and
+its cached listing is reused. Files rewritten in place leave the directory
+alone; they are caught by a periodic full rescan.
+
+Bursts of changes (a photographer copying a card) are debounced: the render
+starts once the folder has been quiet for a while, and renders are
+incremental (see SlideshowGenerator.generate), so only the part of the
+timeline around the changed images is redone.
+"""
+
+import os
+import time
+import threading
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+from .cache import file_signature
+
+
+POLL_INTERVAL = 2.0                 # Seconds between polls
+DEBOUNCE = 5.0                      # Quiet seconds before a render starts
+RESCAN_INTERVAL = 60.0              # Full rescan even if the directory looks unchanged
+
+# Random effects (zoom/pan direction, transitions) and shuffling are seeded
+# per image name, and alternate directions restart at every segment, so
+# unchanged images keep theirs and their segments stay cached (see
+# SlideshowGenerator.effect_seed)
+RANDOM_SEED = 0
+
+
+class FolderPoller:
+    """
+    Change detection on one image directory by polling
+
+    ``files`` maps each image to its (size, mtime). A listing is only
+    rebuilt when the directory mtime changed, every ``rescan_interval``
+    seconds, or on request.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        extensions: Iterable[str],
+        rescan_interval: float = RESCAN_INTERVAL
+    ):
+        self.path = path
+        self.extensions = {ext.lower() for ext in extensions}
+        self.rescan_interval = rescan_interval
+        self.files: Dict[str, Tuple[int, int]] = {}
+        self.scans = 0
+        self._dir_mtime: Optional[int] = None
+        self._scanned_at = float("-inf")
+
+    def poll(self, rescan: bool = False) -> bool:
+        """
+        Check the directory
+
+        An unreachable directory (e.g. a share being remounted) counts as
+        unchanged: the last listing is kept.
+
+        Args:
+            rescan: List and stat the files even if the directory mtime
+                did not change
+
+        Returns:
+            True if the images changed since the last poll
+        """
+        try:
+            dir_mtime = os.stat(self.path).st_mtime_ns
+        except OSError:
+            return False
+
+        now = time.monotonic()
+        if (not rescan and dir_mtime == self._dir_mtime
+                and now - self._scanned_at < self.rescan_interval):
+            return False
+
+        files = self._scan()
+        if files is None:
+            return False
+        self._dir_mtime = dir_mtime
+        self._scanned_at = now
+        changed = files != self.files
+        self.files = files
+        return changed
+
+    def _scan(self) -> Optional[Dict[str, Tuple[int, int]]]:
+        files = {}
+        try:
+            with os.scandir(self.path) as entries:
+                for entry in entries:
+                    # Hidden files are partial uploads (rsync, our own .part files)
+                    if entry.name.startswith('.'):
+                        continue
+                    if os.path.splitext(entry.name)[1].lower() not in self.extensions:
+                        continue
+                    try:
+                        if not entry.is_file():
+                            continue
+                        st = entry.stat()
+                    except OSError:  # Removed meanwhile
+                        continue
+                    files[entry.path] = (st.st_size, st.st_mtime_ns)
+        except OSError:
+            return None
+        self.scans += 1
+        return files
+
+
+class FolderWatcher:
+    """
+    Re-render a slideshow whenever its images or audio change
+
+    A render starts once nothing changed for ``debounce`` seconds. While a
+    change is pending every poll rescans the files, so images still being
+    copied (growing in place) keep postponing it.
+    """
+
+    def __init__(
+        self,
+        generator,
+        image_dir: str,
+        audio_path: str,
+        output_path: str,
+        poll_interval: float = POLL_INTERVAL,
+        debounce: float = DEBOUNCE,
+        rescan_interval: float = RESCAN_INTERVAL
+    ):
+        self.generator = generator
+        self.generator.effect_seed = RANDOM_SEED
+        self.image_dir = image_dir
+        self.audio_path = audio_path
+        self.output_path = output_path
+        self.poll_interval = poll_interval
+        self.debounce = debounce
+        self.poller = FolderPoller(image_dir, generator.SUPPORTED_FORMATS, rescan_interval)
+        self.renders = 0
+        self._stop = threading.Event()
+
+    def _audio_signature(self) -> Optional[dict]:
+        try:
+            return file_signature(self.audio_path)
+        except OSError:
+            return None
+
+    def stop(self):
+        """Stop watching (a running render is cancelled)"""
+        self._stop.set()
+        self.generator.cancel()
+
+    def render(
+        self,
+        progress_callback: Optional[Callable[[str], None]] = None,
+        progress_bar_callback: Optional[Callable[..., None]] = None
+    ) -> Tuple[bool, str]:
+        """Render the current state of the folder"""
+        if not self.poller.files:
+            return False, f"No images in: {self.image_dir}"
+        self.renders += 1
+        return self.generator.generate(
+            self.image_dir, self.audio_path, self.output_path,
+            progress_callback=progress_callback,
+            progress_bar_callback=progress_bar_callback,
+            incremental=True
+        )
+
+    def run(
+        self,
+        on_render: Optional[Callable[[bool, str], None]] = None,
+        progress_callback: Optional[Callable[[str], None]] = None,
+        progress_bar_callback: Optional[Callable[..., None]] = None
+    ):
+        """
+        Watch until ``stop`` is called, rendering once at start
+
+        Args:
+            on_render: Called with (success, message) after each render
+        """
+        self.poller.poll(rescan=True)
+        audio = self._audio_signature()
+        pending = True
+        last_change = time.monotonic() - self.debounce
+
+        while not self._stop.is_set():
+            changed = self.poller.poll(rescan=pending)
+            current = self._audio_signature()
+            if current != audio:
+                audio = current
+                changed = True
+
+            now = time.monotonic()
+            if changed:
+                pending = True
+                last_change = now
+            if pending and now - last_change >= self.debounce:
+                pending = False
+                result = self.render(progress_callback, progress_bar_callback)
+                if on_render and not self._stop.is_set():
+                    on_render(*result)
+
+            self._stop.wait(self.poll_interval)